@@ -16,9 +16,11 @@ from app.database import Base
 
 # Import all models to ensure they're registered
 from app.models import (
-    User, City, Location, 
+    User, City, Location, LocationSlot,
     Category, Product, ProductOption, LocationProduct,
-    Order, OrderItem, OrderStatus, ReceiptHash
+    Order, OrderItem, OrderStatus, ReceiptHash,
+    Broadcast, BroadcastDelivery,
+    Task, IdempotencyKey
 )
 
 # Alembic Config object
@@ -0,0 +1,70 @@
+"""Add broadcast tables
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4g5h6
+Create Date: 2025-10-30 10:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e3f4a5b6c7'
+down_revision = 'c1d2e3f4g5h6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create broadcasts table
+    op.create_table(
+        'broadcasts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('message_text', sa.Text(), nullable=False),
+        sa.Column('city_id', sa.Integer(), nullable=True),
+        sa.Column('language', sa.String(length=5), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('last_user_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sent_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['city_id'], ['cities.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_broadcasts_id'), 'broadcasts', ['id'], unique=False)
+    op.create_index(op.f('ix_broadcasts_status'), 'broadcasts', ['status'], unique=False)
+
+    # Create broadcast_deliveries table
+    op.create_table(
+        'broadcast_deliveries',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('broadcast_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['broadcast_id'], ['broadcasts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_broadcast_deliveries_broadcast_id'), 'broadcast_deliveries', ['broadcast_id'], unique=False)
+
+    # Recipient scan: WHERE city_id = ? AND id > checkpoint ORDER BY id
+    op.create_index('ix_users_city_id_id', 'users', ['city_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_city_id_id', table_name='users')
+
+    op.drop_index(op.f('ix_broadcast_deliveries_broadcast_id'), table_name='broadcast_deliveries')
+    op.drop_table('broadcast_deliveries')
+
+    op.drop_index(op.f('ix_broadcasts_status'), table_name='broadcasts')
+    op.drop_index(op.f('ix_broadcasts_id'), table_name='broadcasts')
+    op.drop_table('broadcasts')
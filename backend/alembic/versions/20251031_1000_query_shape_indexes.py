@@ -0,0 +1,122 @@
+"""Composite and partial indexes for the real query shapes
+
+Revision ID: e3f4a5b6c7d8
+Revises: d2e3f4a5b6c7
+Create Date: 2025-10-31 10:00:00.000000+00:00
+
+Analytics, user journey and order listing queries filter by an owner or
+status and a time range, then sort by time. Single-column indexes make
+Postgres pick one of them and filter the rest row by row; the composite
+indexes below answer those queries directly (a backward scan serves the
+ORDER BY ... DESC).
+
+Indexes that become a prefix of a new composite index, duplicate the
+primary key, or are never used by a query are dropped: every index costs
+write throughput on the hot insert tables (bot_interactions, user_sessions).
+
+All indexes are built and dropped CONCURRENTLY, so the tables stay
+writable. That cannot run inside a transaction, hence autocommit_block().
+If a concurrent build is interrupted it leaves an INVALID index behind;
+_create_index drops such leftovers before building again, so the migration
+can simply be re-run.
+
+scripts/check_query_plans.py verifies with EXPLAIN that the queries use them.
+"""
+from typing import List, Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3f4a5b6c7d8'
+down_revision = 'd2e3f4a5b6c7'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial index predicate)
+NEW_INDEXES = [
+    # User journey, /analytics/interactions?telegram_id=
+    ('ix_bot_interactions_telegram_id_created_at', 'bot_interactions', ['telegram_id', 'created_at'], None),
+    # /analytics/interactions?user_id=
+    ('ix_bot_interactions_user_id_created_at', 'bot_interactions', ['user_id', 'created_at'], None),
+    # Top commands and menu views (most interactions have no command)
+    ('ix_bot_interactions_command_created_at', 'bot_interactions', ['command', 'created_at'], 'command IS NOT NULL'),
+    # Bot "my orders" list, user journey
+    ('ix_orders_user_id_created_at', 'orders', ['user_id', 'created_at'], None),
+    # Dashboard counts per status, admin order list filtered by status
+    ('ix_orders_status_created_at', 'orders', ['status', 'created_at'], None),
+    # Dashboard closed tickets, support list filtered by status
+    ('ix_support_messages_status_created_at', 'support_messages', ['status', 'created_at'], None),
+    # User journey
+    ('ix_support_messages_telegram_id_created_at', 'support_messages', ['telegram_id', 'created_at'], None),
+    # Dashboard opened tickets (customer messages only)
+    ('ix_support_messages_created_at_user', 'support_messages', ['created_at'], "sender_type = 'user'"),
+    # /analytics/sessions?user_id=, active users
+    ('ix_user_sessions_user_id_session_start', 'user_sessions', ['user_id', 'session_start'], None),
+    # User journey
+    ('ix_user_sessions_telegram_id_session_start', 'user_sessions', ['telegram_id', 'session_start'], None),
+]
+
+# (name, table, columns) as created by earlier migrations
+REDUNDANT_INDEXES = [
+    # Prefix of a composite index above
+    ('ix_bot_interactions_telegram_id', 'bot_interactions', ['telegram_id']),
+    ('ix_bot_interactions_user_id', 'bot_interactions', ['user_id']),
+    ('ix_bot_interactions_command', 'bot_interactions', ['command']),
+    ('ix_orders_user_id', 'orders', ['user_id']),
+    ('ix_orders_status', 'orders', ['status']),
+    ('ix_support_messages_status', 'support_messages', ['status']),
+    ('ix_support_messages_telegram_id', 'support_messages', ['telegram_id']),
+    ('ix_user_sessions_user_id', 'user_sessions', ['user_id']),
+    ('ix_user_sessions_telegram_id', 'user_sessions', ['telegram_id']),
+    # No query filters by interaction type
+    ('ix_bot_interactions_interaction_type', 'bot_interactions', ['interaction_type']),
+    # Same column as the primary key
+    ('ix_bot_interactions_id', 'bot_interactions', ['id']),
+    ('ix_user_sessions_id', 'user_sessions', ['id']),
+    ('ix_support_messages_id', 'support_messages', ['id']),
+    ('ix_orders_id', 'orders', ['id']),
+]
+
+
+def _drop_invalid(name: str):
+    """Drop an INVALID index left by an interrupted concurrent build"""
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).scalar()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def _create_index(name: str, table: str, columns: List[str], where: Optional[str] = None):
+    _drop_invalid(name)
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    predicate = f" WHERE {where}" if where else ""
+    op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" ({column_list}){predicate}')
+
+
+def _drop_index(name: str):
+    op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Build the replacements first, so queries always have an index
+        for name, table, columns, where in NEW_INDEXES:
+            _create_index(name, table, columns, where)
+        for name, _, _ in REDUNDANT_INDEXES:
+            _drop_index(name)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            _create_index(name, table, columns)
+        for name, _, _, _ in NEW_INDEXES:
+            _drop_index(name)
@@ -0,0 +1,80 @@
+"""Catalog change log for delta menu sync
+
+Revision ID: f4a5b6c7d8e9
+Revises: e3f4a5b6c7d8
+Create Date: 2025-11-01 10:00:00.000000+00:00
+
+Every insert, update and delete of a category, product, product option or
+location product appends a row to catalog_changes; its version (bigserial)
+is the catalog version. Triggers rather than application code, so cascaded
+deletes, seed scripts and COPY loads are logged too.
+
+The trigger takes a transaction-level advisory lock before logging. A
+second catalog writer waits until the first commits, so versions become
+visible in commit order and a client that synced up to version N can
+never miss a change numbered below N.
+
+Existing rows are logged as inserts, so since=0 returns the full catalog.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a5b6c7d8e9'
+down_revision = 'e3f4a5b6c7d8'
+branch_labels = None
+depends_on = None
+
+
+CATALOG_TABLES = ['categories', 'products', 'product_options', 'location_products']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'catalog_changes',
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('entity', sa.String(length=32), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=10), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('version')
+    )
+
+    op.execute("""
+        CREATE FUNCTION log_catalog_change() RETURNS trigger AS $$
+        BEGIN
+            -- Serialize catalog writers until commit: versions in commit order
+            PERFORM pg_advisory_xact_lock(hashtext('catalog_changes'));
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO catalog_changes (entity, entity_id, operation) VALUES (TG_TABLE_NAME, OLD.id, 'delete');
+                RETURN OLD;
+            END IF;
+            INSERT INTO catalog_changes (entity, entity_id, operation) VALUES (TG_TABLE_NAME, NEW.id, lower(TG_OP));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"INSERT INTO catalog_changes (entity, entity_id, operation) "
+            f"SELECT '{table}', id, 'insert' FROM {table} ORDER BY id"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_change AFTER INSERT OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION log_catalog_change()"
+        )
+        # Saves that change nothing are not versions
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_update AFTER UPDATE ON {table} "
+            f"FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW) EXECUTE FUNCTION log_catalog_change()"
+        )
+
+
+def downgrade() -> None:
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_update ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS log_catalog_change()")
+    op.drop_table('catalog_changes')
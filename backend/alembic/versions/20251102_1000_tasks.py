@@ -0,0 +1,57 @@
+"""Add tasks table for the background task queue
+
+Revision ID: a5b6c7d8e9f0
+Revises: f4a5b6c7d8e9
+Create Date: 2025-11-02 10:00:00.000000+00:00
+
+Rows are enqueued inside the request transaction and claimed by
+scripts/task_worker.py with SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5b6c7d8e9f0'
+down_revision = 'f4a5b6c7d8e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tasks',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('kind', sa.String(length=100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_tasks_pending_run_at', 'tasks', ['run_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.create_index(
+        'ix_tasks_running_locked_at', 'tasks', ['locked_at'],
+        postgresql_where=sa.text("status = 'running'")
+    )
+    op.create_index(
+        'ix_tasks_status_finished_at', 'tasks', ['status', 'finished_at'],
+        postgresql_where=sa.text("status IN ('done', 'dead')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_finished_at', table_name='tasks')
+    op.drop_index('ix_tasks_running_locked_at', table_name='tasks')
+    op.drop_index('ix_tasks_pending_run_at', table_name='tasks')
+    op.drop_table('tasks')
@@ -0,0 +1,53 @@
+"""Stock reservations: reserved quantity per order item
+
+Revision ID: b6c7d8e9f0a1
+Revises: a5b6c7d8e9f0
+Create Date: 2025-11-03 10:00:00.000000+00:00
+
+Every order now decrements location_products.stock_quantity. Logged as
+catalog changes, each order would append a version and take the catalog
+advisory lock until commit, serializing all orders. The location_products
+update trigger now skips stock-only updates unless the product sells out
+or comes back (stock crossing zero, or switching limited/unlimited).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6c7d8e9f0a1'
+down_revision = 'a5b6c7d8e9f0'
+branch_labels = None
+depends_on = None
+
+
+# Columns of location_products other than stock_quantity and updated_at,
+# extend when adding one
+OFFER_COLUMNS = ['location_id', 'product_id', 'price_override', 'is_available', 'sort_order']
+
+
+def upgrade() -> None:
+    op.add_column(
+        'order_items',
+        sa.Column('reserved_quantity', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    old_columns = ', '.join(f'OLD.{column}' for column in OFFER_COLUMNS)
+    new_columns = ', '.join(f'NEW.{column}' for column in OFFER_COLUMNS)
+    op.execute("DROP TRIGGER location_products_catalog_update ON location_products")
+    op.execute(
+        f"CREATE TRIGGER location_products_catalog_update AFTER UPDATE ON location_products "
+        f"FOR EACH ROW WHEN ("
+        f"ROW({old_columns}) IS DISTINCT FROM ROW({new_columns}) "
+        f"OR (OLD.stock_quantity > 0) IS DISTINCT FROM (NEW.stock_quantity > 0)"
+        f") EXECUTE FUNCTION log_catalog_change()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER location_products_catalog_update ON location_products")
+    op.execute(
+        "CREATE TRIGGER location_products_catalog_update AFTER UPDATE ON location_products "
+        "FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW) EXECUTE FUNCTION log_catalog_change()"
+    )
+    op.drop_column('order_items', 'reserved_quantity')
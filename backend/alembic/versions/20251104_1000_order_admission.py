@@ -0,0 +1,43 @@
+"""Kitchen capacity per location and admitted orders per slot
+
+Revision ID: c7d8e9f0a1b2
+Revises: b6c7d8e9f0a1
+Create Date: 2025-11-04 10:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d8e9f0a1b2'
+down_revision = 'b6c7d8e9f0a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('locations', sa.Column('slot_minutes', sa.Integer(), nullable=False, server_default='10'))
+    op.add_column('locations', sa.Column('orders_per_slot', sa.Integer(), nullable=True))
+    op.add_column('locations', sa.Column('prep_minutes', sa.Integer(), nullable=False, server_default='15'))
+
+    op.add_column('orders', sa.Column('slot_start', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('orders', sa.Column('ready_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.create_table(
+        'location_slots',
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('slot_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('orders', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('location_id', 'slot_start')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('location_slots')
+    op.drop_column('orders', 'ready_at')
+    op.drop_column('orders', 'slot_start')
+    op.drop_column('locations', 'prep_minutes')
+    op.drop_column('locations', 'orders_per_slot')
+    op.drop_column('locations', 'slot_minutes')
@@ -0,0 +1,153 @@
+"""
+Response compression with cached variants
+Compresses JSON and text responses with brotli or gzip, whichever the
+client's Accept-Encoding prefers (brotli on ties). Compressed bodies are
+kept in an LRU keyed by a hash of the uncompressed body, so a menu or
+location list is compressed once per content version, not per request.
+
+Skipped: responses below COMPRESSION_MIN_SIZE, non-text content types,
+responses already carrying a Content-Encoding (e.g. the WebApp bootstrap,
+which precompresses itself), Cache-Control: no-transform, and streaming
+responses (more than one body message, e.g. files).
+
+brotli is optional; without it only gzip is offered.
+"""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import record_cache
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """Best encoding of `available` (in preference order) for an Accept-Encoding value"""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressedVariants:
+    """LRU of compressed bodies by (content hash, encoding), bounded in bytes"""
+
+    def __init__(self, max_bytes: int, gzip_level: int = 6, brotli_quality: int = 5):
+        self.max_bytes = max_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        return ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, self.gzip_level, mtime=0)
+
+    def get(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = self._entries.get(key)
+        record_cache("compression", compressed is not None)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            return compressed
+
+        compressed = self.compress(body, encoding)
+        if len(compressed) <= self.max_bytes:
+            self._entries[key] = compressed
+            self.size += len(compressed)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+        return compressed
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete text responses from cached variants"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache_bytes: int = 16 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.variants = CompressedVariants(cache_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept_encoding, self.variants.encodings) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message  # Held until the body shows whether it streams
+                return
+            if start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            body = message.get("body", b"")
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or not self._compressible(held, body)
+            ):
+                await send(held)
+                await send(message)
+                return
+
+            compressed = self.variants.get(body, encoding)
+            headers = MutableHeaders(raw=list(held["headers"]))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send({**held, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, start: Message, body: bytes) -> bool:
+        if len(body) < self.minimum_size or start["status"] in (204, 206, 304):
+            return False
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
@@ -3,11 +3,11 @@ Dependencies for route handlers
 Authentication and authorization
 """
 
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Request
 from typing import Optional
 from jose import JWTError
 
-from app.core.security import verify_token
+from app.core.security import verify_token, verify_webhook_signature
 from app.config import settings
 
 
@@ -98,3 +98,48 @@ async def verify_api_key(x_api_key: Optional[str] = Header(None)) -> bool:
         )
     
     return True
+
+
+async def verify_n8n_signature(
+    request: Request,
+    x_signature: Optional[str] = Header(None),
+    x_signature_timestamp: Optional[str] = Header(None)
+) -> bool:
+    """
+    Verify HMAC signature of n8n callbacks
+    
+    n8n signs "<X-Signature-Timestamp>.<raw body>" with N8N_WEBHOOK_SECRET
+    and sends the result as "X-Signature: sha256=<hex>".
+    
+    Args:
+        request: Incoming request (raw body is read for verification)
+        x_signature: Signature header
+        x_signature_timestamp: Unix timestamp header
+        
+    Returns:
+        True if signature is valid
+        
+    Raises:
+        HTTPException: If secret is not configured or signature is invalid
+    """
+    if not settings.N8N_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="n8n webhook secret is not configured",
+        )
+    
+    body = await request.body()
+    
+    if not verify_webhook_signature(
+        body,
+        x_signature_timestamp,
+        x_signature,
+        settings.N8N_WEBHOOK_SECRET,
+        tolerance_seconds=settings.N8N_SIGNATURE_TOLERANCE_SECONDS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook signature",
+        )
+    
+    return True
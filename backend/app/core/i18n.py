@@ -1,247 +1,187 @@
 """
 Internationalization (i18n) support
 Supports: Ukrainian (uk), English (en), Russian (ru)
+
+All messages of the backend and the Telegram bot live in one catalog,
+app/locales/messages.json (key -> language -> text). It is loaded once and
+compiled into flat per-language lookup tables: fallback languages are
+merged in ahead of time and format templates are pre-parsed, so a lookup is
+a single dict access and plain strings are returned without formatting.
+
+The fallback rule lives only here: the bot loads the resolved tables
+(MessageCatalog.texts, served by GET /api/i18n/catalog) instead of
+compiling the catalog itself.
 """
 
-from typing import Dict
+import json
+import logging
+from pathlib import Path
+from string import Formatter
+from typing import Dict, List, Optional, Tuple, Union
+
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "locales" / "messages.json"
+
+# Language used when a key has no text for the requested language
+FALLBACK_LANGUAGE = "en"
+
+
+class MessageTemplate:
+    """Message text with placeholders parsed once at load time"""
+
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        # (literal, field, format_spec, conversion) as returned by Formatter.parse
+        self.parts: List[Tuple[str, Optional[str], str, Optional[str]]] = list(Formatter().parse(text))
+
+    def render(self, kwargs: Dict) -> str:
+        """Fill placeholders; returns raw text if an argument is missing"""
+        chunks = []
+        for literal, field, spec, conversion in self.parts:
+            chunks.append(literal)
+            if field is None:
+                continue
+            if field not in kwargs:
+                return self.text
+            value = kwargs[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            chunks.append(format(value, spec))
+        return "".join(chunks)
+
+
+Message = Union[str, MessageTemplate]
+
+
+def compile_message(text: str) -> Message:
+    """Keep plain strings as-is, pre-parse strings with placeholders"""
+    template = MessageTemplate(text)
+    if all(field is None for _, field, _, _ in template.parts):
+        # "{{" escapes still need unescaping once
+        return "".join(literal for literal, _, _, _ in template.parts)
+    return template
+
+
+class MessageCatalog:
+    """Compiled message catalog with one flat lookup table per language"""
+
+    def __init__(
+        self,
+        messages: Dict[str, Dict[str, str]],
+        languages: List[str],
+        fallback_language: str = FALLBACK_LANGUAGE
+    ):
+        self.messages = messages
+        self.languages = list(languages)
+        self.fallback_language = fallback_language
+
+        own: Dict[str, Dict[str, str]] = {language: {} for language in self.languages}
+        for key, texts in messages.items():
+            for language, text in texts.items():
+                if language in own:
+                    own[language][key] = text
+
+        # Resolved texts per language, fallback merged in (language -> key -> text)
+        fallback = own.get(fallback_language, {})
+        self.texts: Dict[str, Dict[str, str]] = {
+            language: {**fallback, **table} for language, table in own.items()
+        }
+        self.tables: Dict[str, Dict[str, Message]] = {
+            language: {key: compile_message(text) for key, text in table.items()}
+            for language, table in self.texts.items()
+        }
 
-# Translation dictionaries
-TRANSLATIONS: Dict[str, Dict[str, str]] = {
-    # Common
-    "app_name": {
-        "uk": "PizzaMat",
-        "en": "PizzaMat",
-        "ru": "PizzaMat"
-    },
-    "welcome": {
-        "uk": "Ласкаво просимо!",
-        "en": "Welcome!",
-        "ru": "Добро пожаловать!"
-    },
-    "success": {
-        "uk": "Успішно",
-        "en": "Success",
-        "ru": "Успешно"
-    },
-    "error": {
-        "uk": "Помилка",
-        "en": "Error",
-        "ru": "Ошибка"
-    },
-    
-    # Auth
-    "auth_required": {
-        "uk": "Необхідна авторизація",
-        "en": "Authorization required",
-        "ru": "Требуется авторизация"
-    },
-    "invalid_credentials": {
-        "uk": "Невірні облікові дані",
-        "en": "Invalid credentials",
-        "ru": "Неверные учетные данные"
-    },
-    "user_registered": {
-        "uk": "Користувач успішно зареєстрований",
-        "en": "User registered successfully",
-        "ru": "Пользователь успешно зарегистрирован"
-    },
-    "user_exists": {
-        "uk": "Користувач вже існує",
-        "en": "User already exists",
-        "ru": "Пользователь уже существует"
-    },
-    
-    # Orders
-    "order_created": {
-        "uk": "Замовлення створено",
-        "en": "Order created",
-        "ru": "Заказ создан"
-    },
-    "order_not_found": {
-        "uk": "Замовлення не знайдено",
-        "en": "Order not found",
-        "ru": "Заказ не найден"
-    },
-    "order_confirmed": {
-        "uk": "Замовлення підтверджено",
-        "en": "Order confirmed",
-        "ru": "Заказ подтвержден"
-    },
-    "order_cancelled": {
-        "uk": "Замовлення скасовано",
-        "en": "Order cancelled",
-        "ru": "Заказ отменен"
-    },
-    "order_pending": {
-        "uk": "Очікує оплати",
-        "en": "Pending payment",
-        "ru": "Ожидает оплаты"
-    },
-    "order_paid": {
-        "uk": "Оплачено",
-        "en": "Paid",
-        "ru": "Оплачен"
-    },
-    "order_completed": {
-        "uk": "Виконано",
-        "en": "Completed",
-        "ru": "Выполнен"
-    },
-    
-    # Receipt
-    "receipt_uploaded": {
-        "uk": "Чек завантажено",
-        "en": "Receipt uploaded",
-        "ru": "Чек загружен"
-    },
-    "receipt_invalid": {
-        "uk": "Невірний чек",
-        "en": "Invalid receipt",
-        "ru": "Недействительный чек"
-    },
-    "receipt_duplicate": {
-        "uk": "Цей чек вже використовувався",
-        "en": "This receipt has already been used",
-        "ru": "Этот чек уже использовался"
-    },
-    "receipt_validating": {
-        "uk": "Перевірка чеку...",
-        "en": "Validating receipt...",
-        "ru": "Проверка чека..."
-    },
-    
-    # Products
-    "product_not_found": {
-        "uk": "Товар не знайдено",
-        "en": "Product not found",
-        "ru": "Товар не найден"
-    },
-    "product_unavailable": {
-        "uk": "Товар недоступний",
-        "en": "Product unavailable",
-        "ru": "Товар недоступен"
-    },
-    
-    # Locations
-    "location_not_found": {
-        "uk": "Точку видачі не знайдено",
-        "en": "Pickup location not found",
-        "ru": "Точка выдачи не найдена"
-    },
-    "select_location": {
-        "uk": "Оберіть точку видачі",
-        "en": "Select pickup location",
-        "ru": "Выберите точку выдачи"
-    },
-    
-    # Validation
-    "validation_error": {
-        "uk": "Помилка валідації",
-        "en": "Validation error",
-        "ru": "Ошибка валидации"
-    },
-    "required_field": {
-        "uk": "Обов'язкове поле",
-        "en": "Required field",
-        "ru": "Обязательное поле"
-    },
-    "invalid_format": {
-        "uk": "Невірний формат",
-        "en": "Invalid format",
-        "ru": "Неверный формат"
-    },
-    "file_too_large": {
-        "uk": "Файл занадто великий",
-        "en": "File too large",
-        "ru": "Файл слишком большой"
-    },
-    "invalid_file_type": {
-        "uk": "Невірний тип файлу",
-        "en": "Invalid file type",
-        "ru": "Неверный тип файла"
-    },
-    
-    # Cart
-    "cart_empty": {
-        "uk": "Кошик порожній",
-        "en": "Cart is empty",
-        "ru": "Корзина пуста"
-    },
-    "add_to_cart": {
-        "uk": "Додати до кошика",
-        "en": "Add to cart",
-        "ru": "Добавить в корзину"
-    },
-    
-    # Buttons
-    "confirm": {
-        "uk": "Підтвердити",
-        "en": "Confirm",
-        "ru": "Подтвердить"
-    },
-    "cancel": {
-        "uk": "Скасувати",
-        "en": "Cancel",
-        "ru": "Отменить"
-    },
-    "save": {
-        "uk": "Зберегти",
-        "en": "Save",
-        "ru": "Сохранить"
-    },
-    "delete": {
-        "uk": "Видалити",
-        "en": "Delete",
-        "ru": "Удалить"
-    },
-    "back": {
-        "uk": "Назад",
-        "en": "Back",
-        "ru": "Назад"
-    },
-}
+    @classmethod
+    def load(cls, path: Path = CATALOG_PATH, **kwargs) -> "MessageCatalog":
+        """Load catalog from JSON file"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def missing_keys(self) -> Dict[str, List[str]]:
+        """Keys without own text, per language"""
+        missing = {}
+        for language in self.languages:
+            keys = sorted(key for key, texts in self.messages.items() if language not in texts)
+            if keys:
+                missing[language] = keys
+        return missing
+
+    def validate(self, strict: bool = False):
+        """
+        Check every language has every key
+
+        Args:
+            strict: Raise instead of logging a warning
+
+        Raises:
+            ValueError: If strict and keys are missing
+        """
+        missing = self.missing_keys()
+        if not missing:
+            return
+        details = "; ".join(f"{language}: {', '.join(keys)}" for language, keys in missing.items())
+        if strict:
+            raise ValueError(f"Message catalog is incomplete - {details}")
+        logger.warning(f"Message catalog is incomplete - {details}")
+
+
+catalog = MessageCatalog.load(languages=settings.SUPPORTED_LANGUAGES)
+
+# Raw catalog (key -> language -> text)
+TRANSLATIONS: Dict[str, Dict[str, str]] = catalog.messages
 
 
 class Translator:
-    """Simple translator class"""
-    
+    """Translator bound to one language's compiled table"""
+
+    __slots__ = ("language", "_table")
+
     def __init__(self, language: str = None):
         self.language = language or settings.DEFAULT_LANGUAGE
         if self.language not in settings.SUPPORTED_LANGUAGES:
             self.language = settings.DEFAULT_LANGUAGE
-    
+        self._table = catalog.tables.get(self.language, {})
+
     def translate(self, key: str, **kwargs) -> str:
         """
         Translate a key to current language
-        
+
         Args:
             key: Translation key
             **kwargs: Format arguments
-            
+
         Returns:
-            Translated string
+            Translated string (the key itself if unknown)
         """
-        translation_dict = TRANSLATIONS.get(key, {})
-        text = translation_dict.get(self.language, translation_dict.get("en", key))
-        
-        if kwargs:
-            try:
-                text = text.format(**kwargs)
-            except KeyError:
-                pass
-        
-        return text
-    
+        message = self._table.get(key, key)
+        if message.__class__ is str:
+            return message
+        return message.render(kwargs)
+
     def t(self, key: str, **kwargs) -> str:
         """Shorthand for translate()"""
         return self.translate(key, **kwargs)
 
 
+_translators: Dict[str, Translator] = {}
+
+
 def get_translator(language: str = None) -> Translator:
-    """Get translator instance for specified language"""
-    return Translator(language)
+    """Get cached translator instance for specified language"""
+    if language not in catalog.tables:
+        language = settings.DEFAULT_LANGUAGE
+    translator = _translators.get(language)
+    if translator is None:
+        translator = Translator(language)
+        _translators[language] = translator
+    return translator
 
 
 # Default translator
@@ -0,0 +1,136 @@
+"""
+Idempotency keys
+A client that may retry a POST (network timeouts, double taps) sends an
+Idempotency-Key header; every retry with the same key gets the response of
+the first request instead of repeating its side effects.
+
+The key is claimed and its response stored inside the request's own
+transaction. A retry arriving while the first request still runs waits on
+the key's primary key until that transaction ends, then replays its
+response; if the first request failed and rolled back, the retry simply
+runs. No "in progress" state is ever committed, so a crashed request
+cannot leave a key stuck. Only successful responses are stored: errors
+roll back with the transaction.
+
+Keys expire after IDEMPOTENCY_TTL_HOURS; a key reused with a different
+request body is refused with 422.
+
+Usage:
+    idempotency = Idempotency(db, "orders.create", idempotency_key, request)
+    replay = await idempotency.begin()
+    if replay is not None:
+        return replay
+    ...
+    await idempotency.save(response)
+    await db.commit()
+    return response
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.metrics import record_idempotency
+from app.core.responses import FastJSONResponse
+from app.database import async_session_maker
+from app.models.idempotency import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def fingerprint(payload: Any) -> str:
+    """SHA-256 of a request body in canonical JSON"""
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json")
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class Idempotency:
+    """Idempotency-Key handling of one request, within its transaction"""
+
+    def __init__(self, db: AsyncSession, scope: str, key: Optional[str], payload: Any):
+        self.db = db
+        self.scope = scope
+        self.key = key or None
+        self.fingerprint = fingerprint(payload) if self.key else None
+
+    def _where(self):
+        return and_(IdempotencyKey.scope == self.scope, IdempotencyKey.key == self.key)
+
+    async def begin(self) -> Optional[FastJSONResponse]:
+        """
+        Claim the key; the stored response when it was already used
+
+        Returns None when the request should run (no key, or first use).
+        """
+        if self.key is None:
+            return None
+
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+        statement = insert(IdempotencyKey).values(
+            scope=self.scope, key=self.key, fingerprint=self.fingerprint, expires_at=expires_at
+        )
+        claimed = (await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+                # Only an expired key can be taken over
+                set_={
+                    "fingerprint": statement.excluded.fingerprint,
+                    "status_code": None,
+                    "response": None,
+                    "created_at": func.now(),
+                    "expires_at": statement.excluded.expires_at,
+                },
+                where=IdempotencyKey.expires_at < func.now(),
+            ).returning(IdempotencyKey.key)
+        )).scalar_one_or_none()
+        if claimed is not None:
+            record_idempotency(self.scope, "new")
+            return None
+
+        stored = (await self.db.execute(
+            select(IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.response)
+            .where(self._where())
+        )).one_or_none()
+        if stored is not None and stored.fingerprint != self.fingerprint:
+            record_idempotency(self.scope, "mismatch")
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_HEADER} was already used with a different request"
+            )
+        if stored is None or stored.response is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A request with this {IDEMPOTENCY_HEADER} is still being processed"
+            )
+
+        record_idempotency(self.scope, "replayed")
+        return FastJSONResponse(stored.response, status_code=stored.status_code, headers={REPLAYED_HEADER: "true"})
+
+    async def save(self, response: Dict[str, Any], status_code: int = 200):
+        """Store the response to replay (before the request's commit)"""
+        if self.key is None:
+            return
+        await self.db.execute(
+            update(IdempotencyKey)
+            .where(self._where())
+            .values(status_code=status_code, response=response)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def purge_expired_idempotency_keys():
+    """Scheduler job: delete expired idempotency keys"""
+    async with async_session_maker() as session:
+        await session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < func.now()))
+        await session.commit()
@@ -0,0 +1,257 @@
+"""
+Cross-worker cache invalidation
+In-process caches register a handler per topic in `cache_registry`. A
+write calls `await invalidation_bus.publish(topic, keys)` after its commit:
+the local caches are invalidated at once and the message is broadcast, so
+every other worker drops the same entries as soon as it arrives.
+
+Backends (INVALIDATION_BACKEND):
+    postgres - NOTIFY on INVALIDATION_CHANNEL, a dedicated asyncpg
+               connection LISTENs (no extra infrastructure)
+    redis    - Redis pub/sub on REDIS_URL
+    local    - no broadcast (single worker)
+
+Messages sent while a worker is disconnected are lost, so after every
+(re)subscribe the worker flushes all registered caches.
+
+Usage:
+    cache_registry.register(InvalidationTopic.CATALOG, lambda keys: menu_cache.clear())
+
+    await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.CATALOG)
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Sequence
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.core.metrics import record_invalidation
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads must stay below 8000 bytes, larger key lists flush the topic
+MAX_PAYLOAD_BYTES = 7900
+
+
+class InvalidationTopic(str, Enum):
+    """What changed; keys (ids) narrow it down, none means everything"""
+    CATALOG = "catalog"  # Categories, products, options, location products
+    LOCATIONS = "locations"  # Cities and pickup locations
+    STOCK = "stock"  # A product sold out or came back; keys: location ids
+
+
+InvalidationHandler = Callable[[Optional[List]], None]
+
+
+class CacheRegistry:
+    """Invalidation handlers of the in-process caches, by topic"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[InvalidationHandler]] = defaultdict(list)
+
+    def register(self, topic: InvalidationTopic, handler: InvalidationHandler):
+        self._handlers[InvalidationTopic(topic).value].append(handler)
+
+    def invalidate(self, topic: str, keys: Optional[List] = None):
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(keys)
+            except Exception as e:
+                logger.error(f"Cache invalidation handler for {topic} failed: {e}")
+
+    def flush_all(self):
+        for topic in list(self._handlers):
+            self.invalidate(topic)
+            record_invalidation(topic, "flush")
+
+
+cache_registry = CacheRegistry()
+
+
+class InvalidationBus(ABC):
+    """Invalidates the local caches; subclasses broadcast to the other workers"""
+
+    backend: str
+
+    def __init__(self, registry: CacheRegistry, channel: str):
+        self.registry = registry
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, topic: InvalidationTopic, keys: Optional[Sequence] = None):
+        """Invalidate locally, then tell the other workers (call after commit)"""
+        topic = InvalidationTopic(topic).value
+        keys = list(keys) if keys is not None else None
+        self.registry.invalidate(topic, keys)
+        record_invalidation(topic, "local")
+
+        payload = json.dumps({"topic": topic, "keys": keys, "origin": self.origin})
+        if len(payload) > MAX_PAYLOAD_BYTES:
+            payload = json.dumps({"topic": topic, "keys": None, "origin": self.origin})
+        try:
+            await self._send(payload)
+        except Exception as e:
+            # Other workers keep serving the old entries until their TTL
+            logger.error(f"Failed to broadcast {topic} invalidation: {e}")
+
+    def _receive(self, payload) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation message: {payload!r}")
+            return
+        if message.get("origin") == self.origin:
+            return  # Already applied by publish()
+        topic = message.get("topic")
+        self.registry.invalidate(topic, message.get("keys"))
+        record_invalidation(topic, "remote")
+
+    @abstractmethod
+    async def _send(self, payload: str):
+        """Broadcast payload to the other workers"""
+
+    @abstractmethod
+    async def _listen(self):
+        """Subscribe, call _subscribed(), return or raise when the connection is lost"""
+
+    def _subscribed(self):
+        # Anything published while we were not listening is lost
+        self.registry.flush_all()
+        self._retry_delay = 1.0
+        logger.info(f"Listening for cache invalidations ({self.backend}: {self.channel})")
+
+    async def _run(self):
+        self._retry_delay = 1.0
+        while True:
+            try:
+                await self._listen()
+                logger.warning("Cache invalidation connection closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation connection lost: {e}")
+            self.registry.flush_all()
+            await asyncio.sleep(self._retry_delay)
+            self._retry_delay = min(self._retry_delay * 2, 30.0)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class LocalInvalidationBus(InvalidationBus):
+    """Single worker: nothing to broadcast or listen to"""
+
+    backend = "local"
+
+    async def _send(self, payload: str):
+        pass
+
+    async def _listen(self):
+        pass
+
+    async def start(self):
+        pass
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """LISTEN/NOTIFY; NOTIFY goes through the pool, LISTEN holds one connection"""
+
+    backend = "postgres"
+
+    def __init__(self, registry: CacheRegistry, channel: str, database_url: str, keepalive: float = 30.0):
+        super().__init__(registry, channel)
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.keepalive = keepalive
+
+    async def _send(self, payload: str):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+            await conn.commit()
+
+    async def _listen(self):
+        conn = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        try:
+            await conn.add_listener(self.channel, lambda _conn, _pid, _channel, payload: self._receive(payload))
+            self._subscribed()
+            # A dead peer is only noticed on traffic, so ping while idle
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    await conn.execute("SELECT 1", timeout=10)
+        finally:
+            if not conn.is_closed():
+                await conn.close(timeout=5)
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Redis pub/sub"""
+
+    backend = "redis"
+
+    def __init__(self, registry: CacheRegistry, channel: str, redis_url: str):
+        super().__init__(registry, channel)
+        import redis.asyncio as redis
+
+        self._redis = redis
+        self.redis_url = redis_url
+        self._client = redis.from_url(redis_url)
+
+    async def _send(self, payload: str):
+        await self._client.publish(self.channel, payload)
+
+    async def _listen(self):
+        client = self._redis.from_url(self.redis_url)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            self._subscribed()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self._receive(message["data"])
+        finally:
+            await pubsub.close()
+            await client.close()
+
+    async def stop(self):
+        await super().stop()
+        await self._client.close()
+
+
+def create_invalidation_bus() -> InvalidationBus:
+    """Bus for the configured INVALIDATION_BACKEND"""
+    backend = settings.INVALIDATION_BACKEND
+    if backend == "postgres":
+        return PostgresInvalidationBus(cache_registry, settings.INVALIDATION_CHANNEL, settings.DATABASE_URL)
+    if backend == "redis":
+        return RedisInvalidationBus(cache_registry, settings.INVALIDATION_CHANNEL, settings.REDIS_URL)
+    if backend != "local":
+        logger.warning(f"Unknown INVALIDATION_BACKEND {backend!r}, invalidating locally only")
+    return LocalInvalidationBus(cache_registry, settings.INVALIDATION_CHANNEL)
+
+
+invalidation_bus = create_invalidation_bus()
@@ -0,0 +1,64 @@
+"""
+Lazy route loading
+Route modules that are rarely hit right after a cold start (admin panel,
+analytics, auth) can be imported on their first request instead of at
+process start. Building their endpoints (dependency and form models) is a
+large part of startup time, while customer-facing routes stay eager.
+
+Enabled with LAZY_ROUTERS=true.
+"""
+
+import importlib
+import logging
+from typing import Dict
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRouterMiddleware:
+    """
+    ASGI middleware including a route module's router on the first request
+    under its URL prefix
+
+    Args:
+        app: Next ASGI application
+        target: FastAPI application to include routers into
+        routers: URL prefix -> module path exposing `router`
+        prefix: Prefix passed to include_router (e.g. "/api")
+    """
+
+    def __init__(self, app: ASGIApp, target: FastAPI, routers: Dict[str, str], prefix: str = ""):
+        self.app = app
+        self.target = target
+        self.prefix = prefix
+        self.pending: Dict[str, str] = dict(routers)
+
+    def load(self, url_prefix: str):
+        """Import module and include its router (synchronous, so no races)"""
+        module_path = self.pending.pop(url_prefix, None)
+        if module_path is None:
+            return
+        module = importlib.import_module(module_path)
+        self.target.include_router(module.router, prefix=self.prefix)
+        # Schema is cached after first build
+        self.target.openapi_schema = None
+        logger.info(f"Loaded routes {url_prefix} from {module_path}")
+
+    def load_all(self):
+        for url_prefix in list(self.pending):
+            self.load(url_prefix)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if self.pending and scope["type"] == "http":
+            path = scope["path"]
+            if path == self.target.openapi_url:
+                self.load_all()
+            else:
+                for url_prefix in list(self.pending):
+                    if path == url_prefix or path.startswith(url_prefix + "/"):
+                        self.load(url_prefix)
+                        break
+        await self.app(scope, receive, send)
@@ -0,0 +1,337 @@
+"""
+Prometheus metrics
+Request latency per route, DB pool usage and checkout wait, outgoing HTTP
+calls and cache hit rates, exposed at GET /metrics.
+
+With several uvicorn workers set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers; /metrics then aggregates all of them.
+"""
+
+import os
+import time
+
+import httpx
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Buckets for sub-second API work (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+
+# ==================== Metric definitions ====================
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being processed",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled DB connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "DB connections currently checked out",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_EVENTS = Counter(
+    "db_pool_events_total",
+    "DB pool events (connect, checkout, checkin, invalidate)",
+    ["pool", "event"],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued per HTTP request",
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than SLOW_QUERY_MS",
+)
+
+HTTP_CLIENT_REQUESTS = Counter(
+    "http_client_requests_total",
+    "Outgoing HTTP requests",
+    ["client", "method", "status"],
+)
+HTTP_CLIENT_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Outgoing HTTP request latency",
+    ["client", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    ["cache", "result"],
+)
+
+
+def record_cache(cache: str, hit: bool):
+    """Count a cache lookup"""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+SCHEDULER_IS_LEADER = Gauge(
+    "scheduler_is_leader",
+    "1 on the worker holding the background job lock (sum over workers should be 1)",
+    multiprocess_mode="livesum",
+)
+JOB_RUNS = Counter(
+    "job_runs_total",
+    "Background job runs by job and result (success, failure, cancelled)",
+    ["job", "result"],
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Background job run time",
+    ["job"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+JOB_LAST_SUCCESS = Gauge(
+    "job_last_success_timestamp_seconds",
+    "Unix time of the last successful run of a background job",
+    ["job"],
+    multiprocess_mode="max",
+)
+
+
+def record_job_run(job: str, result: str, seconds: float):
+    """Count a background job run and its duration"""
+    JOB_RUNS.labels(job, result).inc()
+    JOB_DURATION.labels(job).observe(seconds)
+    if result == "success":
+        JOB_LAST_SUCCESS.labels(job).set(time.time())
+
+
+TASKS_PROCESSED = Counter(
+    "tasks_processed_total",
+    "Queued task attempts by kind and outcome (done, retry, dead, requeued)",
+    ["kind", "result"],
+)
+TASK_DURATION = Histogram(
+    "task_duration_seconds",
+    "Queued task handler run time",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+TASK_QUEUE_DELAY = Histogram(
+    "task_queue_delay_seconds",
+    "Time from a task becoming due to a worker claiming it",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+
+def record_task(kind: str, result: str, seconds: float):
+    """Count a queued task attempt and its handler run time"""
+    TASKS_PROCESSED.labels(kind, result).inc()
+    TASK_DURATION.labels(kind).observe(seconds)
+
+
+STOCK_RESERVATIONS = Counter(
+    "stock_reservations_total",
+    "Stock reservation outcomes (reserved, out_of_stock, released, expired)",
+    ["result"],
+)
+
+
+def record_stock(result: str):
+    STOCK_RESERVATIONS.labels(result).inc()
+
+
+ORDER_ADMISSIONS = Counter(
+    "order_admissions_total",
+    "Order admission decisions per pickup location (admitted, rejected)",
+    ["location", "result"],
+)
+ORDER_QUOTED_WAIT = Histogram(
+    "order_quoted_wait_seconds",
+    "Time from order creation to the quoted ready time",
+    buckets=(300, 600, 900, 1200, 1800, 2700, 3600, 5400, 7200),
+)
+
+
+def record_admission(location_id: int, admitted: bool, wait_seconds: float = 0.0):
+    ORDER_ADMISSIONS.labels(str(location_id), "admitted" if admitted else "rejected").inc()
+    if admitted:
+        ORDER_QUOTED_WAIT.observe(wait_seconds)
+
+
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests_total",
+    "Requests sent with an Idempotency-Key by scope and outcome (new, replayed, mismatch)",
+    ["scope", "result"],
+)
+
+
+def record_idempotency(scope: str, result: str):
+    IDEMPOTENT_REQUESTS.labels(scope, result).inc()
+
+
+CACHE_INVALIDATIONS = Counter(
+    "cache_invalidations_total",
+    "In-process cache invalidations by topic and source (local write, remote worker, reconnect flush)",
+    ["topic", "source"],
+)
+
+
+def record_invalidation(topic: str, source: str):
+    """Count an invalidation applied to this worker's caches"""
+    CACHE_INVALIDATIONS.labels(topic, source).inc()
+
+
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "single_flight_requests_total",
+    "Coalesced reads by name and result (leader runs the fetch, coalesced shares it)",
+    ["name", "result"],
+)
+
+
+def record_coalesced(name: str, coalesced: bool):
+    """Count a request going through a single-flight group"""
+    SINGLE_FLIGHT_REQUESTS.labels(name, "coalesced" if coalesced else "leader").inc()
+
+
+# ==================== HTTP server ====================
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count and latency
+
+    Requests are labeled with the matched route template (/api/orders/{order_id}),
+    not the raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "<unmatched>"
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route_path).observe(elapsed)
+
+
+def render_metrics() -> tuple:
+    """
+    Render metrics in Prometheus text format
+
+    Returns:
+        (body, content_type)
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+# ==================== Database pool ====================
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool timing how long checkouts wait for a free connection"""
+
+    metrics_label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine, label: str = "primary"):
+    """Track connections in use and pool events of an engine, labelled by pool"""
+    pool = engine.sync_engine.pool
+    pool.metrics_label = label
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        DB_POOL_EVENTS.labels(label, "connect").inc()
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CONNECTIONS_IN_USE.labels(label).inc()
+        DB_POOL_EVENTS.labels(label, "checkout").inc()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS_IN_USE.labels(label).dec()
+        DB_POOL_EVENTS.labels(label, "checkin").inc()
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_EVENTS.labels(label, "invalidate").inc()
+
+
+# ==================== HTTP client ====================
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """httpx transport recording outgoing request count and latency"""
+
+    def __init__(self, client: str, **transport_kwargs):
+        self.client = client
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            HTTP_CLIENT_REQUESTS.labels(self.client, request.method, status).inc()
+            HTTP_CLIENT_DURATION.labels(self.client, request.method).observe(time.perf_counter() - started)
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -0,0 +1,191 @@
+"""
+Query statistics
+Counts SQL statements per request and logs slow ones, so an N+1 added to a
+route (dashboard stats, user journey, ...) shows up in logs and checks.
+
+Statements are grouped by fingerprint: the SQL with literals and bind
+parameters replaced by `?` and IN lists collapsed, so the same query with
+different ids counts as one shape.
+
+    SLOW_QUERY_MS     - statements slower than this are logged with their route
+    QUERY_COUNT_WARN  - requests issuing more statements are logged with the
+                        most repeated fingerprints
+
+Each response carries an X-Query-Count header; scripts/check_query_budgets.py
+uses it (assert_response_max_queries()) to fail when a hot endpoint exceeds
+its query budget.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.metrics import DB_QUERIES_PER_REQUEST, DB_SLOW_QUERIES
+
+logger = logging.getLogger("app.slow_query")
+
+QUERY_COUNT_HEADER = "x-query-count"
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_RE = re.compile(r"\bVALUES\s*\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Normalize SQL so statements differing only in values compare equal"""
+    sql = _STRING_RE.sub("?", statement)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub("VALUES (...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """Statements executed within one request"""
+
+    __slots__ = ("count", "total_ms", "fingerprints", "scope")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints: Counter = Counter()
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return "-"
+        route = getattr(self.scope.get("route"), "path", None)
+        return f"{self.scope['method']} {route or self.scope['path']}"
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def most_repeated(self, limit: int = 3):
+        return [(sql, n) for sql, n in self.fingerprints.most_common(limit) if n > 1]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+# ==================== SQLAlchemy ====================
+
+def instrument_engine_queries(engine: AsyncEngine):
+    """Time every statement, count it for the current request, log slow ones"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            if settings.METRICS_ENABLED:
+                DB_SLOW_QUERIES.inc()
+            route = stats.route if stats is not None else "-"
+            logger.warning(f"Slow query {elapsed_ms:.1f} ms [{route}]: {fingerprint(statement)}")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        started = conn.info.get("query_started") if conn is not None else None
+        if started:
+            started.pop()
+
+
+# ==================== FastAPI ====================
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware collecting QueryStats per request
+
+    Adds X-Query-Count to the response and logs requests issuing more than
+    QUERY_COUNT_WARN statements with their most repeated fingerprints.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.encode(), str(stats.count).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        token = _current_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            if stats.count and settings.METRICS_ENABLED:
+                DB_QUERIES_PER_REQUEST.observe(stats.count)
+            if stats.count > settings.QUERY_COUNT_WARN:
+                repeated = "; ".join(f"{n}x {sql[:120]}" for sql, n in stats.most_repeated())
+                logger.warning(
+                    f"{stats.route} issued {stats.count} queries ({stats.total_ms:.1f} ms)"
+                    f"{', repeated: ' + repeated if repeated else ''}"
+                )
+
+
+# ==================== Checks ====================
+
+class TooManyQueries(AssertionError):
+    """Endpoint exceeded its query budget"""
+
+
+def assert_response_max_queries(response, max_queries: int):
+    """
+    Fail if an HTTP response reports more than max_queries statements
+
+    Works with any client returning headers (TestClient, httpx), since the
+    count comes from the X-Query-Count header set by QueryStatsMiddleware.
+
+    Usage:
+        response = client.get("/api/analytics/dashboard", headers=auth)
+        assert_response_max_queries(response, 12)
+    """
+    value = response.headers.get(QUERY_COUNT_HEADER)
+    if value is None:
+        raise AssertionError(f"Response has no {QUERY_COUNT_HEADER} header (QUERY_STATS_ENABLED off?)")
+    count = int(value)
+    if count > max_queries:
+        request = response.request
+        raise TooManyQueries(f"{request.method} {request.url.path} issued {count} queries, expected at most {max_queries}")
@@ -0,0 +1,56 @@
+"""
+Fast JSON responses
+
+FastJSONResponse is the application's default response class. It renders
+with orjson (datetimes, UUIDs and dataclasses natively) and serializes
+pydantic models straight to bytes with their compiled pydantic-core
+serializer, so routes that return a response model instance skip
+jsonable_encoder and FastAPI's response validation entirely.
+
+Usage:
+    @router.get("/items", response_model=ItemListResponse)
+    async def get_items(...):
+        return FastJSONResponse(ItemListResponse(items=...))
+"""
+
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not serialize natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, date):  # stdlib json fallback only
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact JSON bytes, like FastJSONResponse does"""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is None:
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson / pydantic-core"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None and not isinstance(content, BaseModel):
+            return super().render(content)
+        return dumps(content)
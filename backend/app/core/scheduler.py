@@ -0,0 +1,158 @@
+"""
+Leader-elected job scheduler
+Periodic background jobs run on exactly one backend worker: the one
+holding a Postgres session-level advisory lock on a dedicated connection.
+Every other worker retries the lock every SCHEDULER_LEASE_SECONDS.
+
+The lease is the connection itself. The leader renews it every lease
+interval by checking that its backend still holds the lock; when the check
+fails (connection lost, database restarted) it cancels its jobs and goes
+back to competing. When the leader dies, Postgres drops the lock with its
+connection, which TCP keepalives detect within about lease interval x 3,
+and the next worker to retry takes over.
+
+A job may overlap with the previous leader's run during a failover, so
+jobs must be idempotent (upserts, conditional updates).
+
+Usage:
+    scheduler.add_job("daily_statistics", 900, rollup_recent_statistics)
+    await scheduler.start()
+"""
+
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.core.metrics import SCHEDULER_IS_LEADER, record_job_run
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key shared by all workers of this deployment
+SCHEDULER_LOCK_KEY = zlib.crc32(b"pizzamat:scheduler")
+
+
+@dataclass
+class Job:
+    """Periodic job: runs on becoming leader, then `interval` seconds after each run"""
+    name: str
+    interval: float
+    func: Callable[[], Awaitable[None]]
+
+
+class LeaderScheduler:
+    """Runs registered jobs while this worker holds the scheduler lock"""
+
+    def __init__(self, database_url: str, lock_key: int = SCHEDULER_LOCK_KEY, lease: float = 10.0):
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.lock_key = lock_key
+        self.lease = lease
+        self.jobs: Dict[str, Job] = {}
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    def add_job(self, name: str, interval: float, func: Callable[[], Awaitable[None]]):
+        if name in self.jobs:
+            raise ValueError(f"Job {name} is already registered")
+        self.jobs[name] = Job(name, interval, func)
+
+    async def start(self):
+        if self.jobs and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="scheduler")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self._campaign()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Scheduler lock connection failed: {e}")
+            await asyncio.sleep(self.lease)
+
+    async def _connect(self) -> asyncpg.Connection:
+        keepalive = str(max(1, int(self.lease)))
+        return await asyncpg.connect(
+            self.dsn,
+            timeout=self.lease,
+            server_settings={
+                "application_name": "pizzamat-scheduler",
+                # Let the server notice a dead leader and release its lock
+                "tcp_keepalives_idle": keepalive,
+                "tcp_keepalives_interval": keepalive,
+                "tcp_keepalives_count": "3",
+            },
+        )
+
+    async def _campaign(self):
+        """Try to take the lock once; while held, run the jobs and renew the lease"""
+        conn = await self._connect()
+        try:
+            if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", self.lock_key, timeout=self.lease):
+                return
+
+            logger.info(f"Scheduler leadership acquired, running {', '.join(self.jobs)}")
+            self._set_leader(True)
+            tasks: List[asyncio.Task] = [
+                asyncio.create_task(self._loop(job), name=f"job-{job.name}") for job in self.jobs.values()
+            ]
+            try:
+                while await self._renew(conn):
+                    await asyncio.sleep(self.lease)
+                logger.warning("Scheduler leadership lost")
+            finally:
+                self._set_leader(False)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # Ending the session releases the lock if we still hold it
+            conn.terminate()
+
+    async def _renew(self, conn: asyncpg.Connection) -> bool:
+        """Whether this connection still holds the lock"""
+        try:
+            return await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' "
+                "AND pid = pg_backend_pid() AND granted)",
+                timeout=self.lease,
+            )
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, asyncio.TimeoutError) as e:
+            logger.warning(f"Scheduler lease renewal failed: {e}")
+            return False
+
+    def _set_leader(self, leader: bool):
+        self.is_leader = leader
+        SCHEDULER_IS_LEADER.set(1 if leader else 0)
+
+    async def _loop(self, job: Job):
+        while True:
+            started = time.perf_counter()
+            try:
+                await job.func()
+                record_job_run(job.name, "success", time.perf_counter() - started)
+            except asyncio.CancelledError:
+                record_job_run(job.name, "cancelled", time.perf_counter() - started)
+                raise
+            except Exception:
+                record_job_run(job.name, "failure", time.perf_counter() - started)
+                logger.exception(f"Job {job.name} failed")
+            await asyncio.sleep(job.interval)
+
+
+scheduler = LeaderScheduler(settings.DATABASE_URL, lease=settings.SCHEDULER_LEASE_SECONDS)
@@ -5,6 +5,9 @@ JWT token generation and validation
 
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+import hashlib
+import hmac
+import time
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
@@ -127,3 +130,58 @@ def validate_telegram_webapp_data(init_data: str, bot_token: str) -> bool:
     
     except Exception:
         return False
+
+
+def compute_webhook_signature(body: bytes, timestamp: str, secret: str) -> str:
+    """
+    Compute HMAC-SHA256 signature for a signed webhook payload
+    
+    The signed message is "<timestamp>.<raw body>", so a captured request
+    cannot be replayed with a different timestamp.
+    
+    Args:
+        body: Raw request body
+        timestamp: Unix timestamp (seconds) sent alongside the signature
+        secret: Shared webhook secret
+        
+    Returns:
+        Signature in "sha256=<hex>" format
+    """
+    message = timestamp.encode() + b"." + body
+    digest = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_webhook_signature(
+    body: bytes,
+    timestamp: Optional[str],
+    signature: Optional[str],
+    secret: str,
+    tolerance_seconds: int = 300
+) -> bool:
+    """
+    Verify HMAC signature of an incoming webhook (n8n callbacks)
+    
+    Args:
+        body: Raw request body
+        timestamp: Value of the signature timestamp header
+        signature: Value of the signature header
+        secret: Shared webhook secret
+        tolerance_seconds: Maximum allowed clock skew / request age
+        
+    Returns:
+        True if signature is valid and not expired
+    """
+    if not timestamp or not signature or not secret:
+        return False
+    
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        return False
+    
+    if abs(time.time() - sent_at) > tolerance_seconds:
+        return False
+    
+    expected = compute_webhook_signature(body, timestamp, secret)
+    return hmac.compare_digest(expected, signature)
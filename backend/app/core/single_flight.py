@@ -0,0 +1,101 @@
+"""
+Request coalescing (single-flight)
+Concurrent identical reads share one in-flight fetch: the first request
+runs the route, requests arriving while it runs await the same result
+instead of issuing their own queries. Nothing is cached, a request that
+arrives after the fetch finished starts a new one.
+
+Requests are keyed by the route's normalized parameters: scalar query and
+path parameters (str, int, float, bool, enums, lists of those), sorted by
+name. Injected objects such as the DB session or the Request are not part
+of the key; coalesced requests never use their own session, so they do not
+take a pool connection either.
+
+Only for public, user-independent reads: two requests with the same
+parameters get the same response.
+
+Usage:
+    @router.get("/products")
+    @single_flight("products")
+    async def get_products(db: AsyncSession = Depends(get_db)):
+        ...
+"""
+
+import asyncio
+import copy
+import functools
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from starlette.responses import Response
+
+from app.core.metrics import record_coalesced
+
+_SCALARS = (str, int, float, bool, type(None))
+_SKIP = object()
+
+
+def _normalize(value: Any) -> Any:
+    """Hashable key part for a parameter value, _SKIP for injected objects"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, (list, tuple)) and all(isinstance(item, _SCALARS) for item in value):
+        return tuple(value)
+    return _SKIP
+
+
+def request_key(kwargs: Dict[str, Any]) -> Hashable:
+    """Key of a route call from its keyword arguments"""
+    parts = ((name, _normalize(value)) for name, value in kwargs.items())
+    return tuple(sorted((name, value) for name, value in parts if value is not _SKIP))
+
+
+class SingleFlight:
+    """In-flight fetches of one route, by key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of fetch(), shared with concurrent calls for the same key"""
+        task = self._inflight.get(key)
+        record_coalesced(self.name, task is not None)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+        # Shielded: a cancelled caller must not cancel the fetch the others wait for
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every caller was cancelled
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+def single_flight(name: str):
+    """Decorator coalescing concurrent calls of an async route function"""
+
+    def decorator(func):
+        flight = SingleFlight(name)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await flight.do(request_key(kwargs), lambda: func(*args, **kwargs))
+            if isinstance(result, Response):
+                # Middlewares add headers in place, each caller needs its own list
+                result = copy.copy(result)
+                result.raw_headers = list(result.raw_headers)
+            return result
+
+        wrapper.single_flight = flight
+        return wrapper
+
+    return decorator
@@ -0,0 +1,313 @@
+"""
+Request tracing
+Follows one Telegram update from the bot through the backend down to the
+individual SQL statements.
+
+The bot starts a trace per update and sends W3C `traceparent` headers
+(00-<trace_id>-<span_id>-<flags>) with every backend call. TracingMiddleware
+continues that trace for the request and SQLAlchemy cursor events add a
+span per statement. Finished spans are appended as JSON lines to
+TRACE_EXPORT_PATH; scripts/trace_report.py merges the bot and backend files
+into a per-update latency breakdown.
+"""
+
+import json
+import logging
+import os
+import random
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+
+# Longest SQL text stored on a span
+MAX_STATEMENT_LENGTH = 500
+
+
+class Span:
+    """One timed operation of a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "sampled",
+                 "start_time", "end_time", "attributes", "status")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        kind: str = "internal",
+        sampled: bool = True,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.sampled = sampled
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.attributes = attributes or {}
+        self.status = "ok"
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) * 1000
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self, service: str) -> Dict[str, Any]:
+        return {
+            "service": service,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse W3C traceparent header
+
+    Returns:
+        (trace_id, parent_span_id, sampled) or None if missing/invalid
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+class FileSpanExporter:
+    """Appends finished spans as JSON lines (one atomic write per span)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def export(self, record: Dict[str, Any]):
+        if self._fd is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.write(self._fd, (json.dumps(record, default=str, ensure_ascii=False) + "\n").encode())
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class Tracer:
+    """Creates spans, tracks the current one per task and exports them"""
+
+    def __init__(self, service: str, exporter: Optional[FileSpanExporter] = None, sample_rate: float = 1.0):
+        self.service = service
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self._current: ContextVar[Optional[Span]] = ContextVar(f"{service}_current_span", default=None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        parent: Optional[Span] = None,
+        traceparent: Optional[str] = None,
+        **attributes
+    ) -> Span:
+        """Start span as child of parent, remote traceparent or current span"""
+        parent = parent or self._current.get()
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, kind, parent.sampled, attributes)
+
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+            return Span(name, trace_id, parent_id, kind, sampled, attributes)
+
+        sampled = random.random() < self.sample_rate
+        return Span(name, secrets.token_hex(16), None, kind, sampled, attributes)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None):
+        span.end_time = time.time()
+        if error is not None:
+            span.status = "error"
+            span.attributes["error"] = f"{type(error).__name__}: {error}"
+        if span.sampled and self.exporter is not None:
+            try:
+                self.exporter.export(span.to_dict(self.service))
+            except OSError as e:
+                logger.error(f"Failed to export span: {e}")
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes):
+        """
+        Run block inside a new current span
+
+        Usage:
+            with tracer.span("n8n validate-receipt", kind="client") as span:
+                ...
+        """
+        span = self.start_span(name, kind, **attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            self._current.reset(token)
+
+    def activate(self, span: Span):
+        """Make span current, returns token for deactivate()"""
+        return self._current.set(span)
+
+    def deactivate(self, token):
+        self._current.reset(token)
+
+    def close(self):
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+# ==================== FastAPI ====================
+
+class TracingMiddleware:
+    """
+    ASGI middleware continuing the caller's trace for each request
+
+    The server span is named after the matched route template and its trace
+    id is returned in the X-Trace-Id response header.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        span = self.tracer.start_span(
+            scope["path"],
+            kind="server",
+            traceparent=traceparent,
+            **{"http.method": scope["method"]}
+        )
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                headers = list(message.get("headers", []))
+                headers.append((b"x-trace-id", span.trace_id.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        token = self.tracer.activate(span)
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.tracer.deactivate(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None)
+            if route_path:
+                span.set_attribute("http.route", route_path)
+            span.name = f"{scope['method']} {route_path or scope['path']}"
+            self.tracer.end_span(span, error)
+
+
+# ==================== SQLAlchemy ====================
+
+def instrument_engine_tracing(engine: AsyncEngine, tracer: Tracer):
+    """Add a span for every SQL statement executed inside a traced request"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        parent = tracer.current_span()
+        if parent is None or not parent.sampled:
+            return
+        span = tracer.start_span(
+            "db.query",
+            kind="client",
+            parent=parent,
+            **{"db.statement": statement[:MAX_STATEMENT_LENGTH], "db.executemany": executemany}
+        )
+        conn.info.setdefault("trace_spans", []).append(span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            span = spans.pop()
+            if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            tracer.end_span(span)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            tracer.end_span(spans.pop(), exception_context.original_exception)
+
+
+# Global tracer (exports nothing unless TRACING_ENABLED)
+tracer = Tracer(
+    "backend",
+    FileSpanExporter(settings.TRACE_EXPORT_PATH) if settings.TRACING_ENABLED else None,
+    sample_rate=settings.TRACE_SAMPLE_RATE,
+)
@@ -2,11 +2,25 @@
 Database configuration and session management
 """
 
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import AsyncGenerator, Set
+from pathlib import Path
+import logging
+import re
 
 from app.config import settings
+from app.core.metrics import InstrumentedQueuePool, instrument_engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_VERSIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+# Pools are only timed and counted when metrics are exported
+POOL_CLASS = InstrumentedQueuePool if settings.METRICS_ENABLED else AsyncAdaptedQueuePool
 
 
 # Create async engine
@@ -17,7 +31,24 @@ engine = create_async_engine(
     pool_size=20,
     max_overflow=10,
     pool_pre_ping=True,
+    poolclass=POOL_CLASS,
+)
+
+# Engine for read-only sessions: the read replica if configured, otherwise
+# the primary through a separate pool, so reports cannot exhaust the
+# connections order creation needs
+read_engine = create_async_engine(
+    settings.DATABASE_READ_URL or settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    future=True,
+    pool_size=settings.DATABASE_READ_POOL_SIZE,
+    max_overflow=settings.DATABASE_READ_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    poolclass=POOL_CLASS,
 )
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(read_engine, "read")
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -27,6 +58,13 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
     autocommit=False,
 )
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False,
+)
 
 
 class Base(DeclarativeBase):
@@ -55,12 +93,82 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for a read-only database session
+
+    The transaction is READ ONLY and is never committed, closing the session
+    rolls it back. Served by the read replica when DATABASE_READ_URL is set,
+    so results may lag the primary slightly: use it for reports and lists,
+    not for reads that must see a write just made.
+
+    Usage:
+        @app.get("/report")
+        async def get_report(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    async with read_session_maker() as session:
+        try:
+            await session.execute(text("SET TRANSACTION READ ONLY"))
+            yield session
+        finally:
+            await session.close()
+
+
 async def init_db():
     """Initialize database - create all tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+_REVISION_RE = re.compile(r"^revision\s*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision\s*=\s*(.+)$", re.MULTILINE)
+
+
+def alembic_heads(versions_dir: Path = ALEMBIC_VERSIONS_DIR) -> Set[str]:
+    """
+    Head revisions of the migration scripts
+
+    Revision ids are read from the files with a regex instead of loading
+    alembic's ScriptDirectory, which imports every migration module.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_RE.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION_RE.search(source)
+        if down_revision:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down_revision.group(1)))
+    return revisions - parents
+
+
+async def verify_db_revision():
+    """
+    Check the database is migrated to the Alembic head (one query)
+
+    Raises:
+        RuntimeError: If the database is not at the expected revision
+    """
+    expected = alembic_heads()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars().all())
+    except DBAPIError as e:
+        raise RuntimeError(f"Cannot read alembic_version, run 'alembic upgrade head': {e}") from e
+
+    if current != expected:
+        raise RuntimeError(
+            f"Database is at revision {sorted(current) or 'none'}, expected {sorted(expected)}. "
+            f"Run 'alembic upgrade head'."
+        )
+    logger.info(f"Database schema at revision {', '.join(sorted(current))}")
+
+
 async def close_db():
     """Close database connections"""
     await engine.dispose()
+    await read_engine.dispose()
@@ -6,13 +6,28 @@ Main application entry point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 import logging
 import os
 
 from app.config import settings
-from app.database import init_db, close_db
-from app.core.i18n import get_translator
+from app.database import engine, read_engine, init_db, verify_db_revision, close_db
+from app.core.i18n import catalog, get_translator
+from app.core.responses import FastJSONResponse
+from app.core.lazy_routes import LazyRouterMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.query_stats import QueryStatsMiddleware, instrument_engine_queries
+from app.core.tracing import TracingMiddleware, instrument_engine_tracing, tracer
+from app.core.invalidation import invalidation_bus
+from app.core.scheduler import scheduler
+from app.core.idempotency import purge_expired_idempotency_keys
+from app.services.broadcast import broadcast_runner
+from app.services.statistics import rollup_recent_statistics
+from app.services.admission import purge_past_slots
+from app.services.stock import expire_unpaid_orders
+from app.services.task_queue import purge_finished_tasks
 
 # Configure logging
 logging.basicConfig(
@@ -32,15 +47,39 @@ async def lifespan(app: FastAPI):
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
     os.makedirs("logs", exist_ok=True)
     
+    # Report untranslated messages
+    catalog.validate()
+    
     # Initialize database
-    await init_db()
-    logger.info("Database initialized")
+    # Schema is owned by Alembic ("alembic upgrade head" runs before the
+    # workers start); create_all is kept for local runs without migrations
+    if settings.DB_STARTUP_MODE == "verify":
+        await verify_db_revision()
+    elif settings.DB_STARTUP_MODE == "create_all":
+        await init_db()
+    logger.info(f"Database initialized ({settings.DB_STARTUP_MODE})")
+    
+    # Drop cached entries when another worker writes
+    await invalidation_bus.start()
+    
+    # Periodic jobs, run by one worker at a time
+    if settings.SCHEDULER_ENABLED:
+        scheduler.add_job("daily_statistics", settings.STATISTICS_ROLLUP_INTERVAL, rollup_recent_statistics)
+        scheduler.add_job("purge_finished_tasks", 3600, purge_finished_tasks)
+        scheduler.add_job("expire_unpaid_orders", settings.STOCK_SWEEP_INTERVAL, expire_unpaid_orders)
+        scheduler.add_job("purge_past_slots", 3600, purge_past_slots)
+        scheduler.add_job("purge_expired_idempotency_keys", 3600, purge_expired_idempotency_keys)
+        await scheduler.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down PizzaMatIF Backend...")
+    await scheduler.stop()
+    await invalidation_bus.stop()
+    await broadcast_runner.shutdown()
     await close_db()
+    tracer.close()
     logger.info("Database connections closed")
 
 
@@ -51,9 +90,18 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
+# Response compression (innermost, so metrics and traces include it)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        cache_bytes=settings.COMPRESSION_CACHE_BYTES,
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -63,6 +111,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics (added after CORS, so CORS handling is timed too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Query counts per request and slow query log
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+    instrument_engine_queries(engine)
+    instrument_engine_queries(read_engine)
+
+# Trace propagation from the bot down to SQL statements
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    instrument_engine_tracing(engine, tracer)
+    instrument_engine_tracing(read_engine, tracer)
+
 # Mount uploads directory
 if os.path.exists(settings.UPLOAD_DIR):
     app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
@@ -79,6 +143,14 @@ async def health_check():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics"""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
 @app.get("/debug-info")
 async def debug_info():
     """Debug info endpoint - shows current configuration"""
@@ -120,15 +192,28 @@ async def root():
 
 
 # Import and include routers
-from app.routes import menu, locations, admin, auth, analytics, bot_api
+from app.routes import menu, locations, bot_api, webapp
+
+# Routers with their own URL prefix, may be loaded on first request
+LAZY_ROUTE_MODULES = {
+    "/api/auth": "app.routes.auth",
+    "/api/admin": "app.routes.admin",
+    "/api/analytics": "app.routes.analytics",
+}
+
+if settings.LAZY_ROUTERS:
+    app.add_middleware(LazyRouterMiddleware, target=app, routers=LAZY_ROUTE_MODULES, prefix="/api")
+else:
+    from app.routes import admin, auth, analytics
+    app.include_router(auth.router, prefix="/api")
+    app.include_router(admin.router, prefix="/api")
+    app.include_router(analytics.router, prefix="/api")
 
 # Add API prefix to all routers
-app.include_router(auth.router, prefix="/api")
 app.include_router(menu.router, prefix="/api")
 app.include_router(locations.router, prefix="/api")
-app.include_router(admin.router, prefix="/api")
-app.include_router(analytics.router, prefix="/api")
 app.include_router(bot_api.router, prefix="/api")
+app.include_router(webapp.router, prefix="/api")
 
 
 
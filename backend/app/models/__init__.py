@@ -4,22 +4,31 @@ SQLAlchemy ORM models for all entities
 """
 
 from app.models.user import User
-from app.models.location import City, Location
-from app.models.product import Category, Product, ProductOption, LocationProduct
+from app.models.location import City, Location, LocationSlot
+from app.models.product import Category, Product, ProductOption, LocationProduct, CatalogChange
 from app.models.order import Order, OrderItem, OrderStatus, ReceiptHash
 from app.models.settings import SiteSettings
+from app.models.broadcast import Broadcast, BroadcastDelivery
+from app.models.task import Task
+from app.models.idempotency import IdempotencyKey
 
 __all__ = [
     "User",
     "City",
     "Location",
+    "LocationSlot",
     "Category",
     "Product",
     "ProductOption",
     "LocationProduct",
+    "CatalogChange",
     "Order",
     "OrderItem",
     "OrderStatus",
     "ReceiptHash",
     "SiteSettings",
+    "Broadcast",
+    "BroadcastDelivery",
+    "Task",
+    "IdempotencyKey",
 ]
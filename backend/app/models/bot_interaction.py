@@ -3,7 +3,7 @@ Bot interaction models for tracking and analytics
 Tracks all user interactions with the Telegram bot
 """
 
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
@@ -15,10 +15,14 @@ class UserSession(Base):
     """User session tracking - when user starts/stops interacting with bot"""
 
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        Index('ix_user_sessions_user_id_session_start', 'user_id', 'session_start'),
+        Index('ix_user_sessions_telegram_id_session_start', 'telegram_id', 'session_start'),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    telegram_id = Column(BigInteger, nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    telegram_id = Column(BigInteger, nullable=False)
 
     # Session info
     session_start = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -53,18 +57,25 @@ class BotInteraction(Base):
     """Detailed interaction logging - every message, command, button click"""
 
     __tablename__ = "bot_interactions"
-
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        Index('ix_bot_interactions_telegram_id_created_at', 'telegram_id', 'created_at'),
+        Index('ix_bot_interactions_user_id_created_at', 'user_id', 'created_at'),
+        # Most interactions have no command
+        Index('ix_bot_interactions_command_created_at', 'command', 'created_at',
+              postgresql_where=text('command IS NOT NULL')),
+    )
+
+    id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey("user_sessions.id", ondelete="CASCADE"), nullable=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
-    telegram_id = Column(BigInteger, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    telegram_id = Column(BigInteger, nullable=False)
 
     # Interaction type
-    interaction_type = Column(String(50), nullable=False, index=True)
+    interaction_type = Column(String(50), nullable=False)
     # Types: 'command', 'message', 'callback_query', 'inline_query', 'webapp_data', 'photo', 'document'
 
     # Content
-    command = Column(String(100), nullable=True, index=True)  # /start, /menu, etc.
+    command = Column(String(100), nullable=True)  # /start, /menu, etc.
     message_text = Column(Text, nullable=True)
     callback_data = Column(String(255), nullable=True)
 
@@ -100,14 +111,21 @@ class SupportMessage(Base):
     """Support/feedback messages between users and managers"""
 
     __tablename__ = "support_messages"
-
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        Index('ix_support_messages_status_created_at', 'status', 'created_at'),
+        Index('ix_support_messages_telegram_id_created_at', 'telegram_id', 'created_at'),
+        # Opened tickets are counted from customer messages only
+        Index('ix_support_messages_created_at_user', 'created_at',
+              postgresql_where=text("sender_type = 'user'")),
+    )
+
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    telegram_id = Column(BigInteger, nullable=False, index=True)
+    telegram_id = Column(BigInteger, nullable=False)
 
     # Ticket info
     ticket_id = Column(String(20), unique=True, nullable=False, index=True)  # Format: SUPPORT-XXXXXX
-    status = Column(String(20), default="open", index=True)  # open, in_progress, closed
+    status = Column(String(20), default="open")  # open, in_progress, closed
 
     # Message content
     sender_type = Column(String(20), nullable=False)  # 'user' or 'manager'
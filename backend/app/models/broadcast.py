@@ -0,0 +1,67 @@
+"""
+Broadcast models
+Admin-triggered mass messaging and per-recipient delivery results
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class Broadcast(Base):
+    """Broadcast campaign - one message sent to all matching users"""
+
+    __tablename__ = "broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Content
+    message_text = Column(Text, nullable=False)
+
+    # Audience filters (NULL = everyone)
+    city_id = Column(Integer, ForeignKey("cities.id", ondelete="SET NULL"), nullable=True)
+    language = Column(String(5), nullable=True)
+
+    # Status: pending, running, paused, completed, cancelled, failed
+    status = Column(String(20), default="pending", nullable=False, index=True)
+
+    # Resumable checkpoint - recipients are processed in users.id order
+    last_user_id = Column(Integer, default=0, nullable=False)
+
+    # Progress
+    sent_count = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    error_message = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    city = relationship("City")
+
+    def __repr__(self):
+        return f"<Broadcast(id={self.id}, status='{self.status}', sent={self.sent_count})>"
+
+
+class BroadcastDelivery(Base):
+    """Delivery result for one broadcast recipient"""
+
+    __tablename__ = "broadcast_deliveries"
+
+    id = Column(BigInteger, primary_key=True)
+    broadcast_id = Column(Integer, ForeignKey("broadcasts.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    telegram_id = Column(BigInteger, nullable=False)
+
+    # Status: sent, blocked, failed
+    status = Column(String(20), nullable=False)
+    error_message = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<BroadcastDelivery(broadcast_id={self.broadcast_id}, user_id={self.user_id}, status='{self.status}')>"
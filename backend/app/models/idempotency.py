@@ -0,0 +1,34 @@
+"""
+Idempotency key model
+Responses of requests sent with an Idempotency-Key header, replayed to
+retries until they expire (see app.core.idempotency)
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response of one idempotent request"""
+
+    __tablename__ = "idempotency_keys"
+
+    # Endpoint (e.g. orders.create) and the client's key
+    scope = Column(String(64), primary_key=True)
+    key = Column(String(255), primary_key=True)
+
+    # SHA-256 of the request body; a key reused with another body is refused
+    fingerprint = Column(String(64), nullable=False)
+
+    # Response to replay, written in the request's transaction
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSONB, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(scope={self.scope}, key={self.key})>"
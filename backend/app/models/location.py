@@ -1,6 +1,6 @@
 """
 Location models
-Cities and pickup locations
+Cities, pickup locations and their kitchen slots
 """
 
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
@@ -39,6 +39,12 @@ class Location(Base):
     address = Column(Text, nullable=False)
     working_hours = Column(String(100), nullable=True)
     is_active = Column(Boolean, default=True, index=True)
+    
+    # Kitchen capacity, see app.services.admission
+    slot_minutes = Column(Integer, default=10, server_default="10", nullable=False)
+    orders_per_slot = Column(Integer, nullable=True)  # NULL = unlimited
+    prep_minutes = Column(Integer, default=15, server_default="15", nullable=False)  # Earliest ready time
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -49,3 +55,16 @@ class Location(Base):
     
     def __repr__(self):
         return f"<Location(id={self.id}, name='{self.name}', city_id={self.city_id})>"
+
+
+class LocationSlot(Base):
+    """Orders admitted to one kitchen time slot of a pickup location"""
+    
+    __tablename__ = "location_slots"
+    
+    location_id = Column(Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    slot_start = Column(DateTime(timezone=True), primary_key=True)
+    orders = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    def __repr__(self):
+        return f"<LocationSlot(location_id={self.location_id}, slot_start={self.slot_start}, orders={self.orders})>"
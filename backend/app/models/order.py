@@ -3,7 +3,7 @@ Order models
 Orders, order items, and receipt hash tracking
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Numeric, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Numeric, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
@@ -26,9 +26,14 @@ class Order(Base):
     """Order model"""
     
     __tablename__ = "orders"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    __table_args__ = (
+        # User order lists and dashboard counts per status, both by time
+        Index('ix_orders_user_id_created_at', 'user_id', 'created_at'),
+        Index('ix_orders_status_created_at', 'status', 'created_at'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     location_id = Column(Integer, ForeignKey("locations.id"), nullable=False, index=True)
     
     # Идентификация заказа
@@ -40,7 +45,7 @@ class Order(Base):
     currency = Column(String(3), default="UAH")  # UAH, USD, etc.
     
     # Статус
-    status = Column(SQLEnum(OrderStatus), default=OrderStatus.PENDING, index=True)
+    status = Column(SQLEnum(OrderStatus), default=OrderStatus.PENDING)
     
     # Чек
     receipt_image_url = Column(String(500), nullable=True)
@@ -59,6 +64,10 @@ class Order(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Kitchen slot the order was admitted to and the ready time quoted
+    slot_start = Column(DateTime(timezone=True), nullable=True)  # NULL = location without capacity limit
+    ready_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Relationships
     user = relationship("User", foreign_keys=[user_id], back_populates="orders")
     location = relationship("Location", back_populates="orders")
@@ -79,6 +88,7 @@ class OrderItem(Base):
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
     
     quantity = Column(Integer, nullable=False)
+    reserved_quantity = Column(Integer, default=0, server_default="0", nullable=False)  # Limited stock held, see app.services.stock
     unit_price = Column(Numeric(10, 2), nullable=False)
     
     selected_options = Column(JSONB, nullable=True)  # {"size": "30см", "extras": ["Сыр", "Грибы"]}
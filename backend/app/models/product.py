@@ -1,9 +1,10 @@
 """
 Product models
-Categories, products, options, and location-product relationships
+Categories, products, options, location-product relationships and the
+catalog change log
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Numeric, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Text, Numeric, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
@@ -101,3 +102,22 @@ class LocationProduct(Base):
     
     def __repr__(self):
         return f"<LocationProduct(location_id={self.location_id}, product_id={self.product_id})>"
+
+
+class CatalogChange(Base):
+    """
+    Catalog change log - one row per insert/update/delete of a category,
+    product, option or location product, written by database triggers
+    (alembic revision f4a5b6c7d8e9). The highest version is the catalog version.
+    """
+    
+    __tablename__ = "catalog_changes"
+    
+    version = Column(BigInteger, primary_key=True)
+    entity = Column(String(32), nullable=False)  # Table name
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # insert, update, delete
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<CatalogChange(version={self.version}, {self.operation} {self.entity}#{self.entity_id})>"
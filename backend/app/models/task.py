@@ -0,0 +1,53 @@
+"""
+Task queue model
+Background work enqueued in the request transaction and run by
+scripts/task_worker.py (see app.services.task_queue)
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class Task(Base):
+    """Queued unit of background work"""
+
+    __tablename__ = "tasks"
+
+    id = Column(BigInteger, primary_key=True)
+
+    # Handler name and its keyword arguments
+    kind = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+
+    # Status: pending, running, done, dead
+    status = Column(String(20), default="pending", server_default="pending", nullable=False)
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    max_attempts = Column(Integer, default=5, server_default="5", nullable=False)
+
+    # Not picked up before run_at (retry backoff, delayed tasks)
+    run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Lease of the worker running it, renewed while the handler runs
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String(100), nullable=True)
+
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Dequeue: oldest due pending task
+        Index("ix_tasks_pending_run_at", "run_at", postgresql_where=text("status = 'pending'")),
+        # Reaper: running tasks with an expired lease
+        Index("ix_tasks_running_locked_at", "locked_at", postgresql_where=text("status = 'running'")),
+        # Dead letters and cleanup of finished tasks
+        Index("ix_tasks_status_finished_at", "status", "finished_at",
+              postgresql_where=text("status IN ('done', 'dead')")),
+    )
+
+    def __repr__(self):
+        return f"<Task(id={self.id}, kind={self.kind}, status={self.status})>"
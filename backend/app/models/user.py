@@ -2,7 +2,7 @@
 User model
 """
 
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,6 +13,10 @@ class User(Base):
     """User model - registered Telegram users"""
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Broadcast recipient scan by city in id order
+        Index('ix_users_city_id_id', 'city_id', 'id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     telegram_id = Column(BigInteger, unique=True, nullable=False, index=True)
@@ -3,9 +3,11 @@ Admin API routes
 CRUD operations for categories, products, locations, settings, orders
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete, func
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 import os
 import uuid
@@ -14,11 +16,19 @@ from datetime import datetime
 from app.database import get_db
 from app.models.product import Category, Product, ProductOption
 from app.models.location import City, Location
-from app.models.order import Order, OrderItem
+from app.models.order import Order, OrderItem, OrderStatus
 from app.models.settings import SiteSettings
+from app.models.broadcast import Broadcast
 from app.config import settings
 from app.core.dependencies import get_admin_user
+from app.core.invalidation import InvalidationTopic, invalidation_bus
 from app.core.file_validation import validate_upload_image, FileValidator
+from app.schemas.product import AdminProductResponse
+from app.services.broadcast import broadcast_runner, is_resumable
+from app.services.admission import admission
+from app.services.stock import publish_stock_change, release_stock
+
+_admin_products_json = TypeAdapter(List[AdminProductResponse])
 
 router = APIRouter(
     prefix="/admin", 
@@ -65,6 +75,7 @@ async def create_category(
     )
     db.add(category)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.CATALOG)
     await db.refresh(category)
     return {"id": category.id, "name": category.name}
 
@@ -90,6 +101,7 @@ async def update_category(
     category.is_active = is_active
     
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.CATALOG)
     return {"success": True, "message": "Category updated"}
 
 
@@ -103,12 +115,13 @@ async def delete_category(category_id: int, db: AsyncSession = Depends(get_db)):
     
     await db.delete(category)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.CATALOG)
     return {"success": True, "message": "Category deleted"}
 
 
 # ===== PRODUCTS =====
 
-@router.get("/products")
+@router.get("/products", response_model=List[AdminProductResponse])
 async def get_products_admin(db: AsyncSession = Depends(get_db)):
     """Get all products (including inactive)"""
     result = await db.execute(
@@ -116,20 +129,8 @@ async def get_products_admin(db: AsyncSession = Depends(get_db)):
     )
     products = result.scalars().all()
     
-    return [
-        {
-            "id": p.id,
-            "category_id": p.category_id,
-            "name": p.name,
-            "description": p.description,
-            "base_price": float(p.base_price),
-            "image_url": p.image_url,
-            "is_active": p.is_active,
-            "sort_order": p.sort_order,
-            "created_at": p.created_at.isoformat(),
-        }
-        for p in products
-    ]
+    body = _admin_products_json.dump_json([AdminProductResponse.model_validate(p) for p in products])
+    return Response(body, media_type="application/json")
 
 
 @router.post("/products")
@@ -175,6 +176,7 @@ async def create_product(
     )
     db.add(product)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.CATALOG)
     await db.refresh(product)
     
     return {"id": product.id, "name": product.name}
@@ -225,6 +227,7 @@ async def update_product(
     product.is_active = is_active
     
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.CATALOG)
     return {"success": True, "message": "Product updated"}
 
 
@@ -238,6 +241,7 @@ async def delete_product(product_id: int, db: AsyncSession = Depends(get_db)):
     
     await db.delete(product)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.CATALOG)
     return {"success": True, "message": "Product deleted"}
 
 
@@ -262,6 +266,9 @@ async def get_locations_admin(db: AsyncSession = Depends(get_db)):
                 "address": loc.address,
                 "working_hours": loc.working_hours,
                 "is_active": loc.is_active,
+                "slot_minutes": loc.slot_minutes,
+                "orders_per_slot": loc.orders_per_slot,
+                "prep_minutes": loc.prep_minutes,
             }
             for loc, city in locations
         ]
@@ -274,18 +281,25 @@ async def create_location(
     address: str = Form(...),
     working_hours: Optional[str] = Form(None),
     is_active: bool = Form(True),
+    slot_minutes: int = Form(10, gt=0),
+    orders_per_slot: Optional[int] = Form(None, ge=0),
+    prep_minutes: int = Form(15, ge=0),
     db: AsyncSession = Depends(get_db)
 ):
-    """Create new location"""
+    """Create new location (orders_per_slot empty or 0 = unlimited)"""
     location = Location(
         city_id=city_id,
         name=name,
         address=address,
         working_hours=working_hours,
-        is_active=is_active
+        is_active=is_active,
+        slot_minutes=slot_minutes,
+        orders_per_slot=orders_per_slot or None,
+        prep_minutes=prep_minutes
     )
     db.add(location)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.LOCATIONS)
     await db.refresh(location)
     return {"id": location.id, "name": location.name}
 
@@ -298,9 +312,12 @@ async def update_location(
     address: str = Form(...),
     working_hours: Optional[str] = Form(None),
     is_active: bool = Form(True),
+    slot_minutes: Optional[int] = Form(None, gt=0),
+    orders_per_slot: Optional[int] = Form(None, ge=0),
+    prep_minutes: Optional[int] = Form(None, ge=0),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update location"""
+    """Update location; capacity fields left out are kept (orders_per_slot 0 = unlimited)"""
     result = await db.execute(select(Location).where(Location.id == location_id))
     location = result.scalar_one_or_none()
     if not location:
@@ -311,8 +328,15 @@ async def update_location(
     location.address = address
     location.working_hours = working_hours
     location.is_active = is_active
+    if slot_minutes is not None:
+        location.slot_minutes = slot_minutes
+    if orders_per_slot is not None:
+        location.orders_per_slot = orders_per_slot or None
+    if prep_minutes is not None:
+        location.prep_minutes = prep_minutes
     
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.LOCATIONS)
     return {"success": True, "message": "Location updated"}
 
 
@@ -326,6 +350,7 @@ async def delete_location(location_id: int, db: AsyncSession = Depends(get_db)):
     
     await db.delete(location)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.LOCATIONS)
     return {"success": True, "message": "Location deleted"}
 
 
@@ -359,6 +384,7 @@ async def create_city(
     city = City(name=name, is_active=is_active)
     db.add(city)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.LOCATIONS)
     await db.refresh(city)
     return {"id": city.id, "name": city.name}
 
@@ -380,6 +406,7 @@ async def update_city(
     city.is_active = is_active
     
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.LOCATIONS)
     return {"success": True, "message": "City updated"}
 
 
@@ -393,6 +420,7 @@ async def delete_city(city_id: int, db: AsyncSession = Depends(get_db)):
     
     await db.delete(city)
     await db.commit()
+    await invalidation_bus.publish(InvalidationTopic.LOCATIONS)
     return {"success": True, "message": "City deleted"}
 
 
@@ -525,17 +553,125 @@ async def update_order_status(
     status: str = Form(...),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update order status"""
-    result = await db.execute(select(Order).where(Order.id == order_id))
+    """Update order status; cancelling gives back the order's reserved stock and kitchen slot"""
+    # Locked against the unpaid order sweeper or another cancel releasing the same order
+    result = await db.execute(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.id == order_id)
+        .with_for_update(of=Order)
+    )
     order = result.scalar_one_or_none()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
+    if status == OrderStatus.CANCELLED.value and order.status == OrderStatus.CANCELLED:
+        # Already cancelled (and released) while we waited for the lock
+        return {"success": True, "message": "Order status updated"}
+    
+    restocked = set()
+    freed_slot = None
+    if status == OrderStatus.CANCELLED.value:
+        restocked = await release_stock(db, order)
+        freed_slot = await admission.release(db, order)
     order.status = status
     await db.commit()
+    admission.released(order.location_id, freed_slot)
+    if restocked:
+        await publish_stock_change(order.location_id)
     return {"success": True, "message": "Order status updated"}
 
 
+# ===== BROADCASTS =====
+# Admin only even while the router-wide auth above is disabled
+
+def _broadcast_to_dict(b: Broadcast) -> dict:
+    return {
+        "id": b.id,
+        "message_text": b.message_text,
+        "city_id": b.city_id,
+        "language": b.language,
+        "status": b.status,
+        "last_user_id": b.last_user_id,
+        "sent_count": b.sent_count,
+        "failed_count": b.failed_count,
+        "error_message": b.error_message,
+        "created_at": b.created_at.isoformat() if b.created_at else None,
+        "started_at": b.started_at.isoformat() if b.started_at else None,
+        "finished_at": b.finished_at.isoformat() if b.finished_at else None,
+    }
+
+
+@router.get("/broadcasts", dependencies=[Depends(get_admin_user)])
+async def get_broadcasts(limit: int = 50, db: AsyncSession = Depends(get_db)):
+    """Get recent broadcasts with progress"""
+    result = await db.execute(select(Broadcast).order_by(Broadcast.id.desc()).limit(limit))
+    return [_broadcast_to_dict(b) for b in result.scalars().all()]
+
+
+@router.get("/broadcasts/{broadcast_id}", dependencies=[Depends(get_admin_user)])
+async def get_broadcast(broadcast_id: int, db: AsyncSession = Depends(get_db)):
+    """Get single broadcast with progress"""
+    result = await db.execute(select(Broadcast).where(Broadcast.id == broadcast_id))
+    broadcast = result.scalar_one_or_none()
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    return _broadcast_to_dict(broadcast)
+
+
+@router.post("/broadcasts", dependencies=[Depends(get_admin_user)])
+async def create_broadcast(
+    message_text: str = Form(...),
+    city_id: Optional[int] = Form(None),
+    language: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create broadcast to all active users (optionally by city/language) and start sending"""
+    if language and language not in settings.SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Unsupported language: {language}")
+    
+    broadcast = Broadcast(
+        message_text=message_text,
+        city_id=city_id,
+        language=language,
+        status="pending"
+    )
+    db.add(broadcast)
+    await db.commit()
+    await db.refresh(broadcast)
+    
+    broadcast_runner.start(broadcast.id)
+    return {"id": broadcast.id, "status": broadcast.status}
+
+
+@router.post("/broadcasts/{broadcast_id}/resume", dependencies=[Depends(get_admin_user)])
+async def resume_broadcast(broadcast_id: int, db: AsyncSession = Depends(get_db)):
+    """Resume paused, failed or abandoned broadcast from its checkpoint"""
+    result = await db.execute(select(Broadcast).where(Broadcast.id == broadcast_id))
+    broadcast = result.scalar_one_or_none()
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    if not is_resumable(broadcast):
+        raise HTTPException(status_code=409, detail=f"Broadcast is {broadcast.status}")
+    
+    broadcast_runner.start(broadcast.id)
+    return {"success": True, "message": "Broadcast resumed"}
+
+
+@router.post("/broadcasts/{broadcast_id}/cancel", dependencies=[Depends(get_admin_user)])
+async def cancel_broadcast(broadcast_id: int, db: AsyncSession = Depends(get_db)):
+    """Cancel broadcast; the runner stops after its current batch"""
+    result = await db.execute(
+        update(Broadcast)
+        .where(Broadcast.id == broadcast_id, Broadcast.status.in_(("pending", "running", "paused")))
+        .values(status="cancelled")
+    )
+    await db.commit()
+    if result.rowcount == 0:
+        raise HTTPException(status_code=409, detail="Broadcast not found or already finished")
+    return {"success": True, "message": "Broadcast cancelled"}
+
+
 # ===== FILE UPLOAD =====
 
 @router.post("/upload/image")
@@ -9,11 +9,13 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 import logging
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.bot_interaction import UserSession, BotInteraction, SupportMessage, BotStatistics
 from app.models.user import User
 from app.models.order import Order, OrderStatus
 from app.core.dependencies import get_admin_user
+from app.core.responses import FastJSONResponse
+from app.schemas.analytics import InteractionResponse, InteractionListResponse
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 logger = logging.getLogger(__name__)
@@ -22,7 +24,7 @@ logger = logging.getLogger(__name__)
 @router.get("/dashboard")
 async def get_dashboard_stats(
     days: int = Query(7, ge=1, le=90),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_admin_user)  # Uncomment when auth is enabled
 ):
     """
@@ -174,13 +176,13 @@ async def get_dashboard_stats(
     }
 
 
-@router.get("/interactions")
+@router.get("/interactions", response_model=InteractionListResponse)
 async def get_user_interactions(
     user_id: Optional[int] = None,
     telegram_id: Optional[int] = None,
     days: int = Query(7, ge=1, le=90),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_admin_user)
 ):
     """
@@ -200,33 +202,17 @@ async def get_user_interactions(
     result = await db.execute(query)
     interactions = result.scalars().all()
 
-    return {
-        "count": len(interactions),
-        "interactions": [
-            {
-                "id": interaction.id,
-                "timestamp": interaction.created_at.isoformat(),
-                "user_id": interaction.user_id,
-                "telegram_id": interaction.telegram_id,
-                "type": interaction.interaction_type,
-                "command": interaction.command,
-                "message_text": interaction.message_text,
-                "callback_data": interaction.callback_data,
-                "bot_response": interaction.bot_response,
-                "fsm_state": interaction.fsm_state,
-                "is_successful": interaction.is_successful,
-                "error_message": interaction.error_message
-            }
-            for interaction in interactions
-        ]
-    }
+    return FastJSONResponse(InteractionListResponse(
+        count=len(interactions),
+        interactions=[InteractionResponse.model_validate(interaction) for interaction in interactions]
+    ))
 
 
 @router.get("/sessions")
 async def get_user_sessions(
     user_id: Optional[int] = None,
     days: int = Query(7, ge=1, le=90),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_admin_user)
 ):
     """
@@ -275,7 +261,7 @@ async def get_support_messages(
     status: Optional[str] = None,
     user_id: Optional[int] = None,
     days: int = Query(30, ge=1, le=90),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_admin_user)
 ):
     """
@@ -324,7 +310,7 @@ async def get_support_messages(
 async def get_user_journey(
     telegram_id: int,
     days: int = Query(30, ge=1, le=90),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_admin_user)
 ):
     """
@@ -444,7 +430,7 @@ async def get_user_journey(
 @router.get("/daily-stats")
 async def get_daily_statistics(
     days: int = Query(30, ge=1, le=90),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # current_user: User = Depends(get_admin_user)
 ):
     """
@@ -2,9 +2,11 @@
 Bot API endpoints - for Telegram bot to interact with backend
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
 from typing import Optional, List
 import logging
@@ -14,7 +16,14 @@ from app.models.user import User
 from app.models.order import Order, OrderStatus
 from app.models.location import City
 from app.models.bot_interaction import UserSession, BotInteraction, SupportMessage
-from pydantic import BaseModel
+from app.core.dependencies import verify_n8n_signature
+from app.core.idempotency import IDEMPOTENCY_HEADER, Idempotency
+from app.core.i18n import catalog, get_translator
+from app.core.single_flight import single_flight
+from app.services.admission import KitchenFull, LocationNotFound, admission
+from app.services.stock import OutOfStock, publish_stock_change, reserve_stock
+from app.services.task_queue import enqueue
+from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="", tags=["Bot API"])
 logger = logging.getLogger(__name__)
@@ -72,7 +81,7 @@ class SupportMessageRequest(BaseModel):
 
 class OrderItemRequest(BaseModel):
     product_id: int
-    quantity: int
+    quantity: int = Field(gt=0)
     unit_price: float
     selected_options: Optional[dict] = None
     options_price: float = 0
@@ -86,6 +95,18 @@ class CreateOrderRequest(BaseModel):
     total_amount: float
 
 
+class ReceiptValidationResult(BaseModel):
+    """Receipt verdict posted back by the n8n GPT-4o workflow"""
+    valid: bool
+    amount_detected: Optional[float] = None
+    amount_matches: Optional[bool] = None
+    date_valid: Optional[bool] = None
+    readable: Optional[bool] = None
+    merchant: Optional[str] = None
+    confidence: Optional[float] = None
+    notes: Optional[str] = None
+
+
 # ==================== User Endpoints ====================
 
 @router.get("/users/{telegram_id}")
@@ -113,29 +134,36 @@ async def get_user_by_telegram_id(telegram_id: int, db: AsyncSession = Depends(g
 
 @router.post("/users")
 async def create_user(request: UserCreateRequest, db: AsyncSession = Depends(get_db)):
-    """Create new user"""
-    # Check if user already exists
-    existing_query = select(User).where(User.telegram_id == request.telegram_id)
-    existing_result = await db.execute(existing_query)
-    existing_user = existing_result.scalar_one_or_none()
-
-    if existing_user:
-        raise HTTPException(status_code=400, detail="User already exists")
-
-    # Create new user
-    user = User(
+    """
+    Create new user
+    
+    A single INSERT ... ON CONFLICT: a repeated registration (retry, double
+    tap) returns the existing user with created=False; the same telegram_id
+    registered with another phone or name is refused.
+    """
+    statement = insert(User).values(
         telegram_id=request.telegram_id,
         phone=request.phone,
         full_name=request.full_name,
         city_id=request.city_id,
         language=request.language
     )
+    result = await db.execute(
+        statement.on_conflict_do_nothing(index_elements=[User.telegram_id]).returning(User)
+    )
+    user = result.scalar_one_or_none()
+    created = user is not None
+
+    if not created:
+        existing_result = await db.execute(select(User).where(User.telegram_id == request.telegram_id))
+        user = existing_result.scalar_one()
+        if (user.phone, user.full_name) != (request.phone, request.full_name):
+            raise HTTPException(status_code=400, detail="User already exists")
 
-    db.add(user)
     await db.commit()
-    await db.refresh(user)
 
     return {
+        "created": created,
         "id": user.id,
         "telegram_id": user.telegram_id,
         "phone": user.phone,
@@ -147,6 +175,7 @@ async def create_user(request: UserCreateRequest, db: AsyncSession = Depends(get
 
 
 @router.get("/cities")
+@single_flight("cities")
 async def get_cities(db: AsyncSession = Depends(get_db)):
     """Get all active cities"""
     query = select(City).where(City.is_active == True).order_by(City.name)
@@ -166,14 +195,37 @@ async def get_cities(db: AsyncSession = Depends(get_db)):
     }
 
 
+@router.get("/i18n/catalog")
+async def get_message_catalog():
+    """Shared message catalog for the bot, resolved (language -> key -> text, fallback applied)"""
+    return {
+        "success": True,
+        "data": catalog.texts
+    }
+
+
 # ==================== Order Endpoints ====================
 
 @router.post("/orders/create")
-async def create_order(request: CreateOrderRequest, db: AsyncSession = Depends(get_db)):
-    """Create new order from WebApp"""
+async def create_order(
+    request: CreateOrderRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create new order from WebApp
+    
+    A retry sent with the same Idempotency-Key gets the first response
+    instead of a second order.
+    """
     import random
     import string
     
+    idempotency = Idempotency(db, "orders.create", idempotency_key, request)
+    replay = await idempotency.begin()
+    if replay is not None:
+        return replay
+    
     # Get user by telegram_id
     user_query = select(User).where(User.telegram_id == request.telegram_id)
     user_result = await db.execute(user_query)
@@ -182,6 +234,21 @@ async def create_order(request: CreateOrderRequest, db: AsyncSession = Depends(g
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    # Take a kitchen slot: a saturated location is refused before payment
+    try:
+        admitted = await admission.admit(db, request.location_id)
+    except LocationNotFound:
+        raise HTTPException(status_code=404, detail="Location not found")
+    except KitchenFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "message": get_translator(user.language).t("kitchen_busy"),
+                "retry_after": e.retry_after
+            },
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
     # Generate unique 6-digit order code
     while True:
         order_code = ''.join(random.choices(string.digits, k=6))
@@ -195,7 +262,9 @@ async def create_order(request: CreateOrderRequest, db: AsyncSession = Depends(g
         location_id=request.location_id,
         order_code=order_code,
         total_amount=request.total_amount,
-        status=OrderStatus.PENDING
+        status=OrderStatus.PENDING,
+        slot_start=admitted.slot_start,
+        ready_at=admitted.ready_at
     )
     
     db.add(order)
@@ -203,8 +272,8 @@ async def create_order(request: CreateOrderRequest, db: AsyncSession = Depends(g
     
     # Create order items
     from app.models.order import OrderItem
-    for item in request.items:
-        order_item = OrderItem(
+    order_items = [
+        OrderItem(
             order_id=order.id,
             product_id=item.product_id,
             quantity=item.quantity,
@@ -213,22 +282,44 @@ async def create_order(request: CreateOrderRequest, db: AsyncSession = Depends(g
             options_price=item.options_price,
             total_price=item.total_price
         )
-        db.add(order_item)
+        for item in request.items
+    ]
     
-    await db.commit()
+    # Reserve limited stock in the same transaction
+    try:
+        sold_out = await reserve_stock(db, request.location_id, order_items)
+    except OutOfStock as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": get_translator(user.language).t("out_of_stock"),
+                "product_ids": e.product_ids
+            }
+        )
+    db.add_all(order_items)
+    await db.flush()
     await db.refresh(order)
     
-    return {
+    response = {
         "success": True,
         "order": {
             "id": order.id,
             "order_code": order_code,
             "status": order.status.value,
             "total_amount": float(order.total_amount),
+            "ready_at": order.ready_at.isoformat() if order.ready_at else None,
             "created_at": order.created_at.isoformat()
         },
         "message": "Заказ создан. Произведите оплату и пришлите квитанцию об оплате."
     }
+    await idempotency.save(response)
+    await db.commit()
+    admission.confirm(request.location_id, admitted)
+    
+    if sold_out:
+        await publish_stock_change(request.location_id)
+    
+    return response
 
 
 @router.get("/orders/user/{telegram_id}")
@@ -279,6 +370,7 @@ async def get_order(order_id: int, db: AsyncSession = Depends(get_db)):
         "status": order.status.value,
         "total_amount": float(order.total_amount),
         "receipt_image_url": order.receipt_image_url,
+        "ready_at": order.ready_at.isoformat() if order.ready_at else None,
         "created_at": order.created_at.isoformat(),
         "user": {
             "telegram_id": order.user.telegram_id,
@@ -387,3 +479,76 @@ async def create_support_message(request: SupportMessageRequest, db: AsyncSessio
         "ticket_id": message.ticket_id,
         "created_at": message.created_at.isoformat()
     }
+
+
+# ==================== n8n Callbacks ====================
+
+@router.post("/orders/{order_id}/validate-result", dependencies=[Depends(verify_n8n_signature)])
+async def receipt_validation_callback(
+    order_id: int,
+    result: ReceiptValidationResult,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Receive asynchronous receipt validation verdict from n8n
+    
+    Signed with N8N_WEBHOOK_SECRET (see verify_n8n_signature).
+    Repeated deliveries for an already validated order are acknowledged
+    without sending notifications again. A verdict arriving after the order
+    expired unpaid is recorded, but the order stays cancelled: its stock is
+    gone, so the manager is only informed.
+    """
+    # Locked against the unpaid order sweeper deciding on the same order
+    query = (
+        select(Order)
+        .options(selectinload(Order.user), selectinload(Order.location))
+        .where(Order.id == order_id)
+        .with_for_update(of=Order)
+    )
+    db_result = await db.execute(query)
+    order = db_result.scalar_one_or_none()
+
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    if order.receipt_validated_at is not None:
+        return {"success": True, "status": order.status.value, "duplicate": True}
+
+    order.receipt_validation_result = result.model_dump()
+    order.receipt_validated_at = datetime.utcnow()
+    if result.amount_detected is not None:
+        order.receipt_amount = result.amount_detected
+
+    # Only a pending order moves to PAID; an invalid verdict leaves it
+    # pending so the manager can still confirm it manually
+    if result.valid and order.status == OrderStatus.PENDING:
+        order.status = OrderStatus.PAID
+
+    cancelled = order.status == OrderStatus.CANCELLED
+    # Notifications are queued in the same transaction as the verdict
+    if cancelled:
+        await enqueue(db, "order.notify_expired", {
+            "customer_telegram_id": order.user.telegram_id,
+            "customer_language": order.user.language,
+            "order_code": order.order_code,
+        })
+    else:
+        await enqueue(db, "receipt_validation.notify_customer", {
+            "customer_telegram_id": order.user.telegram_id,
+            "customer_language": order.user.language,
+            "order_code": order.order_code,
+            "valid": result.valid,
+        })
+    await enqueue(db, "receipt_validation.notify_manager", {
+        "order_id": order.id,
+        "order_code": order.order_code,
+        "total_amount": float(order.total_amount),
+        "customer_name": order.user.full_name,
+        "customer_phone": order.user.phone,
+        "location_name": order.location.name,
+        "result": result.model_dump(),
+        "cancelled": cancelled,
+    })
+    await db.commit()
+
+    return {"success": True, "status": order.status.value, "duplicate": False}
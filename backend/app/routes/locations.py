@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from ..database import get_db
 from ..models.location import Location
 from ..schemas.location import LocationResponse
+from ..core.single_flight import single_flight
+from ..services.admission import LocationNotFound, admission
 
 router = APIRouter(prefix="", tags=["locations"])
 
 @router.get("/pickup-locations")
+@single_flight("pickup_locations")
 async def get_pickup_locations(db: AsyncSession = Depends(get_db)):
     """Get all active pickup locations"""
     result = await db.execute(
@@ -23,3 +26,18 @@ async def get_pickup_locations(db: AsyncSession = Depends(get_db)):
         "success": True,
         "data": [LocationResponse.from_orm(loc).dict() for loc in locations]
     }
+
+
+@router.get("/pickup-locations/{location_id}/eta")
+async def get_pickup_location_eta(location_id: int, db: AsyncSession = Depends(get_db)):
+    """Ready time an order placed now would get; accepting=False when the kitchen is full"""
+    try:
+        ready_at = await admission.estimate(db, location_id)
+    except LocationNotFound:
+        raise HTTPException(status_code=404, detail="Location not found")
+    
+    return {
+        "success": True,
+        "accepting": ready_at is not None,
+        "ready_at": ready_at.isoformat() if ready_at else None
+    }
@@ -0,0 +1,32 @@
+"""
+WebApp endpoints - one-call startup data for the Telegram WebApp
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from app.core.compression import negotiate
+from app.services.webapp_bootstrap import webapp_bootstrap
+
+router = APIRouter(prefix="/webapp", tags=["WebApp"])
+
+
+@router.get("/bootstrap")
+async def get_bootstrap(
+    request: Request,
+    telegram_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+):
+    """
+    Cities, pickup locations, categories, effective menu, user profile and
+    recent orders in one (gzip-compressed when accepted) response
+    """
+    raw, compressed = await webapp_bootstrap.build(telegram_id, location_id)
+
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-store"}
+    if negotiate(request.headers.get("accept-encoding", ""), ("gzip",)) == "gzip":
+        headers["Content-Encoding"] = "gzip"
+        return Response(compressed, media_type="application/json", headers=headers)
+    return Response(raw, media_type="application/json", headers=headers)
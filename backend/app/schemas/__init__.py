@@ -2,14 +2,19 @@
 Pydantic schemas for API requests and responses
 """
 from .category import CategoryResponse
-from .product import ProductResponse
+from .product import ProductResponse, ProductListResponse, AdminProductResponse
 from .location import LocationResponse
 from .order import OrderResponse, CreateOrderRequest
+from .analytics import InteractionResponse, InteractionListResponse
 
 __all__ = [
     'CategoryResponse',
     'ProductResponse',
+    'ProductListResponse',
+    'AdminProductResponse',
     'LocationResponse',
     'OrderResponse',
     'CreateOrderRequest',
+    'InteractionResponse',
+    'InteractionListResponse',
 ]
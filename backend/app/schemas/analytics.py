@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional, List
+
+
+class InteractionResponse(BaseModel):
+    id: int
+    timestamp: datetime = Field(validation_alias="created_at")
+    user_id: Optional[int] = None
+    telegram_id: int
+    type: str = Field(validation_alias="interaction_type")
+    command: Optional[str] = None
+    message_text: Optional[str] = None
+    callback_data: Optional[str] = None
+    bot_response: Optional[str] = None
+    fsm_state: Optional[str] = None
+    is_successful: Optional[bool] = None
+    error_message: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class InteractionListResponse(BaseModel):
+    count: int
+    interactions: List[InteractionResponse]
@@ -19,3 +19,43 @@ class ProductResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_product(cls, product, **fields) -> "ProductResponse":
+        """
+        Built field by field: Product has no product_id column and its
+        options relationship must not be lazy-loaded in async context
+        """
+        return cls(
+            id=product.id,
+            category_id=product.category_id,
+            name=product.name,
+            description=product.description,
+            base_price=product.base_price,
+            photo_url=product.image_url,
+            is_available=product.is_active,
+            display_order=product.sort_order or 0,
+            created_at=product.created_at,
+            updated_at=product.updated_at,
+            **fields,
+        )
+
+
+class ProductListResponse(BaseModel):
+    success: bool = True
+    data: List[ProductResponse]
+
+
+class AdminProductResponse(BaseModel):
+    id: int
+    category_id: int
+    name: str
+    description: Optional[str] = None
+    base_price: float
+    image_url: Optional[str] = None
+    is_active: bool
+    sort_order: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
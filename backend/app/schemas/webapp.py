@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.schemas.product import ProductResponse
+
+
+class MenuProductResponse(ProductResponse):
+    """Product as offered at a pickup location"""
+    price: float  # Location price override, else base_price
+    stock_quantity: Optional[int] = None  # Left at the location, None = unlimited
+
+
+class CityResponse(BaseModel):
+    id: int
+    name: str
+    is_active: bool
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,4 @@
+"""
+Backend services
+Outbound integrations (Telegram notifications, etc.)
+"""
@@ -0,0 +1,246 @@
+"""
+Order admission control
+Each pickup location's kitchen takes at most Location.orders_per_slot
+orders per slot of Location.slot_minutes (NULL = unlimited). An order is
+admitted to the first slot with room that ends no earlier than
+prep_minutes from now; the end of that slot is the ready time quoted to the
+customer. When every slot up to ORDER_MAX_WAIT_MINUTES ahead is full the
+order is refused at creation, before the customer pays.
+
+The counts live in location_slots and are taken with one conditional
+upsert (orders < capacity) in the order transaction, so workers never
+admit more than the capacity together. Each worker keeps the counts it
+last saw in memory, reloaded after ADMISSION_REFRESH_SECONDS: slots known
+to be full are skipped without a query, and a saturated location is
+refused without touching the database. The in-memory counts only change
+once the order transaction has committed (confirm() after admit(),
+released() after release()), so a rolled back transaction never leaves
+the cache out of step with the database. Cancelled orders free their slot.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.invalidation import InvalidationTopic, cache_registry
+from app.core.metrics import record_admission
+from app.database import async_session_maker
+from app.models.location import Location, LocationSlot
+from app.models.order import Order
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Capacity:
+    """Kitchen settings of a pickup location"""
+    slot_minutes: int
+    orders_per_slot: Optional[int]
+    prep_minutes: int
+
+
+@dataclass
+class Admission:
+    """Slot an order was admitted to (None when capacity is unlimited) and its ready time"""
+    slot_start: Optional[datetime]
+    ready_at: datetime
+    # Orders in the slot including this one, as of the upsert
+    slot_orders: Optional[int] = None
+
+
+class LocationNotFound(Exception):
+    """No active pickup location with this id"""
+
+
+class KitchenFull(Exception):
+    """Every slot within the maximum wait is taken"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Kitchen full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def slot_floor(moment: datetime, slot_minutes: int) -> datetime:
+    """Start of the slot containing `moment` (slots are aligned to the epoch)"""
+    seconds = slot_minutes * 60
+    timestamp = moment.timestamp()
+    return datetime.fromtimestamp(timestamp - timestamp % seconds, tz=timezone.utc)
+
+
+class AdmissionController:
+    """Admits orders to kitchen slots; capacities and slot counts cached in-process"""
+
+    def __init__(self, max_wait_minutes: int, refresh_seconds: float):
+        self.max_wait = timedelta(minutes=max_wait_minutes)
+        self.refresh_seconds = refresh_seconds
+        self._capacity: Dict[int, Capacity] = {}
+        # location_id -> (monotonic time loaded, slot_start -> orders last seen)
+        self._counts: Dict[int, Tuple[float, Dict[datetime, int]]] = {}
+
+    def invalidate(self, location_ids: Optional[List[int]] = None):
+        """Forget cached capacities and counts (locations changed)"""
+        self._capacity.clear()
+        self._counts.clear()
+
+    async def capacity(self, db: AsyncSession, location_id: int) -> Capacity:
+        capacity = self._capacity.get(location_id)
+        if capacity is None:
+            location = (await db.execute(
+                select(Location).where(and_(Location.id == location_id, Location.is_active == True))
+            )).scalar_one_or_none()
+            if location is None:
+                raise LocationNotFound(location_id)
+            capacity = Capacity(location.slot_minutes, location.orders_per_slot, location.prep_minutes)
+            self._capacity[location_id] = capacity
+        return capacity
+
+    def _slots(self, capacity: Capacity, now: datetime) -> List[datetime]:
+        """Candidate slots: from the one where the order can be ready to the maximum wait"""
+        length = timedelta(minutes=capacity.slot_minutes)
+        slot = slot_floor(now + timedelta(minutes=capacity.prep_minutes), capacity.slot_minutes)
+        last = now + self.max_wait
+        slots = []
+        while slot + length <= last or not slots:
+            slots.append(slot)
+            slot += length
+        return slots
+
+    async def _known_counts(self, db: AsyncSession, location_id: int, slots: List[datetime]) -> Dict[datetime, int]:
+        loaded = self._counts.get(location_id)
+        if loaded is not None and time.monotonic() - loaded[0] < self.refresh_seconds:
+            counts = loaded[1]
+            # Drop past slots
+            for slot in [slot for slot in counts if slot < slots[0]]:
+                del counts[slot]
+            return counts
+
+        result = await db.execute(
+            select(LocationSlot.slot_start, LocationSlot.orders).where(and_(
+                LocationSlot.location_id == location_id,
+                LocationSlot.slot_start >= slots[0],
+                LocationSlot.slot_start <= slots[-1],
+            ))
+        )
+        counts = dict(result.all())
+        self._counts[location_id] = (time.monotonic(), counts)
+        return counts
+
+    def _retry_after(self, capacity: Capacity, now: datetime) -> int:
+        """Seconds until the next slot boundary, when a later slot comes into range"""
+        next_slot = slot_floor(now, capacity.slot_minutes) + timedelta(minutes=capacity.slot_minutes)
+        return max(1, int((next_slot - now).total_seconds()))
+
+    async def estimate(self, db: AsyncSession, location_id: int) -> Optional[datetime]:
+        """Ready time an order placed now would be quoted, None when the location is full"""
+        capacity = await self.capacity(db, location_id)
+        now = datetime.now(timezone.utc)
+        if capacity.orders_per_slot is None:
+            return now + timedelta(minutes=capacity.prep_minutes)
+
+        slots = self._slots(capacity, now)
+        counts = await self._known_counts(db, location_id, slots)
+        for slot in slots:
+            if counts.get(slot, 0) < capacity.orders_per_slot:
+                return slot + timedelta(minutes=capacity.slot_minutes)
+        return None
+
+    async def admit(self, db: AsyncSession, location_id: int) -> Admission:
+        """
+        Take a place in the first free slot (in the order transaction)
+
+        Raises LocationNotFound for unknown or inactive locations and
+        KitchenFull when no slot within the maximum wait has room. Call
+        confirm() once the order transaction has committed.
+        """
+        capacity = await self.capacity(db, location_id)
+        now = datetime.now(timezone.utc)
+        if capacity.orders_per_slot is None:
+            ready_at = now + timedelta(minutes=capacity.prep_minutes)
+            record_admission(location_id, True, (ready_at - now).total_seconds())
+            return Admission(slot_start=None, ready_at=ready_at)
+
+        slots = self._slots(capacity, now)
+        counts = await self._known_counts(db, location_id, slots)
+        for slot in slots:
+            if counts.get(slot, 0) >= capacity.orders_per_slot:
+                continue
+            statement = insert(LocationSlot).values(location_id=location_id, slot_start=slot, orders=1)
+            orders = (await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[LocationSlot.location_id, LocationSlot.slot_start],
+                    set_={"orders": LocationSlot.orders + 1},
+                    where=LocationSlot.orders < capacity.orders_per_slot,
+                ).returning(LocationSlot.orders)
+            )).scalar_one_or_none()
+            if orders is None:
+                # Filled by another worker since we last looked
+                counts[slot] = capacity.orders_per_slot
+                continue
+
+            ready_at = slot + timedelta(minutes=capacity.slot_minutes)
+            record_admission(location_id, True, (ready_at - now).total_seconds())
+            return Admission(slot_start=slot, ready_at=ready_at, slot_orders=orders)
+
+        record_admission(location_id, False)
+        raise KitchenFull(self._retry_after(capacity, now))
+
+    def confirm(self, location_id: int, admitted: Admission):
+        """Count a committed admission in the in-memory slot counts"""
+        if admitted.slot_start is None:
+            return
+        loaded = self._counts.get(location_id)
+        if loaded is not None:
+            counts = loaded[1]
+            counts[admitted.slot_start] = max(counts.get(admitted.slot_start, 0), admitted.slot_orders)
+
+    async def release(self, db: AsyncSession, order: Order) -> Optional[datetime]:
+        """
+        Free the slot of a cancelled order (in the caller's transaction)
+
+        Returns:
+            The freed slot, to pass to released() after commit
+        """
+        slot_start = order.slot_start
+        if slot_start is None:
+            return None
+        await db.execute(
+            update(LocationSlot)
+            .where(and_(
+                LocationSlot.location_id == order.location_id,
+                LocationSlot.slot_start == order.slot_start,
+                LocationSlot.orders > 0,
+            ))
+            .values(orders=LocationSlot.orders - 1)
+        )
+        order.slot_start = None
+        return slot_start
+
+    def released(self, location_id: int, slot_start: Optional[datetime]):
+        """Uncount a committed release in the in-memory slot counts"""
+        if slot_start is None:
+            return
+        loaded = self._counts.get(location_id)
+        if loaded is not None and loaded[1].get(slot_start):
+            loaded[1][slot_start] -= 1
+
+
+async def purge_past_slots():
+    """Scheduler job: delete slot counts older than a day"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=1)
+    async with async_session_maker() as session:
+        await session.execute(delete(LocationSlot).where(LocationSlot.slot_start < cutoff))
+        await session.commit()
+
+
+admission = AdmissionController(
+    max_wait_minutes=settings.ORDER_MAX_WAIT_MINUTES,
+    refresh_seconds=settings.ADMISSION_REFRESH_SECONDS,
+)
+cache_registry.register(InvalidationTopic.LOCATIONS, admission.invalidate)
@@ -0,0 +1,269 @@
+"""
+Broadcast engine
+Sends one message to every matching user at a steady, Telegram-safe rate
+
+Recipients are read in users.id order through a server-side cursor, one
+window at a time, so no transaction stays open for the whole campaign.
+After every batch the delivery results are inserted in bulk together with
+the new checkpoint (broadcasts.last_user_id), which makes an interrupted
+broadcast resumable without re-sending to anyone already processed.
+
+Every flush also touches broadcasts.updated_at as the runner's heartbeat.
+A broadcast left 'running' by a process that died without pausing it
+(SIGKILL, OOM, host loss) can be claimed again once its heartbeat is older
+than BROADCAST_STALE_SECONDS.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+import httpx
+from sqlalchemy import and_, func, or_, select, update, insert
+
+from app.config import settings
+from app.core.metrics import MetricsTransport
+from app.database import async_session_maker
+from app.models.broadcast import Broadcast, BroadcastDelivery
+from app.models.user import User
+from app.services.telegram_notifier import TELEGRAM_API_URL, SendPacer
+
+logger = logging.getLogger(__name__)
+
+
+# Statuses from which a runner may (re)claim a broadcast
+RESUMABLE_STATUSES = ("pending", "paused", "failed")
+
+
+def _claimable():
+    """Resumable, or 'running' with a heartbeat older than the stale threshold"""
+    return or_(
+        Broadcast.status.in_(RESUMABLE_STATUSES),
+        and_(
+            Broadcast.status == "running",
+            Broadcast.updated_at < func.now() - timedelta(seconds=settings.BROADCAST_STALE_SECONDS),
+        ),
+    )
+
+
+def is_resumable(broadcast: Broadcast) -> bool:
+    """Whether a runner may claim the broadcast (same rule as the claim itself)"""
+    if broadcast.status in RESUMABLE_STATUSES:
+        return True
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.BROADCAST_STALE_SECONDS)
+    return broadcast.status == "running" and broadcast.updated_at is not None and broadcast.updated_at < stale_before
+
+
+class BroadcastRunner:
+    """Runs broadcasts as background tasks inside the backend process"""
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        batch_size: int = 500,
+        cursor_window: int = 5000,
+        max_retries: int = 3
+    ):
+        self.rate = rate
+        self.batch_size = batch_size
+        self.cursor_window = cursor_window
+        self.max_retries = max_retries
+        # One pacer for all broadcasts of the process: running two at once
+        # must not double the rate
+        self.pacer = SendPacer(rate)
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def start(self, broadcast_id: int) -> bool:
+        """
+        Start (or resume) broadcast in background
+
+        Returns:
+            False if this process is already running it
+        """
+        task = self._tasks.get(broadcast_id)
+        if task and not task.done():
+            return False
+        task = asyncio.create_task(self.run(broadcast_id), name=f"broadcast-{broadcast_id}")
+        self._tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(broadcast_id, None))
+        return True
+
+    async def shutdown(self):
+        """Cancel running broadcasts; they are left 'paused' at their checkpoint"""
+        tasks: Set[asyncio.Task] = set(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _claim(self, broadcast_id: int) -> Optional[Broadcast]:
+        """Atomically move broadcast to 'running' so only one runner owns it"""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(Broadcast)
+                .where(Broadcast.id == broadcast_id, _claimable())
+                .values(status="running", started_at=datetime.utcnow(), updated_at=func.now())
+                .returning(Broadcast)
+            )
+            broadcast = result.scalar_one_or_none()
+            await session.commit()
+            return broadcast
+
+    async def _set_status(self, broadcast_id: int, status: str, error_message: Optional[str] = None):
+        values = {"status": status, "error_message": error_message}
+        if status in ("completed", "failed"):
+            values["finished_at"] = datetime.utcnow()
+        async with async_session_maker() as session:
+            await session.execute(
+                update(Broadcast)
+                .where(Broadcast.id == broadcast_id, Broadcast.status == "running")
+                .values(**values)
+            )
+            await session.commit()
+
+    async def _recipient_windows(self, broadcast: Broadcast, after_user_id: int):
+        """
+        Yield batches of (user_id, telegram_id) after checkpoint
+
+        Each window of `cursor_window` rows is streamed with a server-side
+        cursor in its own short transaction.
+        """
+        while True:
+            query = (
+                select(User.id, User.telegram_id)
+                .where(User.is_active == True, User.id > after_user_id)
+                .order_by(User.id)
+                .limit(self.cursor_window)
+                .execution_options(yield_per=self.batch_size)
+            )
+            if broadcast.city_id is not None:
+                query = query.where(User.city_id == broadcast.city_id)
+            if broadcast.language:
+                query = query.where(User.language == broadcast.language)
+
+            # Drain the window before sending so the cursor's transaction
+            # is closed while we wait on Telegram
+            batches = []
+            async with async_session_maker() as session:
+                stream = await session.stream(query)
+                async for partition in stream.partitions(self.batch_size):
+                    batches.append([(row.id, row.telegram_id) for row in partition])
+
+            rows_in_window = 0
+            for batch in batches:
+                rows_in_window += len(batch)
+                after_user_id = batch[-1][0]
+                yield batch
+
+            if rows_in_window < self.cursor_window:
+                return
+
+    async def _deliver(
+        self,
+        client: httpx.AsyncClient,
+        pacer: SendPacer,
+        url: str,
+        text: str,
+        user_id: int,
+        telegram_id: int
+    ) -> Dict:
+        """Send message to one recipient, honoring RetryAfter"""
+        error = None
+        for _ in range(self.max_retries + 1):
+            await pacer.wait()
+            try:
+                response = await client.post(url, json={
+                    "chat_id": telegram_id,
+                    "text": text,
+                    "parse_mode": "HTML",
+                })
+            except httpx.HTTPError as e:
+                error = str(e)
+                continue
+
+            if response.status_code == 200:
+                return {"user_id": user_id, "telegram_id": telegram_id, "status": "sent", "error_message": None}
+
+            if response.status_code == 429:
+                retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                logger.warning(f"Broadcast hit flood control, pausing {retry_after}s")
+                pacer.pause(retry_after)
+                error = "flood control"
+                continue
+
+            status = "blocked" if response.status_code == 403 else "failed"
+            return {"user_id": user_id, "telegram_id": telegram_id, "status": status, "error_message": response.text[:500]}
+
+        return {"user_id": user_id, "telegram_id": telegram_id, "status": "failed", "error_message": error}
+
+    async def _flush(self, broadcast_id: int, last_user_id: int, results: List[Dict]) -> str:
+        """
+        Store delivery results and checkpoint in one transaction
+
+        The update doubles as the runner's heartbeat.
+
+        Returns:
+            Current broadcast status (to notice cancellation)
+        """
+        rows = [{**result, "broadcast_id": broadcast_id} for result in results]
+        sent = sum(1 for result in results if result["status"] == "sent")
+
+        async with async_session_maker() as session:
+            await session.execute(insert(BroadcastDelivery), rows)
+            result = await session.execute(
+                update(Broadcast)
+                .where(Broadcast.id == broadcast_id)
+                .values(
+                    last_user_id=last_user_id,
+                    sent_count=Broadcast.sent_count + sent,
+                    failed_count=Broadcast.failed_count + (len(results) - sent),
+                    updated_at=func.now(),
+                )
+                .returning(Broadcast.status)
+            )
+            status = result.scalar_one()
+            await session.commit()
+            return status
+
+    async def run(self, broadcast_id: int):
+        """Run broadcast until all recipients are processed"""
+        if not settings.BOT_TOKEN:
+            logger.error("BOT_TOKEN not configured, cannot run broadcast")
+            return
+
+        broadcast = await self._claim(broadcast_id)
+        if not broadcast:
+            logger.info(f"Broadcast {broadcast_id} is not resumable, skipping")
+            return
+
+        logger.info(f"Broadcast {broadcast_id} started from user_id > {broadcast.last_user_id}")
+        url = f"{TELEGRAM_API_URL}/bot{settings.BOT_TOKEN}/sendMessage"
+        limits = httpx.Limits(max_connections=50, max_keepalive_connections=50)
+
+        try:
+            async with httpx.AsyncClient(timeout=10, transport=MetricsTransport("telegram", limits=limits)) as client:
+                async for batch in self._recipient_windows(broadcast, broadcast.last_user_id):
+                    results = await asyncio.gather(*(
+                        self._deliver(client, self.pacer, url, broadcast.message_text, user_id, telegram_id)
+                        for user_id, telegram_id in batch
+                    ))
+                    status = await self._flush(broadcast_id, batch[-1][0], results)
+                    if status != "running":
+                        logger.info(f"Broadcast {broadcast_id} stopped: {status}")
+                        return
+
+            await self._set_status(broadcast_id, "completed")
+            logger.info(f"Broadcast {broadcast_id} completed")
+
+        except asyncio.CancelledError:
+            await self._set_status(broadcast_id, "paused")
+            logger.info(f"Broadcast {broadcast_id} paused")
+            raise
+        except Exception as e:
+            logger.exception(f"Broadcast {broadcast_id} failed")
+            await self._set_status(broadcast_id, "failed", str(e))
+
+
+# Global broadcast runner
+broadcast_runner = BroadcastRunner(rate=settings.BROADCAST_RATE)
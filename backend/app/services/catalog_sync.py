@@ -0,0 +1,102 @@
+"""
+Catalog delta sync
+Changes to categories, products, options and location products since a
+catalog version, so clients keep a local copy and fetch only what changed.
+
+The versions come from the catalog_changes log written by database
+triggers (alembic revision f4a5b6c7d8e9). Rows are returned in their
+current state, inactive ones included: clients apply them and filter.
+A location product's stock_quantity is versioned only when the product
+sells out or comes back (revision b6c7d8e9f0a1), not per order.
+"""
+
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import CatalogChange, Category, LocationProduct, Product, ProductOption
+from app.schemas.category import CategoryResponse
+from app.schemas.product import ProductResponse
+
+
+def _option(option: ProductOption) -> Dict[str, Any]:
+    return {
+        "id": option.id,
+        "product_id": option.product_id,
+        "option_name": option.option_name,
+        "option_value": option.option_value,
+        "price_modifier": float(option.price_modifier or 0),
+        "is_active": option.is_active,
+        "sort_order": option.sort_order,
+    }
+
+
+def _location_product(offer: LocationProduct) -> Dict[str, Any]:
+    return {
+        "id": offer.id,
+        "location_id": offer.location_id,
+        "product_id": offer.product_id,
+        "price_override": float(offer.price_override) if offer.price_override is not None else None,
+        "is_available": offer.is_available,
+        "stock_quantity": offer.stock_quantity,
+        "sort_order": offer.sort_order,
+    }
+
+
+# catalog_changes.entity -> (model, serializer)
+ENTITIES: Dict[str, tuple] = {
+    "categories": (Category, CategoryResponse.model_validate),
+    "products": (Product, ProductResponse.from_product),
+    "product_options": (ProductOption, _option),
+    "location_products": (LocationProduct, _location_product),
+}
+
+
+async def catalog_version(db: AsyncSession) -> int:
+    """Current catalog version (0 for an empty catalog)"""
+    result = await db.execute(select(func.coalesce(func.max(CatalogChange.version), 0)))
+    return result.scalar_one()
+
+
+async def changes_since(db: AsyncSession, since: int) -> Dict[str, Any]:
+    """
+    Rows inserted, updated and deleted after catalog version `since`
+
+    A row inserted and deleted within the range is left out. A `since`
+    ahead of the current version (e.g. the database was restored) answers
+    with the full catalog and reset=True, the client must drop its copy.
+    """
+    version = await catalog_version(db)
+    reset = since > version
+    if reset:
+        since = 0
+
+    result = await db.execute(
+        select(
+            CatalogChange.entity,
+            CatalogChange.entity_id,
+            func.bool_or(CatalogChange.operation == "insert").label("created"),
+        )
+        .where(CatalogChange.version > since, CatalogChange.version <= version)
+        .group_by(CatalogChange.entity, CatalogChange.entity_id)
+    )
+    touched: Dict[str, Dict[int, bool]] = {}
+    for entity, entity_id, created in result.all():
+        touched.setdefault(entity, {})[entity_id] = created
+
+    changes = {}
+    for entity, (model, serialize) in ENTITIES.items():
+        ids = touched.get(entity)
+        if not ids:
+            continue
+        rows = (await db.execute(select(model).where(model.id.in_(list(ids))).order_by(model.id))).scalars().all()
+        inserted: List[Any] = []
+        updated: List[Any] = []
+        for row in rows:
+            (inserted if ids.pop(row.id) else updated).append(serialize(row))
+        # What is left no longer exists; rows created within the range were never seen
+        deleted = sorted(entity_id for entity_id, created in ids.items() if not created)
+        changes[entity] = {"inserted": inserted, "updated": updated, "deleted": deleted}
+
+    return {"success": True, "version": version, "reset": reset, "changes": changes}
@@ -0,0 +1,124 @@
+"""
+Daily statistics rollup
+Aggregates one UTC day of users, sessions, interactions, orders and support
+messages into bot_statistics, which /analytics/daily-stats reads. Metric
+definitions match the /analytics/dashboard counters.
+
+Runs as a scheduler job (app.core.scheduler) over today and yesterday, so
+late events of the previous day are picked up. Each run upserts the day's
+row, re-running it is harmless.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import and_, desc, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import async_session_maker
+from app.models.bot_interaction import BotInteraction, BotStatistics, SupportMessage, UserSession
+from app.models.order import Order, OrderStatus
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+REVENUE_STATUSES = [OrderStatus.COMPLETED, OrderStatus.CONFIRMED, OrderStatus.PAID]
+
+
+async def rollup_daily_statistics(day: date):
+    """Compute and upsert the bot_statistics row of one UTC day"""
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    end = start + timedelta(days=1)
+
+    async with async_session_maker() as session:
+        users = (await session.execute(select(
+            func.count(User.id).filter(User.created_at < end),
+            func.count(User.id).filter(and_(User.created_at >= start, User.created_at < end)),
+        ))).one()
+
+        sessions = (await session.execute(
+            select(
+                func.count(UserSession.id),
+                func.count(func.distinct(UserSession.user_id)),
+                func.avg(UserSession.duration_seconds),
+            ).where(and_(UserSession.session_start >= start, UserSession.session_start < end))
+        )).one()
+
+        interactions = (await session.execute(
+            select(
+                func.count(BotInteraction.id),
+                func.count(BotInteraction.id).filter(BotInteraction.interaction_type == "command"),
+                func.count(BotInteraction.id).filter(BotInteraction.interaction_type == "message"),
+                func.count(BotInteraction.id).filter(BotInteraction.interaction_type == "callback_query"),
+                func.count(BotInteraction.id).filter(BotInteraction.command == "/menu"),
+            ).where(and_(BotInteraction.created_at >= start, BotInteraction.created_at < end))
+        )).one()
+
+        top_commands = (await session.execute(
+            select(BotInteraction.command, func.count(BotInteraction.id).label("count"))
+            .where(and_(
+                BotInteraction.created_at >= start,
+                BotInteraction.created_at < end,
+                BotInteraction.command.isnot(None),
+            ))
+            .group_by(BotInteraction.command).order_by(desc("count")).limit(10)
+        )).all()
+
+        orders = (await session.execute(
+            select(
+                func.count(Order.id),
+                func.count(Order.id).filter(Order.status == OrderStatus.PAID),
+                func.count(Order.id).filter(Order.status == OrderStatus.CONFIRMED),
+                func.count(Order.id).filter(Order.status == OrderStatus.COMPLETED),
+                func.count(Order.id).filter(Order.status == OrderStatus.CANCELLED),
+                func.sum(Order.total_amount).filter(Order.status.in_(REVENUE_STATUSES)),
+                func.count(Order.id).filter(Order.status.in_(REVENUE_STATUSES)),
+            ).where(and_(Order.created_at >= start, Order.created_at < end))
+        )).one()
+
+        support = (await session.execute(
+            select(
+                func.count(SupportMessage.id).filter(SupportMessage.sender_type == "user"),
+                func.count(func.distinct(SupportMessage.ticket_id)).filter(SupportMessage.status == "closed"),
+            ).where(and_(SupportMessage.created_at >= start, SupportMessage.created_at < end))
+        )).one()
+
+        revenue = float(orders[5] or 0)
+        values = {
+            "date": start,
+            "total_users": users[0],
+            "new_users": users[1],
+            "active_users": sessions[1],
+            "total_sessions": sessions[0],
+            "avg_session_duration": int(sessions[2] or 0),
+            "total_interactions": interactions[0],
+            "total_commands": interactions[1],
+            "total_messages": interactions[2],
+            "total_callbacks": interactions[3],
+            "menu_views": interactions[4],
+            "orders_created": orders[0],
+            "orders_paid": orders[1],
+            "orders_confirmed": orders[2],
+            "orders_completed": orders[3],
+            "orders_cancelled": orders[4],
+            "total_revenue": int(round(revenue * 100)),  # In kopecks
+            "avg_order_value": int(round(revenue * 100 / orders[6])) if orders[6] else 0,
+            "support_tickets_opened": support[0],
+            "support_tickets_closed": support[1],
+            "top_commands": {row.command: row.count for row in top_commands},
+            "updated_at": func.now(),
+        }
+        statement = insert(BotStatistics).values(**values)
+        await session.execute(statement.on_conflict_do_update(
+            index_elements=[BotStatistics.date],
+            set_={key: statement.excluded[key] for key in values if key != "date"},
+        ))
+        await session.commit()
+
+
+async def rollup_recent_statistics():
+    """Scheduler job: roll up yesterday and today"""
+    today = datetime.now(timezone.utc).date()
+    for day in (today - timedelta(days=1), today):
+        await rollup_daily_statistics(day)
+    logger.debug(f"bot_statistics rolled up for {today - timedelta(days=1)} and {today}")
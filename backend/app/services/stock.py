@@ -0,0 +1,216 @@
+"""
+Stock reservation
+Orders reserve limited stock (LocationProduct.stock_quantity, NULL =
+unlimited) inside the order transaction: one conditional UPDATE per cart
+decrements every limited product of the location by the ordered quantity,
+only where enough is left. If any product is short the whole order is
+refused, and the rolled back transaction keeps nothing reserved.
+
+The rows are locked in id order before they are updated, so concurrent
+orders with overlapping carts queue behind each other instead of
+deadlocking. What an item took is kept in OrderItem.reserved_quantity and
+given back when the order is cancelled: by a manager, or by the sweeper for
+pending orders not paid within ORDER_PAYMENT_TIMEOUT_MINUTES.
+
+Stock-only updates are not catalog versions (see alembic revision
+b6c7d8e9f0a1): the WebApp menu cache is dropped per location through the
+STOCK invalidation topic when a product sells out or comes back.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import Integer, and_, column, exists, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.core.invalidation import InvalidationTopic, invalidation_bus
+from app.core.metrics import record_stock
+from app.database import async_session_maker
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import LocationProduct
+from app.services.admission import admission
+from app.services.task_queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+# Orders expired per sweeper transaction
+SWEEP_BATCH_SIZE = 100
+
+
+class OutOfStock(Exception):
+    """Not enough stock left for some products of an order"""
+
+    def __init__(self, product_ids: List[int]):
+        super().__init__(f"Out of stock: {product_ids}")
+        self.product_ids = product_ids
+
+
+def _quantities(product_ids: Iterable[int], quantities: Iterable[int], name: str):
+    """VALUES list (product_id, quantity) usable as a table in UPDATE ... FROM"""
+    return values(
+        column("product_id", Integer), column("quantity", Integer), name=name
+    ).data(list(zip(product_ids, quantities)))
+
+
+def _locked_stock(location_id: int, product_ids: Iterable[int]):
+    """CTE locking the location's limited stock rows of the products, in id order"""
+    return (
+        select(LocationProduct.id)
+        .where(and_(
+            LocationProduct.location_id == location_id,
+            LocationProduct.product_id.in_(list(product_ids)),
+            LocationProduct.stock_quantity.isnot(None),
+        ))
+        .order_by(LocationProduct.id)
+        .with_for_update()
+        .cte("locked_stock")
+    )
+
+
+async def reserve_stock(db: AsyncSession, location_id: int, items: List[OrderItem]) -> Set[int]:
+    """
+    Take the stock of an order's items at a location (in the order transaction)
+
+    Sets reserved_quantity on items of limited products. Raises OutOfStock
+    with the short product ids, having reserved nothing the caller will
+    keep: the transaction must be rolled back.
+
+    Returns:
+        Product ids now sold out at the location
+    """
+    requested: Dict[int, int] = defaultdict(int)
+    for item in items:
+        requested[item.product_id] += item.quantity
+    if not requested:
+        return set()
+
+    wanted = _quantities(requested.keys(), requested.values(), "wanted")
+    locked = _locked_stock(location_id, requested)
+    result = await db.execute(
+        update(LocationProduct)
+        .where(and_(
+            LocationProduct.id.in_(select(locked.c.id)),
+            LocationProduct.product_id == wanted.c.product_id,
+            LocationProduct.stock_quantity >= wanted.c.quantity,
+        ))
+        .values(stock_quantity=LocationProduct.stock_quantity - wanted.c.quantity)
+        .returning(LocationProduct.product_id, LocationProduct.stock_quantity)
+        .execution_options(synchronize_session=False)
+    )
+    left = dict(result.all())
+
+    missing = [product_id for product_id in requested if product_id not in left]
+    if missing:
+        # Unlimited products are not updated; the rest are short (and still locked by us)
+        short = (await db.execute(
+            select(LocationProduct.product_id).where(and_(
+                LocationProduct.location_id == location_id,
+                LocationProduct.product_id.in_(missing),
+                LocationProduct.stock_quantity.isnot(None),
+            ))
+        )).scalars().all()
+        if short:
+            record_stock("out_of_stock")
+            raise OutOfStock(sorted(short))
+
+    for item in items:
+        if item.product_id in left:
+            item.reserved_quantity = item.quantity
+    record_stock("reserved")
+    return {product_id for product_id, quantity in left.items() if quantity == 0}
+
+
+async def release_stock(db: AsyncSession, order: Order) -> Set[int]:
+    """
+    Give back what the order's items reserved (in the caller's transaction)
+
+    Idempotent: released items are reset to reserved_quantity 0. Stock of
+    a product that became unlimited in the meantime stays unlimited.
+
+    Returns:
+        Product ids back in stock at the order's location
+    """
+    reserved: Dict[int, int] = defaultdict(int)
+    for item in order.items:
+        if item.reserved_quantity:
+            reserved[item.product_id] += item.reserved_quantity
+            item.reserved_quantity = 0
+    if not reserved:
+        return set()
+
+    returned = _quantities(reserved.keys(), reserved.values(), "returned")
+    locked = _locked_stock(order.location_id, reserved)
+    result = await db.execute(
+        update(LocationProduct)
+        .where(and_(
+            LocationProduct.id.in_(select(locked.c.id)),
+            LocationProduct.product_id == returned.c.product_id,
+        ))
+        .values(stock_quantity=LocationProduct.stock_quantity + returned.c.quantity)
+        .returning(LocationProduct.product_id, LocationProduct.stock_quantity)
+        .execution_options(synchronize_session=False)
+    )
+    record_stock("released")
+    return {product_id for product_id, quantity in result.all() if quantity == reserved[product_id]}
+
+
+async def publish_stock_change(location_id: int):
+    """Drop the location's cached menus (call after commit when availability flipped)"""
+    await invalidation_bus.publish(InvalidationTopic.STOCK, [location_id])
+
+
+async def expire_unpaid_orders():
+    """
+    Scheduler job: cancel pending orders holding stock that were not paid in time
+
+    An order is unpaid while no receipt verdict has arrived; an order whose
+    receipt was rejected stays pending for the manager. Rows are claimed
+    with SKIP LOCKED, so an overlapping run during a leader failover is
+    harmless.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.ORDER_PAYMENT_TIMEOUT_MINUTES)
+    while True:
+        restocked: Set[int] = set()
+        freed_slots = []
+        async with async_session_maker() as session:
+            orders = (await session.execute(
+                select(Order)
+                .options(selectinload(Order.items), selectinload(Order.user))
+                .where(and_(
+                    Order.status == OrderStatus.PENDING,
+                    Order.created_at < cutoff,
+                    Order.receipt_validated_at.is_(None),
+                    exists().where(and_(OrderItem.order_id == Order.id, OrderItem.reserved_quantity > 0)),
+                ))
+                .order_by(Order.created_at)
+                .limit(SWEEP_BATCH_SIZE)
+                .with_for_update(of=Order, skip_locked=True)
+            )).scalars().all()
+            if not orders:
+                return
+
+            for order in orders:
+                if await release_stock(session, order):
+                    restocked.add(order.location_id)
+                freed_slots.append((order.location_id, await admission.release(session, order)))
+                order.status = OrderStatus.CANCELLED
+                order.cancellation_reason = "Payment timeout"
+                await enqueue(session, "order.notify_expired", {
+                    "customer_telegram_id": order.user.telegram_id,
+                    "customer_language": order.user.language,
+                    "order_code": order.order_code,
+                })
+                record_stock("expired")
+            await session.commit()
+
+        for location_id, slot_start in freed_slots:
+            admission.released(location_id, slot_start)
+        logger.info(f"Cancelled {len(orders)} unpaid orders, stock released")
+        for location_id in restocked:
+            await publish_stock_change(location_id)
+        if len(orders) < SWEEP_BATCH_SIZE:
+            return
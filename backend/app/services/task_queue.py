@@ -0,0 +1,370 @@
+"""
+Postgres task queue
+Slow side effects (Telegram notifications and the like) are written to the
+tasks table inside the request transaction and run by scripts/task_worker.py,
+so a request only pays for one INSERT and the work survives restarts. A
+rolled back request enqueues nothing; a committed one always does.
+
+Workers claim due tasks with SELECT ... FOR UPDATE SKIP LOCKED, so any
+number of consumers share the table without blocking each other. A claimed
+task holds a lease (locked_at) renewed while its handler runs; tasks of a
+worker that died are requeued once the lease expires. Failures are retried
+with exponential backoff and jitter, and after max_attempts the task is
+left in status dead with its last error for inspection.
+
+Handlers may run more than once (a lease expiring under a slow handler, a
+crash between the side effect and the status update), so they must
+tolerate repeats. A handler raises PermanentTaskError for failures no
+retry can fix; the task is then dead at once.
+
+Usage:
+    @task_handler("receipt_validation.notify_customer")
+    async def notify_receipt_customer(customer_telegram_id: int, ...):
+        ...
+
+    await enqueue(db, "receipt_validation.notify_customer", {"customer_telegram_id": ..., ...})
+    await db.commit()
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import random
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import asyncpg
+from sqlalchemy import and_, case, delete, func, select, text, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.metrics import TASK_QUEUE_DELAY, record_task
+from app.database import async_session_maker
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+# Modules registering handlers, imported by the worker before it starts
+HANDLER_MODULES = (
+    "app.services.telegram_notifier",
+)
+
+# Longest error text kept on a task
+MAX_ERROR_LENGTH = 2000
+
+TaskHandler = Callable[..., Awaitable[None]]
+
+_handlers: Dict[str, TaskHandler] = {}
+
+
+class PermanentTaskError(Exception):
+    """Task failure that retrying cannot fix"""
+
+
+def task_handler(kind: str):
+    """Register an async function as the handler of a task kind; the payload is passed as keyword arguments"""
+    def decorator(func: TaskHandler) -> TaskHandler:
+        if kind in _handlers:
+            raise ValueError(f"Task handler {kind} is already registered")
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def load_handlers():
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    run_at: Optional[datetime] = None,
+    max_attempts: Optional[int] = None
+) -> Task:
+    """
+    Add a task to the caller's transaction
+
+    Nothing runs until the transaction commits; the NOTIFY waking idle
+    workers is delivered with the commit as well. The payload must be
+    JSON-serializable.
+    """
+    task = Task(
+        kind=kind,
+        payload=payload or {},
+        max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+    )
+    if run_at is not None:
+        task.run_at = run_at
+    db.add(task)
+    await db.execute(text("SELECT pg_notify(:channel, :kind)"), {"channel": settings.TASK_CHANNEL, "kind": kind})
+    return task
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt: doubling per attempt, capped, with jitter against retry bursts"""
+    delay = min(settings.TASK_RETRY_MAX, settings.TASK_RETRY_BASE * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def purge_finished_tasks():
+    """Scheduler job: delete done tasks older than TASK_RETENTION_DAYS (dead ones are kept)"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.TASK_RETENTION_DAYS)
+    async with async_session_maker() as session:
+        result = await session.execute(
+            delete(Task).where(and_(Task.status == "done", Task.finished_at < cutoff))
+        )
+        await session.commit()
+    if result.rowcount:
+        logger.info(f"Purged {result.rowcount} finished tasks")
+
+
+class TaskWorker:
+    """Runs `concurrency` consumers claiming tasks from the tasks table"""
+
+    def __init__(
+        self,
+        database_url: str,
+        concurrency: int = 4,
+        lease: float = 60.0,
+        poll_interval: float = 5.0,
+        channel: str = "pizzamat_tasks"
+    ):
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.concurrency = concurrency
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.channel = channel
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+
+    async def run(self):
+        """Consume until stop() is called; tasks still running then are requeued"""
+        logger.info(f"Task worker {self.name} started, {self.concurrency} consumers, handlers: {', '.join(_handlers)}")
+        helpers = [
+            asyncio.create_task(self._listen(), name="task-listener"),
+            asyncio.create_task(self._reap(), name="task-reaper"),
+        ]
+        consumers = [
+            asyncio.create_task(self._consume(f"{self.name}:{n}"), name=f"task-consumer-{n}")
+            for n in range(self.concurrency)
+        ]
+        try:
+            await self._stopping.wait()
+        finally:
+            for task in consumers + helpers:
+                task.cancel()
+            await asyncio.gather(*consumers, *helpers, return_exceptions=True)
+            logger.info(f"Task worker {self.name} stopped")
+
+    def stop(self):
+        self._stopping.set()
+
+    async def _consume(self, consumer: str):
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await self._claim(consumer)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task claim failed: {e}")
+                claimed = None
+
+            if claimed is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._execute(consumer, claimed)
+
+    async def _claim(self, consumer: str):
+        """Lock the oldest due pending task and mark it running; None when there is none"""
+        due = (
+            select(Task.id)
+            .where(and_(Task.status == "pending", Task.run_at <= func.now()))
+            .order_by(Task.run_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(Task)
+                .where(Task.id == due)
+                .values(status="running", attempts=Task.attempts + 1, locked_at=func.now(), locked_by=consumer)
+                .returning(
+                    Task.id, Task.kind, Task.payload, Task.attempts, Task.max_attempts,
+                    func.extract("epoch", func.now() - Task.run_at).label("delay"),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            claimed = result.one_or_none()
+            await session.commit()
+        if claimed is not None:
+            TASK_QUEUE_DELAY.labels(claimed.kind).observe(max(float(claimed.delay), 0.0))
+        return claimed
+
+    async def _execute(self, consumer: str, claimed):
+        handler = _handlers.get(claimed.kind)
+        if handler is None:
+            await self._finish(claimed, consumer, "dead", error=f"No handler registered for {claimed.kind}")
+            record_task(claimed.kind, "dead", 0.0)
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(claimed.id, consumer))
+        started = time.perf_counter()
+        try:
+            await handler(**claimed.payload)
+        except asyncio.CancelledError:
+            # Shutdown: hand the task back without counting the attempt
+            await asyncio.shield(self._release(claimed.id, consumer))
+            record_task(claimed.kind, "requeued", time.perf_counter() - started)
+            raise
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            error = f"{type(e).__name__}: {e}"[:MAX_ERROR_LENGTH]
+            if isinstance(e, PermanentTaskError) or claimed.attempts >= claimed.max_attempts:
+                logger.error(f"Task {claimed.id} ({claimed.kind}) dead after {claimed.attempts} attempts: {error}")
+                await self._finish(claimed, consumer, "dead", error=error)
+                record_task(claimed.kind, "dead", elapsed)
+            else:
+                delay = retry_delay(claimed.attempts)
+                logger.warning(f"Task {claimed.id} ({claimed.kind}) attempt {claimed.attempts} failed, "
+                               f"retrying in {delay:.0f}s: {error}")
+                await self._finish(claimed, consumer, "pending", error=error, retry_in=delay)
+                record_task(claimed.kind, "retry", elapsed)
+        else:
+            await self._finish(claimed, consumer, "done")
+            record_task(claimed.kind, "done", time.perf_counter() - started)
+        finally:
+            heartbeat.cancel()
+
+    async def _finish(self, claimed, consumer: str, status: str, error: Optional[str] = None,
+                      retry_in: Optional[float] = None):
+        """Record the outcome, unless the lease was lost and the task handed to another consumer"""
+        values: Dict[str, Any] = {"status": status, "locked_at": None, "locked_by": None, "last_error": error}
+        if retry_in is not None:
+            values["run_at"] = func.now() + timedelta(seconds=retry_in)
+        else:
+            values["finished_at"] = func.now()
+        try:
+            async with async_session_maker() as session:
+                result = await session.execute(
+                    update(Task)
+                    .where(and_(Task.id == claimed.id, Task.locked_by == consumer, Task.status == "running"))
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+        except Exception as e:
+            # The lease expires and the reaper requeues it
+            logger.error(f"Failed to record task {claimed.id} as {status}: {e}")
+            return
+        if not result.rowcount:
+            logger.warning(f"Task {claimed.id} ({claimed.kind}) lease was lost before it finished")
+
+    async def _release(self, task_id: int, consumer: str):
+        try:
+            async with async_session_maker() as session:
+                await session.execute(
+                    update(Task)
+                    .where(and_(Task.id == task_id, Task.locked_by == consumer, Task.status == "running"))
+                    .values(status="pending", attempts=Task.attempts - 1, locked_at=None, locked_by=None)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to requeue task {task_id}: {e}")
+
+    async def _heartbeat(self, task_id: int, consumer: str):
+        """Renew the lease while the handler runs"""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with async_session_maker() as session:
+                    await session.execute(
+                        update(Task)
+                        .where(and_(Task.id == task_id, Task.locked_by == consumer, Task.status == "running"))
+                        .values(locked_at=func.now())
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task {task_id} lease renewal failed: {e}")
+
+    async def _reap(self):
+        """Requeue (or dead-letter) running tasks whose lease expired"""
+        exhausted = Task.attempts >= Task.max_attempts
+        while True:
+            try:
+                async with async_session_maker() as session:
+                    result = await session.execute(
+                        update(Task)
+                        .where(and_(
+                            Task.status == "running",
+                            Task.locked_at < func.now() - timedelta(seconds=self.lease),
+                        ))
+                        .values(
+                            status=case((exhausted, "dead"), else_="pending"),
+                            finished_at=case((exhausted, func.now()), else_=None),
+                            locked_at=None,
+                            locked_by=None,
+                            last_error="Lease expired (worker lost)",
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.commit()
+                if result.rowcount:
+                    logger.warning(f"Requeued {result.rowcount} tasks with an expired lease")
+                    self._wakeup.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task reaper failed: {e}")
+            await asyncio.sleep(self.lease)
+
+    async def _listen(self):
+        """Wake idle consumers on enqueue; without it they still poll every poll_interval"""
+        retry = 1.0
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task wakeup connection failed: {e}")
+                await asyncio.sleep(retry)
+                retry = min(retry * 2, 30.0)
+                continue
+
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda _: lost.set())
+            try:
+                await conn.add_listener(self.channel, lambda *_: self._wakeup.set())
+                retry = 1.0
+                # Anything enqueued while we were not listening is due now
+                self._wakeup.set()
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=30)
+                    except asyncio.TimeoutError:
+                        await conn.execute("SELECT 1", timeout=10)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task wakeup connection lost: {e}")
+            finally:
+                if not conn.is_closed():
+                    conn.terminate()
+            await asyncio.sleep(retry)
@@ -0,0 +1,218 @@
+"""
+Telegram notifier
+Sends messages to customers and the manager channel directly through
+the Telegram Bot API, so backend callbacks don't depend on the bot process.
+Notifications triggered by requests run as queued tasks (app.services.task_queue).
+
+The bot token's ~30 msg/s Telegram budget is split between processes:
+the bot (TELEGRAM_GLOBAL_RATE in the bot config), broadcasts
+(BROADCAST_RATE) and these notifications (TELEGRAM_NOTIFY_RATE per
+process), and the three settings must add up to no more than 30.
+"""
+
+import asyncio
+import html
+import httpx
+import logging
+import time
+from typing import Optional, Dict, Any, Union
+
+from app.config import settings
+from app.core.i18n import get_translator
+from app.core.metrics import MetricsTransport
+from app.services.task_queue import PermanentTaskError, task_handler
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+
+class SendPacer:
+    """Spaces message starts evenly at `rate` per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_slot = time.monotonic()
+        self.paused_until = 0.0
+
+    async def wait(self):
+        """Wait for the next send slot outside any pause"""
+        while True:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            # A pause that started while we slept moves this send as well
+            if time.monotonic() >= self.paused_until:
+                return
+
+    def pause(self, seconds: float):
+        """Push all following sends back, including ones already waiting (Telegram RetryAfter)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.next_slot = max(self.next_slot, self.paused_until)
+
+
+class TelegramNotifier:
+    """Minimal Telegram Bot API client for outbound notifications"""
+    
+    def __init__(self, bot_token: Optional[str] = None, timeout: float = 10.0, rate: float = 5.0):
+        self.bot_token = bot_token or settings.BOT_TOKEN
+        self.timeout = timeout
+        self.pacer = SendPacer(rate)
+    
+    async def send_message(
+        self,
+        chat_id: Union[int, str],
+        text: str,
+        reply_markup: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Send text message
+        
+        Args:
+            chat_id: Telegram chat ID (user or channel)
+            text: Message text (HTML parse mode)
+            reply_markup: Optional inline keyboard in Bot API format
+            
+        Returns:
+            True if Telegram accepted the message
+        """
+        if not self.bot_token:
+            logger.warning("BOT_TOKEN not configured, skipping Telegram notification")
+            return False
+        
+        try:
+            response = await self._post(chat_id, text, reply_markup)
+            response.raise_for_status()
+            return True
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Telegram API error {e.response.status_code}: {e.response.text}")
+            return False
+        except Exception as e:
+            logger.error(f"Telegram request error: {e}")
+            return False
+
+    async def _post(
+        self,
+        chat_id: Union[int, str],
+        text: str,
+        reply_markup: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        payload: Dict[str, Any] = {
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": "HTML",
+        }
+        if reply_markup:
+            payload["reply_markup"] = reply_markup
+        
+        url = f"{TELEGRAM_API_URL}/bot{self.bot_token}/sendMessage"
+        await self.pacer.wait()
+        async with httpx.AsyncClient(timeout=self.timeout, transport=MetricsTransport("telegram")) as client:
+            response = await client.post(url, json=payload)
+        if response.status_code == 429:
+            retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+            self.pacer.pause(retry_after)
+        return response
+
+    async def deliver(self, chat_id: Union[int, str], text: str, reply_markup: Optional[Dict[str, Any]] = None):
+        """
+        Send message for queued tasks, raising on failure
+
+        Network errors, 429 and 5xx are retried; other 4xx responses (bad
+        markup, blocked bot, unknown chat) would fail the same way again
+        and raise PermanentTaskError.
+        """
+        if not self.bot_token:
+            raise PermanentTaskError("BOT_TOKEN not configured")
+        try:
+            response = await self._post(chat_id, text, reply_markup)
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Telegram request error: {e}") from e
+        if response.is_success:
+            return
+        error = f"Telegram API error {response.status_code} for chat {chat_id}: {response.text}"
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            raise PermanentTaskError(error)
+        raise RuntimeError(error)
+
+
+def manager_order_keyboard(order_id: int) -> Dict[str, Any]:
+    """Inline keyboard for manager confirm/reject (handled by the bot)"""
+    return {
+        "inline_keyboard": [[
+            {"text": "✅ Підтвердити", "callback_data": f"manager_confirm_{order_id}"},
+            {"text": "❌ Відхилити", "callback_data": f"manager_reject_{order_id}"},
+        ]]
+    }
+
+
+# Global notifier instance
+telegram_notifier = TelegramNotifier(rate=settings.TELEGRAM_NOTIFY_RATE)
+
+
+@task_handler("receipt_validation.notify_customer")
+async def notify_receipt_customer(customer_telegram_id: int, customer_language: str, order_code: str, valid: bool):
+    """Tell the customer the receipt verdict (task queue handler)"""
+    _ = get_translator(customer_language)
+    customer_key = "receipt_validated_notice" if valid else "receipt_rejected_notice"
+    await telegram_notifier.deliver(customer_telegram_id, _.t(customer_key, order_code=html.escape(order_code)))
+
+
+@task_handler("order.notify_expired")
+async def notify_order_expired(customer_telegram_id: int, customer_language: str, order_code: str):
+    """Tell the customer an unpaid order was cancelled (task queue handler)"""
+    _ = get_translator(customer_language)
+    await telegram_notifier.deliver(customer_telegram_id, _.t("order_expired_notice", order_code=html.escape(order_code)))
+
+
+@task_handler("receipt_validation.notify_manager")
+async def notify_receipt_manager(
+    order_id: int,
+    order_code: str,
+    total_amount: float,
+    customer_name: str,
+    customer_phone: str,
+    location_name: str,
+    result: Dict[str, Any],
+    cancelled: bool = False
+):
+    """
+    Post the receipt verdict to the manager channel (task queue handler)
+
+    For an order already cancelled (expired unpaid) the message is
+    informational only, without confirm/reject buttons.
+    """
+    if not settings.MANAGER_CHANNEL_ID:
+        logger.warning("MANAGER_CHANNEL_ID not configured, skipping manager notification")
+        return
+
+    if cancelled:
+        header = "ℹ️ Чек надійшов після скасування замовлення (не оплачено вчасно)"
+    elif result.get("valid"):
+        header = "✅ Чек валідований!"
+    else:
+        header = "❌ Чек не пройшов перевірку"
+    # Text is sent as HTML: every value is escaped (notes come from the LLM)
+    escape = html.escape
+    manager_text = f"{header}\n\n"
+    manager_text += f"🧾 Замовлення #{escape(order_code)}\n"
+    manager_text += f"👤 {escape(customer_name or '')} ({escape(customer_phone or '')})\n"
+    manager_text += f"📍 {escape(location_name)}\n"
+    manager_text += f"💰 Сума: {escape(str(total_amount))} грн\n"
+    if result.get("amount_detected") is not None:
+        manager_text += f"🔎 Сума на чеку: {escape(str(result['amount_detected']))} грн\n"
+    if result.get("confidence") is not None:
+        manager_text += f"🎯 Впевненість: {result['confidence']:.0%}\n"
+    if result.get("notes"):
+        manager_text += f"\n📝 {escape(str(result['notes']))}"
+    if cancelled:
+        verdict = "дійсний" if result.get("valid") else "недійсний"
+        manager_text += f"\n\nЧек {verdict}. Замовлення скасовано, товар повернено в залишки — дій не потрібно."
+
+    await telegram_notifier.deliver(
+        settings.MANAGER_CHANNEL_ID,
+        manager_text,
+        reply_markup=None if cancelled else manager_order_keyboard(order_id)
+    )
@@ -0,0 +1,263 @@
+"""
+WebApp bootstrap
+Everything the WebApp needs to render the order screen, in one response:
+cities, the selected city's pickup locations, categories, the effective
+menu of the pickup location and the user's profile with recent orders.
+
+The public pieces are cached in-process for WEBAPP_BOOTSTRAP_TTL seconds
+(concurrent misses share one query, see app.core.single_flight) and are
+dropped on catalog and location invalidations (app.core.invalidation). The menu
+and the user's data are loaded concurrently, each through its own session.
+
+The response is assembled as JSON bytes: a public prefix per pickup
+location followed by the per-user part. The prefix is gzip-compressed once
+when it is cached, together with the compressor state; a request only
+compresses its own small suffix on a copy of that state.
+
+Effective menu: active products, with the location's LocationProduct row
+applied when there is one (price_override, is_available, stock_quantity).
+Products without a row for the location are offered at base_price.
+Stock left is reported as cached: it may lag by the TTL, reservations at
+order time are authoritative (app.services.stock). Sold out products are
+hidden as soon as the STOCK invalidation arrives.
+"""
+
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import and_, select
+from sqlalchemy.orm import joinedload
+
+from app.config import settings
+from app.core.invalidation import InvalidationTopic, cache_registry
+from app.core.metrics import record_cache
+from app.core.responses import dumps
+from app.core.single_flight import SingleFlight
+from app.database import async_session_maker
+from app.models.location import City, Location
+from app.models.order import Order
+from app.models.product import Category, LocationProduct, Product
+from app.models.user import User
+from app.schemas.category import CategoryResponse
+from app.schemas.location import LocationResponse
+from app.schemas.webapp import CityResponse, MenuProductResponse
+
+logger = logging.getLogger(__name__)
+
+_categories_json = TypeAdapter(List[CategoryResponse])
+_cities_json = TypeAdapter(List[CityResponse])
+_locations_json = TypeAdapter(List[LocationResponse])
+_menu_json = TypeAdapter(List[MenuProductResponse])
+
+
+@dataclass
+class Geo:
+    """Active cities and their pickup locations"""
+    cities: bytes
+    city_ids: List[int]
+    locations: Dict[int, bytes]  # city_id -> JSON list
+    location_city: Dict[int, int]  # location_id -> city_id
+
+
+@dataclass
+class Prefix:
+    """Public part of a bootstrap response, raw and gzip-compressed"""
+    raw: bytes
+    gzip: bytes
+    compressor: Any  # zlib compressor state after `raw`
+
+    def complete(self, suffix: bytes) -> Tuple[bytes, bytes]:
+        """(raw, gzip) bodies of the response ending with `suffix`"""
+        compressor = self.compressor.copy()
+        return self.raw + suffix, self.gzip + compressor.compress(suffix) + compressor.flush()
+
+
+class WebAppBootstrap:
+    """Builds /api/webapp/bootstrap responses from cached pieces"""
+
+    def __init__(self, ttl: float, recent_orders: int = 5, gzip_level: int = 6):
+        self.ttl = ttl
+        self.recent_orders = recent_orders
+        self.gzip_level = gzip_level
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flight = SingleFlight("webapp_bootstrap")
+
+    async def _cached(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._cache.get(key)
+        hit = entry is not None and entry[0] > time.monotonic()
+        record_cache("webapp_bootstrap", hit)
+        if hit:
+            return entry[1]
+
+        async def fetch():
+            value = await load()
+            self._cache[key] = (time.monotonic() + self.ttl, value)
+            return value
+
+        return await self._flight.do(key, fetch)
+
+    def invalidate(self):
+        """Drop all cached pieces (catalog or locations changed)"""
+        self._cache.clear()
+
+    def invalidate_locations(self, location_ids: Optional[List[int]]):
+        """Drop the cached menus of pickup locations (stock changed), all when None"""
+        if location_ids is None:
+            self.invalidate()
+            return
+        for location_id in location_ids:
+            self._cache.pop(("menu", location_id), None)
+            self._cache.pop(("prefix", location_id), None)
+
+    # ==================== Public pieces ====================
+
+    async def _load_geo(self) -> Geo:
+        async with async_session_maker() as session:
+            cities = (await session.execute(
+                select(City).where(City.is_active == True).order_by(City.name)
+            )).scalars().all()
+            locations = (await session.execute(
+                select(Location)
+                .options(joinedload(Location.city))
+                .where(Location.is_active == True)
+                .order_by(Location.name)
+            )).scalars().unique().all()
+
+        by_city: Dict[int, list] = {}
+        for location in locations:
+            by_city.setdefault(location.city_id, []).append(location)
+        return Geo(
+            cities=_cities_json.dump_json([CityResponse.model_validate(city) for city in cities]),
+            city_ids=[city.id for city in cities],
+            locations={
+                city_id: _locations_json.dump_json([LocationResponse.model_validate(loc) for loc in city_locations])
+                for city_id, city_locations in by_city.items()
+            },
+            location_city={location.id: location.city_id for location in locations},
+        )
+
+    async def _load_categories(self) -> bytes:
+        async with async_session_maker() as session:
+            categories = (await session.execute(
+                select(Category).where(Category.is_active == True).order_by(Category.sort_order)
+            )).scalars().all()
+        return _categories_json.dump_json([CategoryResponse.model_validate(cat) for cat in categories])
+
+    async def _load_menu(self, location_id: Optional[int]) -> bytes:
+        query = select(Product, LocationProduct).where(Product.is_active == True).order_by(Product.sort_order)
+        query = query.outerjoin(
+            LocationProduct,
+            and_(LocationProduct.product_id == Product.id, LocationProduct.location_id == location_id),
+        )
+        async with async_session_maker() as session:
+            rows = (await session.execute(query)).all()
+
+        menu = []
+        for product, offer in rows:
+            if offer is not None and (not offer.is_available or offer.stock_quantity == 0):
+                continue
+            price = offer.price_override if offer is not None and offer.price_override is not None else product.base_price
+            stock = offer.stock_quantity if offer is not None else None
+            menu.append(MenuProductResponse.from_product(product, price=price, stock_quantity=stock))
+        return _menu_json.dump_json(menu)
+
+    async def _load_prefix(self, location_id: Optional[int], geo: Geo) -> Prefix:
+        categories, menu = await asyncio.gather(
+            self._cached("categories", self._load_categories),
+            self._cached(("menu", location_id), lambda: self._load_menu(location_id)),
+        )
+        raw = b"".join((
+            b'{"success":true,"data":{"location_id":', dumps(location_id),
+            b',"cities":', geo.cities,
+            b',"categories":', categories,
+            b',"products":', menu,
+            b",",
+        ))
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return Prefix(raw=raw, gzip=compressor.compress(raw), compressor=compressor)
+
+    # ==================== Per-user piece ====================
+
+    async def _load_user(self, telegram_id: Optional[int]) -> Tuple[Optional[dict], List[dict]]:
+        if telegram_id is None:
+            return None, []
+        async with async_session_maker() as session:
+            user = (await session.execute(
+                select(User).where(User.telegram_id == telegram_id)
+            )).scalar_one_or_none()
+            if user is None:
+                return None, []
+            orders = (await session.execute(
+                select(Order).where(Order.user_id == user.id).order_by(Order.created_at.desc()).limit(self.recent_orders)
+            )).scalars().all()
+
+        profile = {
+            "id": user.id,
+            "telegram_id": user.telegram_id,
+            "phone": user.phone,
+            "full_name": user.full_name,
+            "city_id": user.city_id,
+            "language": user.language,
+        }
+        recent_orders = [
+            {
+                "id": order.id,
+                "order_code": order.order_code,
+                "status": order.status.value,
+                "total_amount": float(order.total_amount),
+                "created_at": order.created_at.isoformat(),
+            }
+            for order in orders
+        ]
+        return profile, recent_orders
+
+    # ==================== Response ====================
+
+    async def build(self, telegram_id: Optional[int], location_id: Optional[int]) -> Tuple[bytes, bytes]:
+        """
+        Bootstrap response body for a user and pickup location
+
+        An unknown or inactive location_id is ignored (base menu). The city
+        is the location's, else the user's, else the first active city.
+
+        Returns:
+            (raw JSON, gzip-compressed JSON)
+        """
+        geo = await self._cached("geo", self._load_geo)
+        if location_id not in geo.location_city:
+            location_id = None
+
+        prefix, (user, recent_orders) = await asyncio.gather(
+            self._cached(("prefix", location_id), lambda: self._load_prefix(location_id, geo)),
+            self._load_user(telegram_id),
+        )
+
+        if location_id is not None:
+            city_id = geo.location_city[location_id]
+        elif user is not None and user["city_id"] in geo.city_ids:
+            city_id = user["city_id"]
+        else:
+            city_id = geo.city_ids[0] if geo.city_ids else None
+
+        suffix = b"".join((
+            b'"city_id":', dumps(city_id),
+            b',"locations":', geo.locations.get(city_id, b"[]"),
+            b',"user":', dumps(user),
+            b',"recent_orders":', dumps(recent_orders),
+            b"}}",
+        ))
+        return prefix.complete(suffix)
+
+
+webapp_bootstrap = WebAppBootstrap(
+    ttl=settings.WEBAPP_BOOTSTRAP_TTL,
+    recent_orders=settings.WEBAPP_BOOTSTRAP_RECENT_ORDERS,
+)
+cache_registry.register(InvalidationTopic.CATALOG, lambda keys: webapp_bootstrap.invalidate())
+cache_registry.register(InvalidationTopic.LOCATIONS, lambda keys: webapp_bootstrap.invalidate())
+cache_registry.register(InvalidationTopic.STOCK, webapp_bootstrap.invalidate_locations)
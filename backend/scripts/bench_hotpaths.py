@@ -0,0 +1,384 @@
+"""
+Micro-benchmarks for backend and bot hot paths
+
+Each benchmark is calibrated to run long enough per round (--min-time),
+repeated --rounds times, and reported per call (median, min, mean, stddev
+in microseconds), like pytest-benchmark:
+
+    rate_limit.*        SimpleRateLimiter.is_allowed
+    file_validation.*   magic byte check and full validate_image
+    security.*          Telegram WebApp init data, JWT create/verify
+    i18n.*              Translator.t
+    menu.*              /api/products serialization loop
+    bot.keyboards.*     keyboard builders and caches (needs aiogram)
+
+Results are saved as a JSON baseline and later runs are compared with it;
+the script exits with status 1 when a median got slower than --threshold.
+
+Usage:
+    python scripts/bench_hotpaths.py --save benchmarks/hotpaths.json
+    python scripts/bench_hotpaths.py --compare benchmarks/hotpaths.json --threshold 0.15
+    python scripts/bench_hotpaths.py -k security --rounds 20
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+BACKEND_DIR = Path(__file__).parent.parent
+BOT_DIR = BACKEND_DIR.parent / "telegram_bot"
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+class Benchmark:
+    def __init__(self, name: str, side: str, setup: Callable[[], Callable[[], object]]):
+        self.name = name
+        self.side = side
+        self.setup = setup
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, side: str = "backend"):
+    """
+    Register a setup function returning the zero-argument call to time
+
+    Bot benchmarks run in a separate process: the bot and the backend both
+    register Prometheus metrics with the same names.
+    """
+    def decorator(setup):
+        BENCHMARKS.append(Benchmark(name, side, setup))
+        return setup
+    return decorator
+
+
+def async_runner(make_coroutine: Callable[[], object]) -> Callable[[], object]:
+    """Run a coroutine per call on a private event loop (loop overhead included)"""
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(make_coroutine())
+
+
+# ==================== Backend ====================
+
+@benchmark("rate_limit.is_allowed[allowed]")
+def bench_rate_limit_allowed():
+    from app.core.rate_limit import SimpleRateLimiter
+    limiter = SimpleRateLimiter()
+    # Tiny window keeps the per-key list short, so every call is allowed
+    return lambda: limiter.is_allowed("10.0.0.1", 100, 0.000001)
+
+
+@benchmark("rate_limit.is_allowed[limited]")
+def bench_rate_limit_limited():
+    from app.core.rate_limit import SimpleRateLimiter
+    limiter = SimpleRateLimiter()
+    for _ in range(100):
+        limiter.is_allowed("10.0.0.2", 100, 3600)
+    return lambda: limiter.is_allowed("10.0.0.2", 100, 3600)
+
+
+SAMPLE_JPEG = b"\xFF\xD8\xFF\xE0" + b"\x00" * (512 * 1024)
+
+
+@benchmark("file_validation.signature[jpeg]")
+def bench_signature_jpeg():
+    from app.core.file_validation import FileValidator
+    return lambda: FileValidator._verify_image_signature(SAMPLE_JPEG)
+
+
+@benchmark("file_validation.signature[invalid]")
+def bench_signature_invalid():
+    from app.core.file_validation import FileValidator
+    content = b"%PDF-1.7" + b"\x00" * (512 * 1024)
+    return lambda: FileValidator._verify_image_signature(content)
+
+
+@benchmark("file_validation.validate_image[512KB]")
+def bench_validate_image():
+    from fastapi import UploadFile
+    from starlette.datastructures import Headers
+    from app.core.file_validation import FileValidator
+
+    upload = UploadFile(
+        file=io.BytesIO(SAMPLE_JPEG),
+        filename="receipt.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+    return async_runner(lambda: FileValidator.validate_image(upload))
+
+
+BOT_TOKEN = "123456:bench-token"
+
+
+def signed_init_data(bot_token: str) -> str:
+    fields = {
+        "query_id": "AAHdF6IQAAAAAN0XohDhrOrc",
+        "user": json.dumps({"id": 279058397, "first_name": "Taras", "language_code": "uk"}),
+        "auth_date": str(int(time.time())),
+    }
+    data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+    fields["hash"] = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode(fields)
+
+
+@benchmark("security.validate_telegram_webapp_data")
+def bench_webapp_data():
+    from app.core.security import validate_telegram_webapp_data
+    init_data = signed_init_data(BOT_TOKEN)
+    assert validate_telegram_webapp_data(init_data, BOT_TOKEN)
+    return lambda: validate_telegram_webapp_data(init_data, BOT_TOKEN)
+
+
+@benchmark("security.create_access_token")
+def bench_create_token():
+    from app.core.security import create_access_token
+    return lambda: create_access_token({"sub": "42", "telegram_id": 279058397, "is_admin": True})
+
+
+@benchmark("security.verify_token")
+def bench_verify_token():
+    from app.core.security import create_access_token, verify_token
+    token = create_access_token({"sub": "42", "telegram_id": 279058397, "is_admin": True})
+    return lambda: verify_token(token)
+
+
+@benchmark("i18n.translator.t[plain]")
+def bench_translate_plain():
+    from app.core.i18n import get_translator
+    translator = get_translator("uk")
+    return lambda: translator.t("welcome")
+
+
+@benchmark("i18n.translator.t[format]")
+def bench_translate_format():
+    from app.core.i18n import get_translator
+    translator = get_translator("en")
+    return lambda: translator.t("bot.orders.item", emoji="🕐", order_code="123456", total_amount=420.5, status="paid")
+
+
+@benchmark("menu.get_products[100 products]")
+def bench_products():
+    from bench_serialization import make_products, new_products
+    products = make_products(100)
+    return lambda: new_products(products)
+
+
+# ==================== Bot ====================
+
+@lru_cache(maxsize=None)
+def import_bot_keyboards():
+    """Import bot keyboards with a minimal environment (None if the bot cannot be imported)"""
+    os.environ.setdefault("BOT_TOKEN", BOT_TOKEN)
+    os.environ.setdefault("MANAGER_CHANNEL_ID", "-1001")
+    os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+    if str(BOT_DIR) not in sys.path:
+        sys.path.append(str(BOT_DIR))
+    try:
+        from keyboards import main_menu
+        from services.i18n import catalog as bot_catalog
+    except (ImportError, ValueError) as e:
+        # Missing bot dependencies or settings
+        print(f"Skipping bot benchmarks: {e}")
+        return None
+    # What the bot gets from GET /api/i18n/catalog
+    from app.core.i18n import catalog
+    bot_catalog.load(catalog.texts)
+    main_menu.build_static_keyboards()
+    return main_menu
+
+
+CITIES = [{"id": i, "name": f"Місто {i}"} for i in range(1, 41)]
+
+
+@benchmark("bot.keyboards.main_menu[prebuilt]", side="bot")
+def bench_main_menu():
+    keyboards = import_bot_keyboards()
+    return keyboards and (lambda: keyboards.get_main_menu_keyboard("uk"))
+
+
+@benchmark("bot.keyboards.main_menu[build]", side="bot")
+def bench_main_menu_build():
+    keyboards = import_bot_keyboards()
+    return keyboards and (lambda: keyboards._build_main_menu("uk"))
+
+
+@benchmark("bot.keyboards.order_actions[cached texts]", side="bot")
+def bench_order_actions():
+    keyboards = import_bot_keyboards()
+    return keyboards and (lambda: keyboards.get_order_actions_keyboard(123456, "uk"))
+
+
+@benchmark("bot.keyboards.manager_order[cached texts]", side="bot")
+def bench_manager_order():
+    keyboards = import_bot_keyboards()
+    return keyboards and (lambda: keyboards.get_manager_order_keyboard(123456, "uk"))
+
+
+@benchmark("bot.keyboards.cities[40 cities, cached]", side="bot")
+def bench_cities_cached():
+    keyboards = import_bot_keyboards()
+    return keyboards and (lambda: keyboards.get_cities_keyboard(CITIES, "uk", page=2))
+
+
+@benchmark("bot.keyboards.cities[40 cities, build]", side="bot")
+def bench_cities_build():
+    keyboards = import_bot_keyboards()
+    return keyboards and (lambda: keyboards._build_paginated_keyboard(CITIES, "city_", "cities_page_", 2))
+
+
+# ==================== Runner ====================
+
+def calibrate(func: Callable[[], object], min_time: float) -> int:
+    """Smallest power-of-ten iteration count taking at least min_time"""
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        if time.perf_counter() - started >= min_time or iterations >= 10**7:
+            return iterations
+        iterations *= 10
+
+
+def measure(func: Callable[[], object], rounds: int, min_time: float) -> dict:
+    """Per-call timings in microseconds"""
+    func()  # warm up caches and lazy imports
+    iterations = calibrate(func, min_time)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    return {
+        "median_us": round(statistics.median(samples), 4),
+        "min_us": round(min(samples), 4),
+        "mean_us": round(statistics.mean(samples), 4),
+        "stddev_us": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+        "rounds": rounds,
+        "iterations": iterations,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print changes against baseline, return names slower than threshold"""
+    regressions = []
+    print(f"\n{'benchmark':44} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:44} {'-':>12} {stats['median_us']:>12.3f} {'new':>8}")
+            continue
+        change = stats["median_us"] / previous["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:44} {previous['median_us']:>12.3f} {stats['median_us']:>12.3f} {change:>+8.1%}{flag}")
+    for name in baseline:
+        if name not in results:
+            print(f"{name:44} {baseline[name]['median_us']:>12.3f} {'-':>12} {'missing':>8}")
+    return regressions
+
+
+def run_side(side: str, pattern: Optional[str], rounds: int, min_time: float, verbose: bool) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    for bench in BENCHMARKS:
+        if bench.side != side or (pattern and pattern not in bench.name):
+            continue
+        func = bench.setup()
+        if not func:
+            continue
+        results[bench.name] = measure(func, rounds, min_time)
+        if verbose:
+            print_result(bench.name, results[bench.name])
+    return results
+
+
+def run_bot_side(args) -> Dict[str, dict]:
+    """Run bot benchmarks in a child process, results come back as JSON"""
+    command = [sys.executable, __file__, "--side", "bot", "--rounds", str(args.rounds), "--min-time", str(args.min_time)]
+    if args.pattern:
+        command += ["-k", args.pattern]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        print(f"Bot benchmarks failed:\n{completed.stderr}")
+        return {}
+    results = json.loads(completed.stdout.strip().splitlines()[-1])
+    for name, stats in results.items():
+        print_result(name, stats)
+    return results
+
+
+def print_result(name: str, stats: dict):
+    print(
+        f"{name:44} {stats['median_us']:>12.3f} {stats['min_us']:>10.3f} "
+        f"{stats['stddev_us']:>9.3f} {stats['iterations']:>11}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for backend and bot hot paths")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    parser.add_argument("--save", help="Write results as JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed median slowdown (0.15 = 15%%)")
+    parser.add_argument("--side", choices=["backend", "bot"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.side:
+        # Child process: print results of one side as JSON only
+        results = run_side(args.side, args.pattern, args.rounds, args.min_time, verbose=False)
+        print(json.dumps(results))
+        return
+
+    print(f"{'benchmark':44} {'median us':>12} {'min us':>10} {'stddev':>9} {'iterations':>11}")
+    results = run_side("backend", args.pattern, args.rounds, args.min_time, verbose=True)
+    results.update(run_bot_side(args))
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({
+                "machine": {
+                    "python": platform.python_version(),
+                    "implementation": platform.python_implementation(),
+                    "platform": platform.platform(),
+                    "processor": platform.processor() or platform.machine(),
+                },
+                "benchmarks": results,
+            }, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["benchmarks"]
+        if args.pattern:
+            baseline = {name: stats for name, stats in baseline.items() if args.pattern in name}
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
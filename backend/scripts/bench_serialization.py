@@ -0,0 +1,244 @@
+"""
+Serialization benchmark for the largest JSON endpoints
+
+Compares the old path (hand-built dicts with .isoformat(), FastAPI's
+jsonable_encoder and the stdlib JSONResponse) with the new one (typed
+response models rendered by FastJSONResponse) for:
+
+    /api/analytics/interactions?limit=1000
+    /api/admin/products
+    /api/products
+
+Only serialization is measured: rows are transient ORM instances built in
+memory, so no database is needed.
+
+Usage:
+    python scripts/bench_serialization.py --products 300 --repeat 200
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.models.bot_interaction import BotInteraction
+from app.models.product import Product
+from app.schemas.analytics import InteractionResponse, InteractionListResponse
+from app.schemas.product import ProductResponse, ProductListResponse, AdminProductResponse
+
+
+def make_interactions(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        BotInteraction(
+            id=i,
+            created_at=now - timedelta(seconds=i),
+            user_id=i % 500,
+            telegram_id=100000000 + i % 500,
+            interaction_type="command" if i % 3 else "callback_query",
+            command="/menu" if i % 3 else None,
+            message_text="🍕 Меню",
+            callback_data=None if i % 3 else f"order_details_{i}",
+            bot_response="🍕 Виберіть піцу з нашого меню",
+            fsm_state=None,
+            is_successful=True,
+            error_message=None,
+        )
+        for i in range(count)
+    ]
+
+
+def make_products(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        Product(
+            id=i,
+            category_id=i % 5 + 1,
+            name=f"Піца #{i}",
+            description="Томатний соус, моцарела, базилік",
+            image_url=f"/uploads/products/{i}.webp",
+            base_price=Decimal("189.00") + i,
+            is_active=True,
+            sort_order=i,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+# ==================== Old serialization ====================
+
+def old_interactions(interactions) -> bytes:
+    content = {
+        "count": len(interactions),
+        "interactions": [
+            {
+                "id": interaction.id,
+                "timestamp": interaction.created_at.isoformat(),
+                "user_id": interaction.user_id,
+                "telegram_id": interaction.telegram_id,
+                "type": interaction.interaction_type,
+                "command": interaction.command,
+                "message_text": interaction.message_text,
+                "callback_data": interaction.callback_data,
+                "bot_response": interaction.bot_response,
+                "fsm_state": interaction.fsm_state,
+                "is_successful": interaction.is_successful,
+                "error_message": interaction.error_message
+            }
+            for interaction in interactions
+        ]
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def old_admin_products(products) -> bytes:
+    content = [
+        {
+            "id": p.id,
+            "category_id": p.category_id,
+            "name": p.name,
+            "description": p.description,
+            "base_price": float(p.base_price),
+            "image_url": p.image_url,
+            "is_active": p.is_active,
+            "sort_order": p.sort_order,
+            "created_at": p.created_at.isoformat(),
+        }
+        for p in products
+    ]
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def old_products(products) -> bytes:
+    content = {
+        "success": True,
+        "data": [
+            {
+                "id": p.id,
+                "product_id": None,
+                "category_id": p.category_id,
+                "name": p.name,
+                "description": p.description,
+                "base_price": float(p.base_price),
+                "photo_url": p.image_url,
+                "options": None,
+                "is_available": p.is_active,
+                "display_order": p.sort_order or 0,
+                "created_at": p.created_at,
+                "updated_at": p.updated_at,
+            }
+            for p in products
+        ]
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+# ==================== New serialization ====================
+
+def new_interactions(interactions) -> bytes:
+    return FastJSONResponse(InteractionListResponse(
+        count=len(interactions),
+        interactions=[InteractionResponse.model_validate(interaction) for interaction in interactions]
+    )).body
+
+
+def new_admin_products(products) -> bytes:
+    return FastJSONResponse([AdminProductResponse.model_validate(p) for p in products]).body
+
+
+def new_products(products) -> bytes:
+    return FastJSONResponse(ProductListResponse(
+        data=[
+            ProductResponse(
+                id=p.id,
+                category_id=p.category_id,
+                name=p.name,
+                description=p.description,
+                base_price=p.base_price,
+                photo_url=p.image_url,
+                is_available=p.is_active,
+                display_order=p.sort_order or 0,
+                created_at=p.created_at,
+                updated_at=p.updated_at,
+            )
+            for p in products
+        ]
+    )).body
+
+
+def same_shape(old_body: bytes, new_body: bytes) -> bool:
+    """Both paths must produce documents with the same structure"""
+    def shape(value):
+        if isinstance(value, dict):
+            return {key: shape(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [shape(value[0])] * len(value) if value else []
+        return None
+    return shape(json.loads(old_body)) == shape(json.loads(new_body))
+
+
+def measure(func, rows, repeat: int) -> dict:
+    """Run func(rows) repeat times, return timings in milliseconds"""
+    func(rows)  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func(rows)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of large endpoints")
+    parser.add_argument("--interactions", type=int, default=1000, help="Rows for /analytics/interactions")
+    parser.add_argument("--products", type=int, default=200, help="Rows for product endpoints")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--json", dest="json_output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    interactions = make_interactions(args.interactions)
+    products = make_products(args.products)
+
+    cases = [
+        ("/api/analytics/interactions", interactions, old_interactions, new_interactions),
+        ("/api/admin/products", products, old_admin_products, new_admin_products),
+        ("/api/products", products, old_products, new_products),
+    ]
+
+    results = {}
+    print(f"{'endpoint':32} {'rows':>6} {'old ms':>9} {'new ms':>9} {'speedup':>8}")
+    for endpoint, rows, old, new in cases:
+        assert same_shape(old(rows), new(rows)), f"{endpoint}: old and new documents differ"
+
+        old_result = measure(old, rows, args.repeat)
+        new_result = measure(new, rows, args.repeat)
+        speedup = old_result["median_ms"] / new_result["median_ms"] if new_result["median_ms"] else 0
+        results[endpoint] = {"rows": len(rows), "old": old_result, "new": new_result, "speedup": round(speedup, 2)}
+        print(
+            f"{endpoint:32} {len(rows):>6} {old_result['median_ms']:>9.3f} "
+            f"{new_result['median_ms']:>9.3f} {speedup:>7.2f}x"
+        )
+
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold start benchmark for the backend process
+
+Starts a fresh interpreter for every run (like a new autoscaled worker)
+and measures:
+    import_ms   - importing app.main (building routes and models)
+    startup_ms  - running the lifespan startup (DB schema handling)
+    process_ms  - total wall time of the child process
+
+for each combination of DB_STARTUP_MODE and LAZY_ROUTERS.
+
+Usage:
+    python scripts/bench_startup.py --runs 5              # import only
+    python scripts/bench_startup.py --runs 5 --with-db    # needs DATABASE_URL
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+CHILD = """
+import asyncio, json, logging, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+logging.disable(logging.CRITICAL)
+
+startup = None
+if sys.argv[1] == "1":
+    async def run():
+        begin = time.perf_counter()
+        async with app.router.lifespan_context(app):
+            ready = time.perf_counter()
+        return ready - begin
+    startup = asyncio.run(run())
+
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": startup * 1000 if startup is not None else None,
+}))
+"""
+
+
+def run_child(env_overrides: dict, with_db: bool) -> dict:
+    env = {**os.environ, **env_overrides, "DEBUG": "false"}
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD, "1" if with_db else "0"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Child failed with {env_overrides}:\n{completed.stderr}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = elapsed
+    return result
+
+
+def summarize(values: list) -> dict:
+    return {
+        "median": round(statistics.median(values), 1),
+        "min": round(min(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--with-db", action="store_true", help="Also run lifespan startup against DATABASE_URL")
+    parser.add_argument("--json", dest="json_output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    modes = ["verify", "create_all"] if args.with_db else ["skip"]
+    results = {}
+
+    print(f"{'case':32} {'import ms':>10} {'startup ms':>11} {'process ms':>11}")
+    for mode in modes:
+        for lazy in ("false", "true"):
+            case = f"mode={mode} lazy={lazy}"
+            runs = [
+                run_child({"DB_STARTUP_MODE": mode, "LAZY_ROUTERS": lazy}, args.with_db)
+                for _ in range(args.runs)
+            ]
+            summary = {
+                "import_ms": summarize([run["import_ms"] for run in runs]),
+                "process_ms": summarize([run["process_ms"] for run in runs]),
+            }
+            if args.with_db:
+                summary["startup_ms"] = summarize([run["startup_ms"] for run in runs])
+            results[case] = summary
+
+            startup = summary["startup_ms"]["median"] if args.with_db else "-"
+            print(
+                f"{case:32} {summary['import_ms']['median']:>10} "
+                f"{startup:>11} {summary['process_ms']['median']:>11}"
+            )
+
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Query budget check for the hot endpoints
+
+Calls each endpoint once in-process, with cold caches so the database path
+is what gets measured, and fails (exit status 1) when a response reports
+more SQL statements (X-Query-Count) than the endpoint's budget. An N+1
+added to one of these routes breaks the check instead of only showing up
+in the QUERY_COUNT_WARN log.
+
+The order scenario creates a real 3-item order for a synthetic customer
+and cancels it again (stock and kitchen slot are given back), so run it
+against a development database, e.g. after scripts/seed_data.py.
+
+Usage:
+    python scripts/check_query_budgets.py
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ["QUERY_STATS_ENABLED"] = "true"
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+
+import httpx
+
+from app.core.query_stats import QUERY_COUNT_HEADER, TooManyQueries, assert_response_max_queries
+from app.database import close_db
+from app.main import app
+from app.models.order import OrderStatus
+
+# Statements per request, cold caches. A budget stays the same whatever the
+# catalog or cart size: only a fixed number of queries is expected
+QUERY_BUDGETS = {
+    "GET /api/products": 2,
+    "GET /api/webapp/bootstrap": 8,
+    "POST /api/orders/create": 14,
+}
+
+# Synthetic customer, far above real Telegram ids
+TELEGRAM_ID = 8_999_999_999
+
+
+def check(response: httpx.Response, label: str) -> bool:
+    response.raise_for_status()
+    budget = QUERY_BUDGETS[label]
+    try:
+        assert_response_max_queries(response, budget)
+    except TooManyQueries as e:
+        print(f"✗ {label:32} {e}")
+        return False
+    print(f"✓ {label:32} {response.headers[QUERY_COUNT_HEADER]} queries (budget {budget})")
+    return True
+
+
+async def run() -> int:
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget-check") as client:
+        response = await client.get("/api/products")
+        failures += not check(response, "GET /api/products")
+        products = response.json()["data"][:3]
+
+        locations = (await client.get("/api/pickup-locations")).json()["data"]
+        if not products or not locations:
+            raise RuntimeError("No products or pickup locations, seed the database first (scripts/seed_data.py)")
+        location_id = locations[0]["id"]
+
+        (await client.post("/api/users", json={
+            "telegram_id": TELEGRAM_ID,
+            "phone": f"+380{TELEGRAM_ID % 10**9:09d}",
+            "full_name": "Query Budget Check",
+        })).raise_for_status()
+
+        response = await client.get("/api/webapp/bootstrap", params={
+            "telegram_id": TELEGRAM_ID, "location_id": location_id
+        })
+        failures += not check(response, "GET /api/webapp/bootstrap")
+
+        items = [
+            {
+                "product_id": product["id"],
+                "quantity": 1,
+                "unit_price": product["base_price"],
+                "total_price": product["base_price"],
+            }
+            for product in products
+        ]
+        response = await client.post("/api/orders/create", headers={"Idempotency-Key": os.urandom(16).hex()}, json={
+            "telegram_id": TELEGRAM_ID,
+            "location_id": location_id,
+            "items": items,
+            "total_amount": sum(item["total_price"] for item in items),
+        })
+        failures += not check(response, "POST /api/orders/create")
+
+        order_id = response.json()["order"]["id"]
+        await client.put(f"/api/admin/orders/{order_id}/status", data={"status": OrderStatus.CANCELLED.value})
+
+    await close_db()
+    return failures
+
+
+def main():
+    failures = asyncio.run(run())
+    if failures:
+        print(f"\n{failures} endpoint(s) over their query budget")
+        sys.exit(1)
+    print("\nAll endpoints within their query budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+EXPLAIN check for the analytics, journey and order list queries
+
+Builds the same SQLAlchemy queries the routes run, EXPLAINs them and fails
+(exit status 1) when a query does not use the index it was designed for
+(see alembic revision e3f4a5b6c7d8). Run it against realistic volumes,
+e.g. after scripts/generate_data.py, since on tiny tables a sequential scan
+is the right plan; --no-seqscan checks index usability on a small database.
+
+Usage:
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py --no-seqscan --verbose
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Set
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import and_, desc, func, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.database import engine
+from app.models.bot_interaction import BotInteraction, SupportMessage, UserSession
+from app.models.order import Order, OrderStatus
+
+
+def query_shapes(user_id: int, telegram_id: int, start_date: datetime) -> List[tuple]:
+    """(name, statement, expected index) per query shape"""
+    return [
+        # /analytics/dashboard
+        ("dashboard.orders_by_status",
+         select(func.count(Order.id)).where(and_(Order.created_at >= start_date, Order.status == OrderStatus.PAID)),
+         "ix_orders_status_created_at"),
+        ("dashboard.support_opened",
+         select(func.count(SupportMessage.id)).where(
+             and_(SupportMessage.created_at >= start_date, SupportMessage.sender_type == "user")),
+         "ix_support_messages_created_at_user"),
+        ("dashboard.support_closed",
+         select(func.count(func.distinct(SupportMessage.ticket_id))).where(
+             and_(SupportMessage.created_at >= start_date, SupportMessage.status == "closed")),
+         "ix_support_messages_status_created_at"),
+        ("dashboard.top_commands",
+         select(BotInteraction.command, func.count(BotInteraction.id).label("count"))
+         .where(and_(BotInteraction.created_at >= start_date, BotInteraction.command.isnot(None)))
+         .group_by(BotInteraction.command).order_by(desc("count")).limit(10),
+         "ix_bot_interactions_command_created_at"),
+        ("dashboard.menu_views",
+         select(func.count(BotInteraction.id)).where(
+             and_(BotInteraction.created_at >= start_date, BotInteraction.command == "/menu")),
+         "ix_bot_interactions_command_created_at"),
+
+        # /analytics/interactions, /analytics/sessions, /analytics/support-messages
+        ("interactions.by_telegram_id",
+         select(BotInteraction).where(BotInteraction.created_at >= start_date)
+         .where(BotInteraction.telegram_id == telegram_id)
+         .order_by(desc(BotInteraction.created_at)).limit(100),
+         "ix_bot_interactions_telegram_id_created_at"),
+        ("interactions.by_user_id",
+         select(BotInteraction).where(BotInteraction.created_at >= start_date)
+         .where(BotInteraction.user_id == user_id)
+         .order_by(desc(BotInteraction.created_at)).limit(100),
+         "ix_bot_interactions_user_id_created_at"),
+        ("sessions.by_user_id",
+         select(UserSession).where(UserSession.session_start >= start_date)
+         .where(UserSession.user_id == user_id)
+         .order_by(desc(UserSession.session_start)).limit(100),
+         "ix_user_sessions_user_id_session_start"),
+        ("support.by_status",
+         select(SupportMessage).where(SupportMessage.created_at >= start_date)
+         .where(SupportMessage.status == "open")
+         .order_by(desc(SupportMessage.created_at)).limit(100),
+         "ix_support_messages_status_created_at"),
+
+        # /analytics/user-journey/{telegram_id}
+        ("journey.sessions",
+         select(UserSession).where(and_(UserSession.telegram_id == telegram_id, UserSession.session_start >= start_date))
+         .order_by(desc(UserSession.session_start)),
+         "ix_user_sessions_telegram_id_session_start"),
+        ("journey.interactions",
+         select(BotInteraction).where(and_(BotInteraction.telegram_id == telegram_id, BotInteraction.created_at >= start_date))
+         .order_by(desc(BotInteraction.created_at)).limit(200),
+         "ix_bot_interactions_telegram_id_created_at"),
+        ("journey.orders",
+         select(Order).where(and_(Order.user_id == user_id, Order.created_at >= start_date))
+         .order_by(desc(Order.created_at)),
+         "ix_orders_user_id_created_at"),
+        ("journey.support",
+         select(SupportMessage).where(and_(SupportMessage.telegram_id == telegram_id, SupportMessage.created_at >= start_date))
+         .order_by(desc(SupportMessage.created_at)),
+         "ix_support_messages_telegram_id_created_at"),
+
+        # Bot "my orders", admin order list
+        ("bot.user_orders",
+         select(Order).where(Order.user_id == user_id).order_by(Order.created_at.desc()).limit(10),
+         "ix_orders_user_id_created_at"),
+        ("admin.orders_by_status",
+         select(Order).where(Order.status == OrderStatus.PENDING).order_by(Order.created_at.desc()).limit(50),
+         "ix_orders_status_created_at"),
+    ]
+
+
+def index_names(plan: dict) -> Set[str]:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+
+def plan_summary(plan: dict, depth: int = 0) -> List[str]:
+    label = plan["Node Type"]
+    if "Index Name" in plan:
+        label += f" using {plan['Index Name']}"
+    elif "Relation Name" in plan:
+        label += f" on {plan['Relation Name']}"
+    lines = [f"{'  ' * depth}{label} (cost {plan['Total Cost']:.0f})"]
+    for child in plan.get("Plans", []):
+        lines += plan_summary(child, depth + 1)
+    return lines
+
+
+async def check(days: int, no_seqscan: bool, verbose: bool) -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        sample = (await conn.execute(text(
+            "SELECT user_id, telegram_id FROM bot_interactions "
+            "WHERE user_id IS NOT NULL ORDER BY id DESC LIMIT 1"
+        ))).first()
+        user_id, telegram_id = sample if sample else (1, 1)
+
+        if no_seqscan:
+            await conn.execute(text("SET enable_seqscan = off"))
+
+        start_date = datetime.utcnow() - timedelta(days=days)
+        for name, statement, expected in query_shapes(user_id, telegram_id, start_date):
+            sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            document = result.scalar()
+            plan = (json.loads(document) if isinstance(document, str) else document)[0]["Plan"]
+            used = index_names(plan)
+            ok = expected in used
+            failures += not ok
+            print(f"{'✓' if ok else '✗'} {name:32} {expected if ok else 'expected ' + expected + ', used ' + (', '.join(sorted(used)) or 'no index')}")
+            if verbose or not ok:
+                for line in plan_summary(plan):
+                    print(f"      {line}")
+    await engine.dispose()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check query plans use the composite/partial indexes")
+    parser.add_argument("--days", type=int, default=30, help="Time range used by the queries")
+    parser.add_argument("--no-seqscan", action="store_true", help="Disable sequential scans (small databases)")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    failures = asyncio.run(check(args.days, args.no_seqscan, args.verbose))
+    if failures:
+        print(f"\n{failures} query shape(s) not using their index")
+        sys.exit(1)
+    print("\nAll query shapes use their index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Local fake n8n for testing the asynchronous receipt validation loop
+
+Accepts the bot's /webhook/validate-receipt trigger, answers immediately
+and, after a short delay, POSTs a signed verdict to the callback URL -
+exactly like the real GPT-4o workflow, but without n8n or OpenAI.
+
+Usage:
+    N8N_WEBHOOK_SECRET=secret python scripts/fake_n8n.py --port 5678 --verdict valid
+
+Then point the bot at it with N8N_URL=http://localhost:5678
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.core.security import compute_webhook_signature
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - fake-n8n - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def build_verdict(payload: dict, mode: str) -> dict:
+    """Build a GPT-4o-like verdict for the received order"""
+    expected_amount = float(payload.get("expected_amount") or 0)
+    valid = mode == "valid" or (mode == "random" and random.random() < 0.8)
+    detected = expected_amount if valid else round(expected_amount * 0.5, 2)
+    return {
+        "valid": valid,
+        "amount_detected": detected,
+        "amount_matches": valid,
+        "date_valid": True,
+        "readable": True,
+        "merchant": "Fake Bank",
+        "confidence": 0.97 if valid else 0.41,
+        "notes": f"fake-n8n verdict for order {payload.get('order_code')}",
+    }
+
+
+async def post_verdict(callback_url: str, verdict: dict, secret: str, delay: float):
+    """Deliver signed verdict to backend after simulated LLM latency"""
+    await asyncio.sleep(delay)
+    body = json.dumps(verdict).encode()
+    timestamp = str(int(time.time()))
+    headers = {
+        "Content-Type": "application/json",
+        "X-Signature": compute_webhook_signature(body, timestamp, secret),
+        "X-Signature-Timestamp": timestamp,
+    }
+    try:
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.post(callback_url, content=body, headers=headers)
+        logger.info(f"Callback {callback_url} -> {response.status_code} {response.text}")
+    except Exception as e:
+        logger.error(f"Callback {callback_url} failed: {e}")
+
+
+def create_app(mode: str, delay: float, secret: str) -> web.Application:
+    """Create fake n8n application"""
+    background_tasks = set()
+
+    async def validate_receipt(request: web.Request) -> web.Response:
+        payload = await request.json()
+        callback_url = payload.get("callback_url")
+        if not callback_url:
+            return web.json_response({"error": "callback_url is required"}, status=400)
+
+        logger.info(f"Received validation request for order {payload.get('order_id')}")
+        task = asyncio.create_task(
+            post_verdict(callback_url, build_verdict(payload, mode), secret, delay)
+        )
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+        return web.json_response({"accepted": True})
+
+    async def accept(request: web.Request) -> web.Response:
+        return web.json_response({"accepted": True})
+
+    app = web.Application()
+    app.router.add_post("/webhook/validate-receipt", validate_receipt)
+    app.router.add_post("/webhook/notify-manager", accept)
+    app.router.add_post("/webhook/analytics-event", accept)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake n8n for local testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5678)
+    parser.add_argument("--verdict", choices=["valid", "invalid", "random"], default="valid")
+    parser.add_argument("--delay", type=float, default=2.0, help="Simulated LLM latency, seconds")
+    args = parser.parse_args()
+
+    if not settings.N8N_WEBHOOK_SECRET:
+        parser.error("N8N_WEBHOOK_SECRET must be set to sign callbacks")
+
+    app = create_app(args.verdict, args.delay, settings.N8N_WEBHOOK_SECRET)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+Production-size synthetic data generator
+
+Streams users, orders, order_items, user_sessions, bot_interactions and
+support_messages into Postgres with binary COPY (asyncpg
+copy_records_to_table), so analytics and listing queries, benchmarks and
+index work can run against realistic volumes. Rows are generated lazily
+and never held in memory as a whole.
+
+Catalog tables (cities, locations, products) must be seeded first, e.g.
+with scripts/seed_data.py; generated rows reference them.
+
+Distributions (all configurable):
+    - users register over --days, more of them recently (growth)
+    - orders and sessions per user are heavy tailed (Pareto, --skew):
+      a few regulars order a lot, most customers order once or twice
+    - activity follows lunch/dinner peaks of the day
+    - order status follows --status-mix, newest orders are still open
+    - sessions have --interactions-per-session interactions on average
+
+Ids are assigned here (after the current MAX(id)) so child rows can
+reference parents without RETURNING; sequences are moved past them at the
+end. Child rows are regenerated from a per-parent seed, so the same --seed
+gives the same data.
+
+orders.order_code is a unique 6-digit code, so at most 1,000,000 orders can
+exist in total; keep the total well below that, or the API's random code
+generator slows down.
+
+Usage:
+    python scripts/generate_data.py --users 100000
+    python scripts/generate_data.py --users 500000 --orders-per-user 1.5 --sessions-per-user 8 \\
+        --days 365 --status-mix COMPLETED=80,CANCELLED=10,CONFIRMED=4,PAID=3,PENDING=3
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import asyncpg
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+
+# Synthetic users get ids far from real Telegram ids (load_test.py uses 9e9+)
+TELEGRAM_ID_BASE = 8_000_000_000
+
+ORDER_CODE_SPACE = 1_000_000
+
+FIRST_NAMES = [
+    "Олександр", "Андрій", "Дмитро", "Максим", "Іван", "Сергій", "Артем", "Богдан", "Тарас", "Назар",
+    "Олена", "Марія", "Анна", "Юлія", "Ірина", "Катерина", "Софія", "Наталія", "Тетяна", "Оксана",
+]
+LAST_NAMES = [
+    "Шевченко", "Бондаренко", "Коваленко", "Ткаченко", "Кравченко", "Олійник", "Шевчук", "Коваль",
+    "Поліщук", "Бойко", "Мельник", "Лисенко", "Марченко", "Руденко", "Савченко", "Петренко",
+]
+
+LANGUAGES = (["uk", "ru", "en"], [80, 15, 5])
+PLATFORMS = (["android", "ios", "desktop", "web"], [55, 35, 7, 3])
+
+# Share of activity per hour of day (lunch and dinner peaks)
+HOUR_WEIGHTS = [
+    1, 0.5, 0.3, 0.2, 0.2, 0.3, 1, 2, 3, 4, 5, 8,
+    12, 12, 8, 5, 5, 7, 11, 12, 10, 7, 4, 2,
+]
+HOURS = list(range(24))
+
+INTERACTION_TYPES = (
+    ["message", "callback_query", "command", "webapp_data", "photo"],
+    [40, 35, 15, 5, 5],
+)
+COMMANDS = ["/start", "/menu", "/orders", "/help", "/support"]
+MESSAGE_TEXTS = ["🍕 Меню", "📋 Мої замовлення", "💬 Підтримка", "⚙️ Налаштування", "Дякую!", "Коли буде готово?"]
+CALLBACKS = ["order_details", "cancel_order", "upload_receipt", "confirm", "lang_uk"]
+FSM_STATES = [None, None, None, "OrderStates:waiting_for_receipt", "SupportStates:waiting_for_message"]
+META_DATA = [None, None, json.dumps({"source": "keyboard"}), json.dumps({"webapp": "cart", "items": 2})]
+
+ITEM_OPTIONS = [
+    None,
+    json.dumps({"size": "30см"}, ensure_ascii=False),
+    json.dumps({"size": "40см", "extras": ["Сир"]}, ensure_ascii=False),
+    json.dumps({"size": "30см", "extras": ["Гриби", "Бекон"]}, ensure_ascii=False),
+]
+OPTION_PRICES = [Decimal("0"), Decimal("0"), Decimal("40.00"), Decimal("70.00")]
+RECEIPT_RESULT = json.dumps({"valid": True, "amount_matches": True, "confidence": 0.96, "merchant": "Monobank"})
+
+SUPPORT_TEXTS = [
+    "Де моє замовлення?", "Не можу завантажити чек", "Хочу змінити адресу самовивозу",
+    "Піца була холодна", "Чи можна оплатити готівкою?",
+]
+MANAGER_REPLIES = ["Перевіряємо, хвилинку", "Вибачте за незручності, вже виправляємо", "Так, звісно"]
+
+BATCH_LOG_EVERY = 200_000
+
+
+def utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+def parse_mix(value: str) -> Tuple[List[str], List[float]]:
+    names, weights = [], []
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        names.append(name.strip().upper())
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+class Generator:
+    """Deterministic row streams for one generation run"""
+
+    def __init__(self, args, now: float, catalog: dict, start_ids: Dict[str, int], used_codes: set):
+        self.args = args
+        self.seed = args.seed
+        self.now = now
+        self.start = now - args.days * 86400
+        self.city_ids = catalog["city_ids"]
+        self.location_ids = catalog["location_ids"]
+        self.products = catalog["products"]
+        self.start_ids = start_ids
+        self.used_codes = used_codes
+        self.status_mix = parse_mix(args.status_mix)
+
+        # Per-user state needed by child tables
+        self.user_created = array("d")
+        self.user_language = bytearray()
+
+        # Filled from plan_children() (children in chronological order)
+        self.order_users = array("i")
+        self.order_times = array("d")
+        self.session_users = array("i")
+        self.session_times = array("d")
+
+    def rng(self, kind: int, entity_id: int) -> random.Random:
+        """Per-row generator, so child rows can be regenerated in a later pass"""
+        return random.Random((self.seed << 40) ^ (kind << 36) ^ entity_id)
+
+    def user_id(self, index: int) -> int:
+        return self.start_ids["users"] + index
+
+    def heavy_tailed(self, rng: random.Random, mean: float) -> int:
+        """Count with the given mean and a Pareto (Lomax) tail, --skew is the shape"""
+        scale = mean * (self.args.skew - 1)
+        return min(int(scale * (rng.paretovariate(self.args.skew) - 1) + rng.random()), 500)
+
+    def peak_time(self, rng: random.Random, lower: float) -> float:
+        """Random moment after lower, moved into a busy hour of its day"""
+        moment = rng.uniform(lower, self.now)
+        day_start = moment - moment % 86400
+        moment = day_start + rng.choices(HOURS, HOUR_WEIGHTS)[0] * 3600 + rng.random() * 3600
+        return min(max(moment, lower), self.now)
+
+    # ==================== users ====================
+
+    def users(self) -> Iterator[tuple]:
+        rng = random.Random(self.seed)
+        span = self.now - self.start
+        for index in range(self.args.users):
+            user_id = self.user_id(index)
+            # Registrations grow over time (more recent users)
+            created = self.start + span * rng.random() ** 0.6
+            language = rng.choices(*LANGUAGES)[0]
+            self.user_created.append(created)
+            self.user_language.append(LANGUAGES[0].index(language))
+            created_at = utc(created)
+            yield (
+                user_id,
+                TELEGRAM_ID_BASE + user_id,
+                f"+380{rng.randint(50, 99)}{rng.randint(0, 9_999_999):07d}",
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                rng.choice(self.city_ids) if self.city_ids else None,
+                language,
+                rng.random() > 0.03,
+                False,
+                created_at,
+                created_at,
+            )
+
+    USER_COLUMNS = [
+        "id", "telegram_id", "phone", "full_name", "city_id", "language",
+        "is_active", "is_admin", "created_at", "updated_at",
+    ]
+
+    # ==================== orders ====================
+
+    def plan_children(self, mean: float, kind: int) -> Tuple[array, array]:
+        """Child counts and times per user, sorted by time so ids follow time"""
+        users, times = array("i"), array("d")
+        for index in range(self.args.users):
+            rng = self.rng(kind, index)
+            for _ in range(self.heavy_tailed(rng, mean)):
+                users.append(index)
+                times.append(self.peak_time(rng, self.user_created[index]))
+        order = sorted(range(len(times)), key=times.__getitem__)
+        return array("i", (users[i] for i in order)), array("d", (times[i] for i in order))
+
+    def order_shape(self, order_id: int) -> List[tuple]:
+        """(product_id, quantity, unit_price, options, options_price) per item"""
+        rng = self.rng(2, order_id)
+        items = []
+        for _ in range(rng.choices([1, 2, 3, 4, 5], [35, 30, 20, 10, 5])[0]):
+            product_id, price = rng.choice(self.products)
+            option = rng.randrange(len(ITEM_OPTIONS))
+            items.append((product_id, rng.choices([1, 2, 3], [75, 20, 5])[0], price, ITEM_OPTIONS[option], OPTION_PRICES[option]))
+        return items
+
+    def order_codes(self) -> Iterator[str]:
+        for number in range(ORDER_CODE_SPACE):
+            code = f"{number:06d}"
+            if code not in self.used_codes:
+                yield code
+
+    def orders(self) -> Iterator[tuple]:
+        codes = self.order_codes()
+        statuses, weights = self.status_mix
+        for position, (index, created) in enumerate(zip(self.order_users, self.order_times)):
+            order_id = self.start_ids["orders"] + position
+            rng = self.rng(3, order_id)
+            total = sum((price + options_price) * quantity for _, quantity, price, _, options_price in self.order_shape(order_id))
+
+            age = self.now - created
+            if age < 1800:
+                status = rng.choice(["PENDING", "PENDING", "PAID"])
+            elif age < 7200:
+                status = rng.choice(["PAID", "CONFIRMED", "COMPLETED"])
+            else:
+                status = rng.choices(statuses, weights)[0]
+
+            paid = status in ("PAID", "CONFIRMED", "COMPLETED")
+            validated = created + rng.uniform(120, 900) if paid else None
+            completed = created + rng.uniform(1200, 3600) if status == "COMPLETED" else None
+            yield (
+                order_id,
+                self.user_id(index),
+                rng.choice(self.location_ids),
+                next(codes),
+                total,
+                "UAH",
+                status,
+                f"/uploads/receipt_{order_id}.jpg" if paid else None,
+                total if paid else None,
+                f"{rng.getrandbits(256):064x}" if paid else None,
+                utc(validated) if validated else None,
+                RECEIPT_RESULT if paid else None,
+                "Клієнт не оплатив" if status == "CANCELLED" else None,
+                utc(created),
+                utc(completed or validated or created),
+                utc(completed) if completed else None,
+            )
+
+    ORDER_COLUMNS = [
+        "id", "user_id", "location_id", "order_code", "total_amount", "currency", "status",
+        "receipt_image_url", "receipt_amount", "receipt_hash", "receipt_validated_at",
+        "receipt_validation_result", "cancellation_reason", "created_at", "updated_at", "completed_at",
+    ]
+
+    def order_items(self) -> Iterator[tuple]:
+        item_id = self.start_ids["order_items"]
+        for position, created in enumerate(self.order_times):
+            order_id = self.start_ids["orders"] + position
+            created_at = utc(created)
+            for product_id, quantity, price, options, options_price in self.order_shape(order_id):
+                yield (
+                    item_id, order_id, product_id, quantity, price, options,
+                    options_price, (price + options_price) * quantity, created_at,
+                )
+                item_id += 1
+
+    ORDER_ITEM_COLUMNS = [
+        "id", "order_id", "product_id", "quantity", "unit_price", "selected_options",
+        "options_price", "total_price", "created_at",
+    ]
+
+    # ==================== sessions and interactions ====================
+
+    def session_shape(self, session_id: int) -> Tuple[float, List[str]]:
+        """(duration seconds, interaction types) of a session"""
+        rng = self.rng(4, session_id)
+        count = 1 + int(rng.expovariate(1 / max(self.args.interactions_per_session - 1, 0.01)))
+        types = rng.choices(*INTERACTION_TYPES, k=min(count, 200))
+        return rng.expovariate(1 / 240) + 5 * len(types), types
+
+    def sessions(self) -> Iterator[tuple]:
+        for position, (index, started) in enumerate(zip(self.session_users, self.session_times)):
+            session_id = self.start_ids["user_sessions"] + position
+            rng = self.rng(5, session_id)
+            duration, types = self.session_shape(session_id)
+            user_id = self.user_id(index)
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield (
+                session_id,
+                user_id,
+                TELEGRAM_ID_BASE + user_id,
+                utc(started),
+                utc(started + duration),
+                int(duration),
+                LANGUAGES[0][self.user_language[index]],
+                f"user{user_id}" if rng.random() < 0.6 else None,
+                first_name,
+                last_name if rng.random() < 0.7 else None,
+                types.count("message"),
+                types.count("command"),
+                types.count("callback_query"),
+                rng.choices(*PLATFORMS)[0],
+                utc(started),
+            )
+
+    SESSION_COLUMNS = [
+        "id", "user_id", "telegram_id", "session_start", "session_end", "duration_seconds",
+        "language", "username", "first_name", "last_name", "messages_sent", "commands_used",
+        "buttons_clicked", "platform", "created_at",
+    ]
+
+    def interactions(self) -> Iterator[tuple]:
+        interaction_id = self.start_ids["bot_interactions"]
+        for position, (index, started) in enumerate(zip(self.session_users, self.session_times)):
+            session_id = self.start_ids["user_sessions"] + position
+            rng = self.rng(6, session_id)
+            duration, types = self.session_shape(session_id)
+            user_id = self.user_id(index)
+            telegram_id = TELEGRAM_ID_BASE + user_id
+            offsets = sorted(rng.random() * duration for _ in types)
+            message_id = rng.randint(1, 100_000)
+            for offset, interaction_type in zip(offsets, types):
+                failed = rng.random() < 0.01
+                command = rng.choice(COMMANDS) if interaction_type == "command" else None
+                yield (
+                    interaction_id,
+                    session_id,
+                    user_id,
+                    telegram_id,
+                    interaction_type,
+                    command,
+                    command or (rng.choice(MESSAGE_TEXTS) if interaction_type == "message" else None),
+                    f"{rng.choice(CALLBACKS)}:{rng.randint(1, 10**6)}" if interaction_type == "callback_query" else None,
+                    telegram_id,
+                    message_id,
+                    "text" if interaction_type != "webapp_data" else "webapp",
+                    rng.choice(FSM_STATES),
+                    rng.choice(META_DATA),
+                    not failed,
+                    "Bad Request: message is not modified" if failed else None,
+                    utc(started + offset),
+                )
+                interaction_id += 1
+                message_id += 1
+
+    INTERACTION_COLUMNS = [
+        "id", "session_id", "user_id", "telegram_id", "interaction_type", "command",
+        "message_text", "callback_data", "chat_id", "message_id", "bot_response_type",
+        "fsm_state", "meta_data", "is_successful", "error_message", "created_at",
+    ]
+
+    # ==================== support ====================
+
+    def support_messages(self) -> Iterator[tuple]:
+        rng = random.Random(self.seed + 7)
+        message_id = self.start_ids["support_messages"]
+        for index in range(self.args.users):
+            if rng.random() >= self.args.support_rate:
+                continue
+            user_id = self.user_id(index)
+            telegram_id = TELEGRAM_ID_BASE + user_id
+            opened = self.peak_time(rng, self.user_created[index])
+            thread_id = f"T-{message_id:010d}"
+            answered = rng.random() < 0.9 and opened < self.now - 600
+            response_time = int(rng.expovariate(1 / 900)) + 30 if answered else None
+            status = rng.choices(["closed", "in_progress", "open"], [70, 10, 20])[0] if answered else "open"
+
+            root_id = message_id
+            yield (
+                root_id, user_id, telegram_id, f"SUP-{root_id:010d}", status, "user", None, None,
+                rng.choice(SUPPORT_TEXTS), "text", None, thread_id,
+                utc(opened + response_time) if answered else None, response_time, utc(opened),
+            )
+            message_id += 1
+            if answered:
+                yield (
+                    message_id, user_id, telegram_id, f"SUP-{message_id:010d}", status, "manager",
+                    root_id, rng.choice(["Оператор", "Менеджер"]),
+                    rng.choice(MANAGER_REPLIES), "text", None, thread_id,
+                    None, None, utc(opened + response_time),
+                )
+                message_id += 1
+
+    SUPPORT_COLUMNS = [
+        "id", "user_id", "telegram_id", "ticket_id", "status", "sender_type", "parent_message_id",
+        "sender_name", "message_text", "message_type", "file_url", "thread_id",
+        "responded_at", "response_time_seconds", "created_at",
+    ]
+
+
+class Counted:
+    """Iterator wrapper counting rows and printing throughput"""
+
+    def __init__(self, table: str, rows: Iterator[tuple]):
+        self.table = table
+        self.rows = rows
+        self.count = 0
+        self.started = time.perf_counter()
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            if self.count % BATCH_LOG_EVERY == 0:
+                rate = self.count / (time.perf_counter() - self.started)
+                print(f"  {self.table}: {self.count:,} rows ({rate:,.0f}/s)", flush=True)
+            yield row
+
+
+async def copy(conn: asyncpg.Connection, table: str, columns: List[str], rows: Iterator[tuple]):
+    counted = Counted(table, rows)
+    await conn.copy_records_to_table(table, records=counted, columns=columns)
+    elapsed = time.perf_counter() - counted.started
+    print(f"✓ {table}: {counted.count:,} rows in {elapsed:.1f}s ({counted.count / max(elapsed, 1e-9):,.0f}/s)")
+
+
+async def load_catalog(conn: asyncpg.Connection) -> dict:
+    city_ids = [row["id"] for row in await conn.fetch("SELECT id FROM cities WHERE is_active")]
+    location_ids = [row["id"] for row in await conn.fetch("SELECT id FROM locations WHERE is_active")]
+    products = [
+        (row["id"], row["base_price"])
+        for row in await conn.fetch("SELECT id, base_price FROM products WHERE is_active")
+    ]
+    if not location_ids or not products:
+        raise SystemExit("No active locations or products, run scripts/seed_data.py first")
+    return {"city_ids": city_ids, "location_ids": location_ids, "products": products}
+
+
+TABLES = ["users", "orders", "order_items", "user_sessions", "bot_interactions", "support_messages"]
+
+
+async def generate(args):
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(dsn)
+    try:
+        catalog = await load_catalog(conn)
+        start_ids = {
+            table: (await conn.fetchval(f"SELECT COALESCE(MAX(id), 0) FROM {table}")) + 1
+            for table in TABLES
+        }
+        used_codes = {row["order_code"] for row in await conn.fetch("SELECT order_code FROM orders")}
+
+        generator = Generator(args, time.time(), catalog, start_ids, used_codes)
+        started = time.perf_counter()
+
+        await copy(conn, "users", Generator.USER_COLUMNS, generator.users())
+
+        generator.order_users, generator.order_times = generator.plan_children(args.orders_per_user, kind=0)
+        if len(used_codes) + len(generator.order_times) > ORDER_CODE_SPACE:
+            raise SystemExit(
+                f"{len(generator.order_times):,} orders do not fit the 6-digit order_code space "
+                f"({len(used_codes):,} codes used), lower --orders-per-user or --users"
+            )
+        await copy(conn, "orders", Generator.ORDER_COLUMNS, generator.orders())
+        await copy(conn, "order_items", Generator.ORDER_ITEM_COLUMNS, generator.order_items())
+
+        generator.session_users, generator.session_times = generator.plan_children(args.sessions_per_user, kind=1)
+        await copy(conn, "user_sessions", Generator.SESSION_COLUMNS, generator.sessions())
+        await copy(conn, "bot_interactions", Generator.INTERACTION_COLUMNS, generator.interactions())
+
+        await copy(conn, "support_messages", Generator.SUPPORT_COLUMNS, generator.support_messages())
+
+        # Move sequences past the explicit ids
+        for table in TABLES:
+            await conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            )
+        if not args.skip_analyze:
+            print("Analyzing tables...")
+            await conn.execute(f"ANALYZE {', '.join(TABLES)}")
+
+        print(f"\nDone in {time.perf_counter() - started:.1f}s")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream production-size synthetic data into Postgres with COPY")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--orders-per-user", type=float, default=3.0, help="Mean orders per user")
+    parser.add_argument("--sessions-per-user", type=float, default=6.0, help="Mean bot sessions per user")
+    parser.add_argument("--interactions-per-session", type=float, default=8.0, help="Mean interactions per session")
+    parser.add_argument("--support-rate", type=float, default=0.05, help="Share of users opening a support ticket")
+    parser.add_argument("--skew", type=float, default=1.8, help="Pareto shape for per-user counts (lower = heavier tail)")
+    parser.add_argument("--days", type=int, default=180, help="History length")
+    parser.add_argument(
+        "--status-mix",
+        default="COMPLETED=72,CANCELLED=10,CONFIRMED=6,PAID=5,PENDING=7",
+        help="Status weights for orders older than two hours",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-analyze", action="store_true")
+    args = parser.parse_args()
+    if args.skew <= 1:
+        parser.error("--skew must be greater than 1")
+
+    asyncio.run(generate(args))
+
+
+if __name__ == "__main__":
+    main()
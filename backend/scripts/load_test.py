@@ -0,0 +1,409 @@
+"""
+Load test for the backend with a bot + WebApp traffic mix
+
+Customers arrive at a fixed rate (open loop: new customers keep arriving
+even when the backend slows down, like real Telegram traffic) and each
+runs one scenario:
+
+    bot_update  - auth lookup (GET /api/users/{id}) + interaction logging
+    menu        - WebApp opens: categories, products, pickup locations
+    order       - auth lookup + order creation
+    receipt     - auth lookup + receipt image upload + interaction logging
+
+Latency percentiles (p50/p95/p99) and error rates per endpoint are written
+to a JSON file with stable key order, so reports of two releases can be
+diffed or compared with --compare.
+
+Local stack:
+    docker compose up -d postgres
+    alembic upgrade head && python scripts/seed_data.py
+    python scripts/load_test.py --spawn 4 --rate 50 --duration 60 --output load-1.0.json
+
+Against a running backend:
+    python scripts/load_test.py --base-url http://localhost:8000 --rate 100 \\
+        --mix bot_update=6,menu=2,order=1,receipt=1 --output load.json
+    python scripts/load_test.py ... --output load-new.json --compare load-1.0.json
+
+The receipt step posts to /api/admin/upload/image (same validation and
+disk write as a receipt) until the backend exposes a receipt endpoint.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Synthetic customers use ids far above real Telegram ids
+TELEGRAM_ID_BASE = 9_000_000_000
+
+DEFAULT_MIX = "bot_update=6,menu=2,order=1,receipt=1"
+
+
+def tiny_png() -> bytes:
+    """Valid 1x1 PNG passing the upload signature check"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\xff\x80\x00")
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Latency samples and failures per endpoint label"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # Scenarios that raised (a broken scenario must not pass as "no errors")
+        self.crashes: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(
+        self,
+        client: httpx.AsyncClient,
+        label: str,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies[label].append((time.perf_counter() - started) * 1000)
+            self.errors[label][type(e).__name__] += 1
+            return None
+        self.latencies[label].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[label][str(response.status_code)] += 1
+            return None
+        return response
+
+    async def scenario(self, name: str, coroutine):
+        """Run a scenario, counting an exception it raises as a failure"""
+        try:
+            await coroutine
+        except Exception as e:
+            self.crashes[name][type(e).__name__] += 1
+
+    def report(self, elapsed: float) -> Dict[str, dict]:
+        endpoints = {}
+        for label in sorted(self.latencies):
+            values = sorted(self.latencies[label])
+            failed = sum(self.errors[label].values())
+            endpoints[label] = {
+                "requests": len(values),
+                "errors": failed,
+                "error_rate": round(failed / len(values), 4),
+                "error_kinds": dict(sorted(self.errors[label].items())),
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2),
+            }
+        return endpoints
+
+
+class Fixture:
+    """Customers, products and locations the scenarios pick from"""
+
+    def __init__(self, customers: List[dict], products: List[dict], location_ids: List[int]):
+        self.customers = customers
+        self.products = products
+        self.location_ids = location_ids
+        self.receipt = tiny_png()
+
+    def random_items(self) -> List[dict]:
+        items = []
+        for product in random.sample(self.products, k=min(len(self.products), random.randint(1, 3))):
+            quantity = random.randint(1, 2)
+            price = float(product["base_price"])
+            items.append({
+                "product_id": product["id"],
+                "quantity": quantity,
+                "unit_price": price,
+                "total_price": price * quantity,
+            })
+        return items
+
+
+async def prepare_fixture(client: httpx.AsyncClient, customers: int) -> Fixture:
+    """Register synthetic customers and load the catalog once"""
+    cities = (await client.get("/api/cities")).json()["data"]
+    city_id = cities[0]["id"] if cities else None
+
+    registered = []
+    for i in range(customers):
+        telegram_id = TELEGRAM_ID_BASE + i
+        response = await client.get(f"/api/users/{telegram_id}")
+        if response.status_code == 404:
+            response = await client.post("/api/users", json={
+                "telegram_id": telegram_id,
+                "phone": f"+380{telegram_id % 10**9:09d}",
+                "full_name": f"Load Test {i}",
+                "city_id": city_id,
+            })
+        response.raise_for_status()
+        registered.append({"telegram_id": telegram_id, "user_id": response.json()["id"]})
+
+    products = (await client.get("/api/products")).json()["data"]
+    locations = (await client.get("/api/pickup-locations")).json()["data"]
+    if not products or not locations:
+        raise RuntimeError("No products or pickup locations, seed the database first (scripts/seed_data.py)")
+
+    return Fixture(registered, products, [location["id"] for location in locations])
+
+
+# ==================== Scenarios ====================
+
+async def auth_lookup(client, recorder: Recorder, customer: dict):
+    return await recorder.call(
+        client, "GET /api/users/{telegram_id}", "GET", f"/api/users/{customer['telegram_id']}"
+    )
+
+
+async def log_interaction(client, recorder: Recorder, customer: dict, interaction_type: str, **fields):
+    await recorder.call(client, "POST /api/interactions", "POST", "/api/interactions", json={
+        "telegram_id": customer["telegram_id"],
+        "user_id": customer["user_id"],
+        "interaction_type": interaction_type,
+        **fields,
+    })
+
+
+async def bot_update(client, recorder: Recorder, fixture: Fixture, customer: dict):
+    await auth_lookup(client, recorder, customer)
+    await log_interaction(client, recorder, customer, "message", message_text="📋 Мої замовлення")
+
+
+async def menu(client, recorder: Recorder, fixture: Fixture, customer: dict):
+    await asyncio.gather(
+        recorder.call(client, "GET /api/categories", "GET", "/api/categories"),
+        recorder.call(client, "GET /api/products", "GET", "/api/products"),
+        recorder.call(client, "GET /api/pickup-locations", "GET", "/api/pickup-locations"),
+    )
+
+
+async def order(client, recorder: Recorder, fixture: Fixture, customer: dict):
+    await auth_lookup(client, recorder, customer)
+    items = fixture.random_items()
+    await recorder.call(client, "POST /api/orders/create", "POST", "/api/orders/create", json={
+        "telegram_id": customer["telegram_id"],
+        "location_id": random.choice(fixture.location_ids),
+        "items": items,
+        "total_amount": sum(item["total_price"] for item in items),
+    })
+
+
+async def receipt(client, recorder: Recorder, fixture: Fixture, customer: dict):
+    await auth_lookup(client, recorder, customer)
+    await recorder.call(
+        client, "POST /api/admin/upload/image", "POST", "/api/admin/upload/image",
+        files={"file": ("receipt.png", fixture.receipt, "image/png")},
+    )
+    await log_interaction(client, recorder, customer, "photo", bot_response_type="receipt")
+
+
+SCENARIOS = {
+    "bot_update": bot_update,
+    "menu": menu,
+    "order": order,
+    "receipt": receipt,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}, choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ==================== Runner ====================
+
+async def run_load(
+    base_url: str,
+    rate: float,
+    duration: float,
+    mix: Dict[str, float],
+    customers: int,
+    max_in_flight: int,
+    timeout: float,
+) -> dict:
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        fixture = await prepare_fixture(client, customers)
+        recorder = Recorder()
+        names, weights = list(mix), list(mix.values())
+        started_counts: Dict[str, int] = defaultdict(int)
+        dropped = 0
+        in_flight = set()
+
+        started = time.perf_counter()
+        next_arrival = started
+        while next_arrival - started < duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Poisson arrivals around the target rate
+            next_arrival += random.expovariate(rate)
+
+            if len(in_flight) >= max_in_flight:
+                # Load generator saturated, the backend is not keeping up
+                dropped += 1
+                continue
+            name = random.choices(names, weights)[0]
+            started_counts[name] += 1
+            task = asyncio.create_task(recorder.scenario(
+                name, SCENARIOS[name](client, recorder, fixture, random.choice(fixture.customers))
+            ))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+
+    endpoints = recorder.report(elapsed)
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    crashed = sum(sum(kinds.values()) for kinds in recorder.crashes.values())
+    errors = sum(endpoint["errors"] for endpoint in endpoints.values()) + crashed
+    return {
+        "meta": {
+            "base_url": base_url,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target_rate": rate,
+            "duration_s": round(elapsed, 2),
+            "customers": customers,
+            "max_in_flight": max_in_flight,
+            "mix": mix,
+        },
+        "summary": {
+            "scenarios": dict(sorted(started_counts.items())),
+            "scenarios_dropped": dropped,
+            "scenarios_failed": {
+                name: dict(sorted(kinds.items())) for name, kinds in sorted(recorder.crashes.items())
+            },
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "rps": round(total / elapsed, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def spawn_backend(port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn for the local stack and wait for /health"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DEBUG": "false"},
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Backend exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    process.terminate()
+    raise RuntimeError("Backend did not become healthy within 30s")
+
+
+def print_report(report: dict, baseline: Optional[dict] = None):
+    summary = report["summary"]
+    print(
+        f"\n{summary['requests']} requests, {summary['rps']} req/s, "
+        f"error rate {summary['error_rate']:.2%}, {summary['scenarios_dropped']} scenarios dropped"
+    )
+    for name, kinds in summary["scenarios_failed"].items():
+        print(f"scenario {name} raised: " + ", ".join(f"{kind} x{count}" for kind, count in kinds.items()))
+    print(f"{'endpoint':36} {'req':>7} {'err %':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, stats in report["endpoints"].items():
+        line = (
+            f"{label:36} {stats['requests']:>7} {stats['error_rate']:>7.2%} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+        previous = (baseline or {}).get("endpoints", {}).get(label)
+        if previous and previous["p95_ms"]:
+            change = (stats["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"]
+            line += f"   p95 {change:+.0%} vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the backend with a bot + WebApp traffic mix")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rate", type=float, default=20, help="Customers arriving per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to generate load")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--customers", type=int, default=200, help="Synthetic customers to register")
+    parser.add_argument("--max-in-flight", type=int, default=200, help="Concurrent scenarios before arrivals are dropped")
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--spawn", type=int, metavar="WORKERS", help="Start a local uvicorn with this many workers")
+    parser.add_argument("--output", default="load_report.json", help="JSON report path")
+    parser.add_argument("--compare", help="Previous JSON report to compare p95 against")
+    args = parser.parse_args()
+
+    process = None
+    base_url = args.base_url
+    if args.spawn:
+        port = httpx.URL(base_url).port or 8000
+        base_url = f"http://127.0.0.1:{port}"
+        process = spawn_backend(port, args.spawn)
+
+    try:
+        report = asyncio.run(run_load(
+            base_url, args.rate, args.duration, args.mix, args.customers, args.max_in_flight, args.timeout
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Task queue worker
+
+Runs the tasks enqueued by the API (see app.services.task_queue) with N
+concurrent consumers. Start as many worker processes as needed, on any
+host that reaches the database; they share the queue through
+SELECT ... FOR UPDATE SKIP LOCKED. SIGTERM/SIGINT stop the worker and hand
+unfinished tasks back to the queue.
+
+Set PROMETHEUS_MULTIPROC_DIR to the API's directory to include the task
+metrics in its /metrics.
+
+Usage:
+    python scripts/task_worker.py
+    python scripts/task_worker.py --concurrency 8
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.database import close_db
+from app.services.task_queue import TaskWorker, load_handlers
+
+
+async def run(concurrency: int):
+    load_handlers()
+    worker = TaskWorker(
+        settings.DATABASE_URL,
+        concurrency=concurrency,
+        lease=settings.TASK_LEASE_SECONDS,
+        poll_interval=settings.TASK_POLL_INTERVAL,
+        channel=settings.TASK_CHANNEL,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued background tasks")
+    parser.add_argument("--concurrency", type=int, default=settings.TASK_CONCURRENCY,
+                        help=f"Concurrent consumers (default {settings.TASK_CONCURRENCY})")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if settings.DEBUG else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(run(max(1, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
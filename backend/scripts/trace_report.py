@@ -0,0 +1,148 @@
+"""
+Per-update latency breakdown from exported trace spans
+
+Reads the JSONL span files written by the bot and backend tracers
+(TRACE_EXPORT_PATH), joins them by trace id and prints every update as a
+tree of spans: update -> handler -> backend call -> route -> SQL statements.
+
+Usage:
+    python scripts/trace_report.py logs/bot/traces.jsonl logs/backend/traces.jsonl
+    python scripts/trace_report.py traces/*.jsonl --slowest 5
+    python scripts/trace_report.py traces/*.jsonl --trace 4bf92f3577b34da6a3ce929d0e0e4736
+    python scripts/trace_report.py traces/*.jsonl --json report.json
+"""
+import argparse
+import json
+from collections import defaultdict
+from typing import Dict, List
+
+
+def load_spans(paths: List[str]) -> Dict[str, List[dict]]:
+    """Read span files and group spans by trace id"""
+    traces: Dict[str, List[dict]] = defaultdict(list)
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    span = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def build_tree(spans: List[dict]) -> List[dict]:
+    """Attach children to parents; spans with unknown parents become roots"""
+    by_id = {span["span_id"]: {**span, "children": []} for span in spans}
+    roots = []
+    for node in by_id.values():
+        parent = by_id.get(node["parent_id"])
+        if parent is not None:
+            parent["children"].append(node)
+        else:
+            roots.append(node)
+    for node in by_id.values():
+        node["children"].sort(key=lambda child: child["start"])
+    roots.sort(key=lambda root: root["start"])
+    return roots
+
+
+def trace_duration(roots: List[dict]) -> float:
+    start = min(root["start"] for root in roots)
+    end = max(root["start"] + root["duration_ms"] / 1000 for root in roots)
+    return (end - start) * 1000
+
+
+def summarize(spans: List[dict]) -> dict:
+    """Time spent per service and in SQL for one trace"""
+    per_service: Dict[str, float] = defaultdict(float)
+    sql_ms = 0.0
+    sql_count = 0
+    for span in spans:
+        if span["kind"] == "server" or span["parent_id"] is None:
+            per_service[span["service"]] += span["duration_ms"]
+        if span["name"] == "db.query":
+            sql_ms += span["duration_ms"]
+            sql_count += 1
+    return {
+        "service_ms": {service: round(value, 3) for service, value in per_service.items()},
+        "sql_ms": round(sql_ms, 3),
+        "sql_count": sql_count,
+    }
+
+
+def print_node(node: dict, trace_start: float, depth: int = 0):
+    offset = (node["start"] - trace_start) * 1000
+    label = node["name"]
+    if node["name"] == "db.query":
+        statement = " ".join(node["attributes"].get("db.statement", "").split())
+        label = f"SQL {statement[:80]}"
+    status = "" if node["status"] == "ok" else f"  [{node['status']}]"
+    print(
+        f"{offset:>9.1f} {node['duration_ms']:>9.1f}  "
+        f"{'  ' * depth}{label} ({node['service']}){status}"
+    )
+    for child in node["children"]:
+        print_node(child, trace_start, depth + 1)
+
+
+def print_trace(trace_id: str, spans: List[dict]):
+    roots = build_tree(spans)
+    summary = summarize(spans)
+    services = ", ".join(f"{name} {value:.1f} ms" for name, value in summary["service_ms"].items())
+    print(f"\ntrace {trace_id}  total {trace_duration(roots):.1f} ms  ({services})")
+    print(f"  SQL: {summary['sql_count']} statements, {summary['sql_ms']:.1f} ms")
+    print(f"{'start ms':>9} {'dur ms':>9}  span")
+    trace_start = roots[0]["start"]
+    for root in roots:
+        print_node(root, trace_start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-update latency breakdown from trace files")
+    parser.add_argument("files", nargs="+", help="JSONL span files (bot and backend)")
+    parser.add_argument("--trace", help="Show only this trace id")
+    parser.add_argument("--slowest", type=int, default=10, help="Show N slowest traces (default 10)")
+    parser.add_argument("--json", dest="json_output", help="Write trace summaries to this JSON file")
+    args = parser.parse_args()
+
+    traces = load_spans(args.files)
+    if not traces:
+        print("No spans found")
+        return
+
+    if args.trace:
+        if args.trace not in traces:
+            print(f"Trace {args.trace} not found")
+            return
+        selected = [args.trace]
+    else:
+        selected = sorted(
+            traces,
+            key=lambda trace_id: trace_duration(build_tree(traces[trace_id])),
+            reverse=True,
+        )[:args.slowest]
+
+    for trace_id in selected:
+        print_trace(trace_id, traces[trace_id])
+
+    if args.json_output:
+        report = []
+        for trace_id in selected:
+            roots = build_tree(traces[trace_id])
+            report.append({
+                "trace_id": trace_id,
+                "root": roots[0]["name"],
+                "total_ms": round(trace_duration(roots), 3),
+                **summarize(traces[trace_id]),
+            })
+        with open(args.json_output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { ShoppingCart, MapPin } from 'lucide-react';
 import { Category, Product, PickupLocation } from '@/shared/types';
 import { useCart } from '@/hooks/useCart';
@@ -24,6 +24,8 @@ export default function Home() {
   const [selectedLocation, setSelectedLocation] = useState<string>('');
   const [isCartOpen, setIsCartOpen] = useState(false);
   const [loading, setLoading] = useState(true);
+  // Idempotency key of the order being submitted, reused while the cart is unchanged
+  const checkoutKey = useRef<{ key: string; body: string } | null>(null);
   const navigate = useNavigate();
   const { t } = useLanguage();
 
@@ -42,37 +44,29 @@ export default function Home() {
 
   const loadData = async () => {
     try {
-      const [categoriesRes, productsRes, citiesRes, locationsRes] = await Promise.all([
-        fetch('/api/categories'),
-        fetch('/api/products'),
-        fetch('/api/cities'),
-        fetch('/api/pickup-locations'),
-      ]);
+      // Cities, the user's city locations, categories and menu in one call
+      const params = new URLSearchParams();
+      const telegramId = window.Telegram?.WebApp?.initDataUnsafe?.user?.id
+        || new URLSearchParams(window.location.search).get('telegram_id');
+      if (telegramId) {
+        params.set('telegram_id', String(telegramId));
+      }
 
-      const [categoriesData, productsData, citiesData, locationsData] = await Promise.all([
-        categoriesRes.json(),
-        productsRes.json(),
-        citiesRes.json(),
-        locationsRes.json(),
-      ]);
+      const response = await fetch(`/api/webapp/bootstrap?${params}`);
+      const bootstrap = await response.json();
+      console.log('Bootstrap loaded:', bootstrap);
 
-      console.log('Categories loaded:', categoriesData);
-      console.log('Products loaded:', productsData);
-      console.log('Cities loaded:', citiesData);
-      console.log('Locations loaded:', locationsData);
-      
-      if (categoriesData.success) setCategories(categoriesData.data);
-      if (productsData.success) setProducts(productsData.data);
-      if (citiesData.success) {
-        setCities(citiesData.data);
-        // Auto-select first city if available
-        if (citiesData.data.length > 0) {
-          setSelectedCity(citiesData.data[0].id);
+      if (bootstrap.success) {
+        const data = bootstrap.data;
+        setCategories(data.categories);
+        // price = pickup location price when location_id is sent, else base_price
+        setProducts(data.products.map((p: Product & { price: number }) => ({ ...p, base_price: p.price })));
+        setCities(data.cities);
+        setPickupLocations(data.locations);
+        if (data.city_id) {
+          setSelectedCity(data.city_id);
         }
       }
-      if (locationsData.success) {
-        setPickupLocations(locationsData.data);
-      }
     } catch (error) {
       console.error('Error loading data:', error);
     } finally {
@@ -80,6 +74,20 @@ export default function Home() {
     }
   };
 
+  const handleCityChange = async (cityId: number) => {
+    setSelectedCity(cityId);
+    // Bootstrap only carries the locations of the initial city
+    if (!pickupLocations.some(loc => loc.city_id === cityId)) {
+      try {
+        const response = await fetch('/api/pickup-locations');
+        const data = await response.json();
+        if (data.success) setPickupLocations(data.data);
+      } catch (error) {
+        console.error('Error loading locations:', error);
+      }
+    }
+  };
+
   const handleCheckout = async () => {
     console.log('Checkout attempt:', {
       selectedCity,
@@ -142,23 +150,48 @@ export default function Home() {
       
       console.log('Creating order:', orderData);
       
+      // Resubmitting the same cart (double tap, retry after a network error)
+      // reuses the key, so the backend returns the first order instead of a new one
+      const body = JSON.stringify(orderData);
+      if (checkoutKey.current?.body !== body) {
+        checkoutKey.current = { key: crypto.randomUUID(), body };
+      }
+      
       // Create order
       const response = await fetch('/api/orders/create', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Idempotency-Key': checkoutKey.current.key,
         },
-        body: JSON.stringify(orderData)
+        body
       });
       
       const result = await response.json();
       
+      if (response.status === 409) {
+        // Sold out since the menu was loaded
+        alert(result.detail?.message || 'Некоторые товары закончились, обновите корзину');
+        return;
+      }
+      
+      if (response.status === 429) {
+        // Kitchen queue of the location is full
+        alert(result.detail?.message || 'Точка сейчас перегружена заказами, попробуйте чуть позже');
+        return;
+      }
+      
       if (result.success) {
+        checkoutKey.current = null;
+        
         // Clear cart
         items.forEach(item => removeFromCart(item.id));
         
         // Show success message
-        alert(`${result.message}\n\nКод заказа: ${result.order.order_code}`);
+        const readyAt = result.order.ready_at
+          ? `\nГотов примерно к ${new Date(result.order.ready_at).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })}`
+          : '';
+        alert(`${result.message}\n\nКод заказа: ${result.order.order_code}${readyAt}`);
         
         // Close WebApp and return to bot
         if (window.Telegram?.WebApp) {
@@ -250,7 +283,7 @@ export default function Home() {
             <MapPin className="w-4 h-4 text-gray-500 flex-shrink-0" />
             <select
               value={selectedCity || ''}
-              onChange={(e) => setSelectedCity(Number(e.target.value))}
+              onChange={(e) => handleCityChange(Number(e.target.value))}
               className="text-sm border border-gray-300 rounded-lg px-2 py-1 focus:ring-2 focus:ring-orange-500 focus:border-orange-500 flex-1 min-w-0"
             >
               <option value="">{t('location.selectCity') || 'Город'}</option>
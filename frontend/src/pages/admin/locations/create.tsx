@@ -1,5 +1,5 @@
 import { Create, useForm, useSelect } from "@refinedev/antd";
-import { Form, Input, Switch, Select } from "antd";
+import { Form, Input, InputNumber, Switch, Select } from "antd";
 
 export const LocationCreate = () => {
   const { formProps, saveButtonProps } = useForm({
@@ -46,6 +46,28 @@ export const LocationCreate = () => {
           <Input placeholder="Например: 09:00-22:00" />
         </Form.Item>
         
+        <Form.Item 
+          label="Длина слота кухни, мин" 
+          name="slot_minutes"
+        >
+          <InputNumber min={1} style={{ width: '100%' }} placeholder="10" />
+        </Form.Item>
+        
+        <Form.Item 
+          label="Заказов на слот" 
+          name="orders_per_slot"
+          tooltip="Пусто или 0 — без ограничения"
+        >
+          <InputNumber min={0} style={{ width: '100%' }} placeholder="Без ограничения" />
+        </Form.Item>
+        
+        <Form.Item 
+          label="Время приготовления, мин" 
+          name="prep_minutes"
+        >
+          <InputNumber min={0} style={{ width: '100%' }} placeholder="15" />
+        </Form.Item>
+        
         <Form.Item 
           label="Активна" 
           name="is_active" 
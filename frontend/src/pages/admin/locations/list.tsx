@@ -14,6 +14,14 @@ export const LocationList = () => {
         <Table.Column dataIndex="city_name" title="Город" width={150} />
         <Table.Column dataIndex="address" title="Адрес" />
         <Table.Column dataIndex="working_hours" title="Часы работы" width={150} />
+        <Table.Column 
+          dataIndex="orders_per_slot" 
+          title="Заказов / слот"
+          width={130}
+          render={(value: number | null, record: any) => (
+            value ? `${value} / ${record.slot_minutes} мин` : '∞'
+          )}
+        />
         <Table.Column 
           dataIndex="is_active" 
           title="Активна"
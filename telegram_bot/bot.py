@@ -11,8 +11,21 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
 from config import settings
-from middlewares import AuthMiddleware, InteractionLoggingMiddleware, SessionTrackingMiddleware
+from middlewares import (
+    AuthMiddleware,
+    InteractionLoggingMiddleware,
+    SessionTrackingMiddleware,
+    HandlerMetricsMiddleware,
+    UpdateTracingMiddleware,
+    HandlerTracingMiddleware,
+    TelegramRequestTracingMiddleware
+)
 from handlers import start, menu, orders, support, manager
+from keyboards import build_static_keyboards, webapp_texts, order_actions_texts, manager_order_texts
+from services import load_catalog
+from services.outbound import outbound_scheduler, OutboundRateLimitMiddleware
+from services.metrics import register_collectors, start_metrics_server, stop_metrics_server
+from services.tracing import tracer
 
 # Configure logging
 logging.basicConfig(
@@ -25,18 +38,37 @@ logger = logging.getLogger(__name__)
 async def main():
     """Main bot function"""
 
+    # Shared message catalog must be loaded before keyboards are built
+    await load_catalog()
+
+    # Prebuild language-dependent keyboards once
+    build_static_keyboards()
+
     # Initialize bot and dispatcher
     bot = Bot(
         token=settings.BOT_TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
 
+    # Trace Telegram API calls (registered first, so it wraps the scheduler wait)
+    if settings.TRACING_ENABLED:
+        bot.session.middleware(TelegramRequestTracingMiddleware())
+
+    # Every outgoing send goes through the rate-limited scheduler
+    bot.session.middleware(
+        OutboundRateLimitMiddleware(outbound_scheduler, max_retries=settings.TELEGRAM_MAX_RETRIES)
+    )
+
     # Use memory storage for FSM
     # In production, consider using Redis storage
     storage = MemoryStorage()
     dp = Dispatcher(storage=storage)
 
     # Register middlewares
+    # Trace every update from the first middleware on
+    if settings.TRACING_ENABLED:
+        dp.update.outer_middleware(UpdateTracingMiddleware())
+
     # Order matters! Session tracking -> Auth -> Logging
     dp.message.middleware(SessionTrackingMiddleware())
     dp.callback_query.middleware(SessionTrackingMiddleware())
@@ -47,6 +79,13 @@ async def main():
     dp.message.middleware(InteractionLoggingMiddleware())
     dp.callback_query.middleware(InteractionLoggingMiddleware())
 
+    dp.message.middleware(HandlerMetricsMiddleware("message"))
+    dp.callback_query.middleware(HandlerMetricsMiddleware("callback_query"))
+
+    if settings.TRACING_ENABLED:
+        dp.message.middleware(HandlerTracingMiddleware())
+        dp.callback_query.middleware(HandlerTracingMiddleware())
+
     # Register routers
     dp.include_router(start.router)
     dp.include_router(menu.router)
@@ -58,10 +97,23 @@ async def main():
     logger.info(f"Backend URL: {settings.BACKEND_URL}")
     logger.info(f"Manager Channel ID: {settings.MANAGER_CHANNEL_ID}")
 
+    # Metrics
+    register_collectors(
+        outbound_scheduler,
+        webapp=webapp_texts,
+        order_actions=order_actions_texts,
+        manager_order=manager_order_texts
+    )
+    metrics_runner = await start_metrics_server(settings.METRICS_PORT)
+
     # Start polling
+    outbound_scheduler.start()
     try:
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
+        await outbound_scheduler.stop()
+        await stop_metrics_server(metrics_runner)
+        tracer.close()
         await bot.session.close()
 
 
@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     # Backend API
     BACKEND_URL: str = "http://backend:8000"
     BACKEND_TIMEOUT: int = 30
+    CATALOG_LOAD_ATTEMPTS: int = 8  # Startup tries to fetch the message catalog
+    CATALOG_LOAD_BACKOFF: float = 1  # First retry delay in seconds, doubled each try
+    CATALOG_LOAD_BACKOFF_MAX: float = 30  # Retry delay cap in seconds
 
     # WebApp
     WEBAPP_URL: str = "http://localhost:5173"
@@ -24,14 +27,25 @@ class Settings(BaseSettings):
     # n8n Integration
     N8N_URL: str = ""
     N8N_WEBHOOK_SECRET: str = ""
+    BACKEND_CALLBACK_URL: str = ""  # Backend URL reachable from n8n (defaults to BACKEND_URL)
 
     # Database (same as backend)
     DATABASE_URL: str
 
+    # Localization
+    DEFAULT_LANGUAGE: str = "uk"
+    SUPPORTED_LANGUAGES: List[str] = ["uk", "en", "ru"]
+
     # Bot behavior
     SESSION_TIMEOUT_MINUTES: int = 30
     MAX_FILE_SIZE_MB: int = 10
 
+    # Monitoring
+    METRICS_PORT: int = 9101  # Prometheus /metrics port, 0 disables
+    TRACING_ENABLED: bool = False  # Export update spans to TRACE_EXPORT_PATH
+    TRACE_EXPORT_PATH: str = "logs/traces.jsonl"
+    TRACE_SAMPLE_RATE: float = 1.0  # Share of updates traced
+
     # Logging
     LOG_LEVEL: str = "INFO"
     DEBUG: bool = False
@@ -40,6 +54,14 @@ class Settings(BaseSettings):
     RATE_LIMIT_MESSAGES: int = 20  # Max messages per minute
     RATE_LIMIT_COMMANDS: int = 10  # Max commands per minute
 
+    # Outbound Telegram limits
+    # Messages per second across all chats: the bot's share of the token's ~30 msg/s,
+    # the backend sends the rest (BROADCAST_RATE 10 + TELEGRAM_NOTIFY_RATE 5)
+    TELEGRAM_GLOBAL_RATE: float = 15
+    TELEGRAM_CHAT_RATE: float = 1  # Messages per second to one private chat
+    TELEGRAM_GROUP_RATE_PER_MINUTE: float = 20  # Messages per minute to one group/channel
+    TELEGRAM_MAX_RETRIES: int = 3  # Retries after RetryAfter before giving up
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -4,7 +4,7 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery
 import logging
 
-from services import api_client
+from services import api_client, send_priority, send_in_background, Priority
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -18,9 +18,10 @@ async def manager_confirm_order(callback: CallbackQuery):
     result = await api_client.update_order_status(order_id, "confirmed")
 
     if result:
-        await callback.message.edit_text(
-            callback.message.text + "\n\n✅ ПІДТВЕРДЖЕНО"
-        )
+        with send_priority(Priority.MANAGER):
+            await callback.message.edit_text(
+                callback.message.text + "\n\n✅ ПІДТВЕРДЖЕНО"
+            )
 
         # Notify user
         order = await api_client.get_order(order_id)
@@ -30,10 +31,9 @@ async def manager_confirm_order(callback: CallbackQuery):
             user_text += f"⏰ Час роботи: {order['location']['working_hours']}\n\n"
             user_text += f"Код для отримання: {order['order_code']}"
 
-            try:
-                await callback.bot.send_message(order["user"]["telegram_id"], user_text)
-            except Exception as e:
-                logger.error(f"Failed to notify user: {e}")
+            send_in_background(
+                callback.bot, order["user"]["telegram_id"], user_text, priority=Priority.MANAGER
+            )
 
         await callback.answer("Замовлення підтверджено!")
     else:
@@ -48,9 +48,10 @@ async def manager_reject_order(callback: CallbackQuery):
     result = await api_client.update_order_status(order_id, "cancelled", "Відхилено менеджером")
 
     if result:
-        await callback.message.edit_text(
-            callback.message.text + "\n\n❌ ВІДХИЛЕНО"
-        )
+        with send_priority(Priority.MANAGER):
+            await callback.message.edit_text(
+                callback.message.text + "\n\n❌ ВІДХИЛЕНО"
+            )
 
         # Notify user
         order = await api_client.get_order(order_id)
@@ -59,10 +60,9 @@ async def manager_reject_order(callback: CallbackQuery):
             user_text += f"Причина: Не пройдено перевірку чека.\n\n"
             user_text += f"Будь ласка, зв'яжіться з підтримкою: /support"
 
-            try:
-                await callback.bot.send_message(order["user"]["telegram_id"], user_text)
-            except Exception as e:
-                logger.error(f"Failed to notify user: {e}")
+            send_in_background(
+                callback.bot, order["user"]["telegram_id"], user_text, priority=Priority.MANAGER
+            )
 
         await callback.answer("Замовлення відхилено!")
     else:
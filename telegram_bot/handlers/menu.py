@@ -6,26 +6,21 @@ import logging
 
 from keyboards import get_webapp_keyboard
 from config import settings
+from services import t, button_text
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-@router.message(F.text.in_(["🍕 Меню", "🍕 Menu", "🍕 Меню", "/menu"]))
+@router.message(F.text.func(button_text("bot.btn.menu", "/menu")))
 async def cmd_menu(message: Message, user: dict):
     """Open WebApp menu"""
     language = user.get("language", "uk")
     telegram_id = message.from_user.id
 
-    texts = {
-        "uk": "🍕 Виберіть піцу з нашого меню:\n\nНатисніть кнопку нижче, щоб відкрити каталог.",
-        "en": "🍕 Choose pizza from our menu:\n\nClick the button below to open catalog.",
-        "ru": "🍕 Выберите пиццу из нашего меню:\n\nНажмите кнопку ниже, чтобы открыть каталог."
-    }
-
     webapp_url = f"{settings.WEBAPP_URL}?telegram_id={telegram_id}"
 
     await message.answer(
-        texts.get(language, texts["uk"]),
+        t("bot.menu.open_catalog", language),
         reply_markup=get_webapp_keyboard(webapp_url, language)
     )
@@ -7,14 +7,14 @@ import logging
 
 from states import OrderStates
 from keyboards import get_order_actions_keyboard
-from services import api_client, n8n_client
+from services import api_client, n8n_client, t, button_text
 from config import settings
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-@router.message(F.text.in_(["📦 Мої замовлення", "📦 My Orders", "📦 Мои заказы", "/orders"]))
+@router.message(F.text.func(button_text("bot.btn.orders", "/orders")))
 async def cmd_orders(message: Message, user: dict):
     """Show user orders history"""
     language = user.get("language", "uk")
@@ -23,21 +23,10 @@ async def cmd_orders(message: Message, user: dict):
     orders = await api_client.get_user_orders(telegram_id, limit=10)
 
     if not orders:
-        texts = {
-            "uk": "📦 У вас ще немає замовлень.\n\nОформіть ваше перше замовлення через 🍕 Меню",
-            "en": "📦 You don't have any orders yet.\n\nPlace your first order via 🍕 Menu",
-            "ru": "📦 У вас еще нет заказов.\n\nОформите ваш первый заказ через 🍕 Меню"
-        }
-        await message.answer(texts.get(language, texts["uk"]))
+        await message.answer(t("bot.orders.empty", language))
         return
 
-    texts = {
-        "uk": "📦 Ваші замовлення:\n\n",
-        "en": "📦 Your orders:\n\n",
-        "ru": "📦 Ваши заказы:\n\n"
-    }
-
-    text = texts.get(language, texts["uk"])
+    text = t("bot.orders.header", language)
 
     for order in orders[:5]:
         status_emoji = {
@@ -49,9 +38,14 @@ async def cmd_orders(message: Message, user: dict):
         }
         emoji = status_emoji.get(order["status"], "📦")
 
-        text += f"{emoji} Замовлення #{order['order_code']}\n"
-        text += f"   Сума: {order['total_amount']} грн\n"
-        text += f"   Статус: {order['status']}\n\n"
+        text += t(
+            "bot.orders.item",
+            language,
+            emoji=emoji,
+            order_code=order["order_code"],
+            total_amount=order["total_amount"],
+            status=order["status"]
+        )
 
     await message.answer(text)
 
@@ -73,26 +67,17 @@ async def process_receipt(message: Message, state: FSMContext):
     result = await api_client.upload_receipt(order_id, photo_bytes.read())
 
     if result:
-        # Trigger n8n for AI validation
-        await n8n_client.validate_receipt(
+        # Trigger n8n for AI validation; the verdict comes back to the
+        # backend callback, which notifies the customer and managers
+        n8n_client.validate_receipt_in_background(
             order_id=order_id,
             receipt_image_url=result["receipt_image_url"],
             expected_amount=result["total_amount"],
             order_code=result["order_code"]
         )
 
-        texts = {
-            "uk": "✅ Чек завантажено!\n\n⏳ Перевіряємо чек за допомогою AI...\n\nВи отримаєте повідомлення після перевірки.",
-            "en": "✅ Receipt uploaded!\n\n⏳ Validating receipt using AI...\n\nYou'll receive notification after validation.",
-            "ru": "✅ Чек загружен!\n\n⏳ Проверяем чек с помощью AI...\n\nВы получите уведомление после проверки."
-        }
-        await message.answer(texts.get(language, texts["uk"]))
+        await message.answer(t("bot.orders.receipt_uploaded", language))
     else:
-        texts = {
-            "uk": "❌ Помилка завантаження чека. Спробуйте ще раз.",
-            "en": "❌ Receipt upload error. Please try again.",
-            "ru": "❌ Ошибка загрузки чека. Попробуйте ещё раз."
-        }
-        await message.answer(texts.get(language, texts["uk"]))
+        await message.answer(t("bot.orders.receipt_upload_error", language))
 
     await state.clear()
@@ -14,7 +14,7 @@ from keyboards import (
     get_cities_keyboard,
     get_main_menu_keyboard
 )
-from services import api_client
+from services import api_client, t
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -35,15 +35,8 @@ async def cmd_start(message: Message, state: FSMContext):
         # User already registered
         language = user.get("language", "uk")
 
-        welcome_texts = {
-            "uk": f"Привіт, {user['full_name']}! 👋\n\n"
-                  f"Рад бачити вас знову! Використовуйте меню нижче для навігації.",
-            "en": f"Hello, {user['full_name']}! 👋\n\n"
-                  f"Good to see you again! Use the menu below for navigation."
-        }
-
         await message.answer(
-            welcome_texts.get(language, welcome_texts["uk"]),
+            t("bot.start.welcome_back", language, full_name=user["full_name"]),
             reply_markup=get_main_menu_keyboard(language)
         )
 
@@ -51,15 +44,6 @@ async def cmd_start(message: Message, state: FSMContext):
         await state.clear()
     else:
         # Start registration
-        registration_texts = {
-            "uk": "👋 Вітаємо в PizzaMat!\n\n"
-                  "Для оформлення замовлень, будь ласка, зареєструйтесь.\n\n"
-                  "📱 Поділіться номером телефону, щоб продовжити:",
-            "en": "👋 Welcome to PizzaMat!\n\n"
-                  "To place orders, please register.\n\n"
-                  "📱 Share your phone number to continue:"
-        }
-
         language_code = message.from_user.language_code or "uk"
         if language_code not in ["uk", "en", "ru"]:
             language_code = "uk"
@@ -68,7 +52,7 @@ async def cmd_start(message: Message, state: FSMContext):
         await state.set_state(RegistrationStates.waiting_for_phone)
 
         await message.answer(
-            registration_texts.get(language_code, registration_texts["uk"]),
+            t("bot.start.registration_intro", language_code),
             reply_markup=get_phone_keyboard(language_code)
         )
 
@@ -83,12 +67,8 @@ async def process_phone(message: Message, state: FSMContext):
 
     # Validate that the contact is user's own number
     if message.contact.user_id != message.from_user.id:
-        error_texts = {
-            "uk": "❌ Будь ласка, поділіться саме своїм номером телефону.",
-            "en": "❌ Please share your own phone number."
-        }
         await message.answer(
-            error_texts.get(language, error_texts["uk"]),
+            t("bot.start.own_phone_required", language),
             reply_markup=get_phone_keyboard(language)
         )
         return
@@ -101,15 +81,8 @@ async def process_phone(message: Message, state: FSMContext):
     # Ask for full name
     await state.set_state(RegistrationStates.waiting_for_name)
 
-    name_texts = {
-        "uk": "✅ Дякуємо!\n\n"
-              "Тепер введіть ваше повне ім'я:",
-        "en": "✅ Thank you!\n\n"
-              "Now enter your full name:"
-    }
-
     await message.answer(
-        name_texts.get(language, name_texts["uk"]),
+        t("bot.start.ask_full_name", language),
         reply_markup=ReplyKeyboardRemove()  # Remove keyboard
     )
 
@@ -126,11 +99,7 @@ async def process_name(message: Message, state: FSMContext):
 
     # Validate name (at least 2 characters)
     if len(full_name) < 2:
-        error_texts = {
-            "uk": "❌ Будь ласка, введіть коректне ім'я (мінімум 2 символи).",
-            "en": "❌ Please enter a valid name (at least 2 characters)."
-        }
-        await message.answer(error_texts.get(language, error_texts["uk"]))
+        await message.answer(t("bot.start.invalid_name", language))
         return
 
     # Store name
@@ -154,17 +123,42 @@ async def process_name(message: Message, state: FSMContext):
         await finalize_registration(message, state, city_id=None)
         return
 
-    city_texts = {
-        "uk": "🌆 Оберіть ваше місто:",
-        "en": "🌆 Select your city:"
-    }
-
     await message.answer(
-        city_texts.get(language, city_texts["uk"]),
+        t("bot.start.select_city", language),
         reply_markup=get_cities_keyboard(cities, language)
     )
 
 
+@router.callback_query(RegistrationStates.waiting_for_city, F.data.startswith("cities_page_"))
+async def process_cities_page(callback: CallbackQuery, state: FSMContext):
+    """
+    Handle city list pagination
+    """
+    data = await state.get_data()
+    language = data.get("language", "uk")
+    page = int(callback.data.split("_")[2])
+
+    cities_response = await api_client.get_cities()
+    cities = []
+    if cities_response and isinstance(cities_response, dict):
+        cities = cities_response.get("data", [])
+    elif cities_response and isinstance(cities_response, list):
+        cities = cities_response
+
+    await callback.message.edit_reply_markup(
+        reply_markup=get_cities_keyboard(cities, language, page=page)
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data == "noop")
+async def process_noop(callback: CallbackQuery):
+    """
+    Page indicator buttons do nothing
+    """
+    await callback.answer()
+
+
 @router.callback_query(RegistrationStates.waiting_for_city, F.data.startswith("city_"))
 async def process_city(callback: CallbackQuery, state: FSMContext):
     """
@@ -200,19 +194,8 @@ async def finalize_registration(message: Message, state: FSMContext, city_id: in
     )
 
     if user:
-        success_texts = {
-            "uk": f"✅ Реєстрація успішно завершена!\n\n"
-                  f"Вітаємо, {full_name}! 🎉\n\n"
-                  f"Тепер ви можете замовляти піцу через наш бот.\n"
-                  f"Використовуйте меню нижче для навігації.",
-            "en": f"✅ Registration completed successfully!\n\n"
-                  f"Welcome, {full_name}! 🎉\n\n"
-                  f"Now you can order pizza through our bot.\n"
-                  f"Use the menu below for navigation."
-        }
-
         await message.answer(
-            success_texts.get(language, success_texts["uk"]),
+            t("bot.start.registration_complete", language, full_name=full_name),
             reply_markup=get_main_menu_keyboard(language)
         )
 
@@ -221,12 +204,7 @@ async def finalize_registration(message: Message, state: FSMContext, city_id: in
 
         logger.info(f"User {telegram_id} registered successfully")
     else:
-        error_texts = {
-            "uk": "❌ Помилка при реєстрації. Спробуйте ще раз: /start",
-            "en": "❌ Registration error. Please try again: /start"
-        }
-
-        await message.answer(error_texts.get(language, error_texts["uk"]))
+        await message.answer(t("bot.start.registration_error", language))
         await state.clear()
 
         logger.error(f"Failed to register user {telegram_id}")
@@ -8,26 +8,20 @@ import random
 import string
 
 from states import SupportStates
-from services import api_client
+from services import api_client, send_in_background, Priority, t, button_text
 from config import settings
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-@router.message(F.text.in_(["💬 Підтримка", "💬 Support", "💬 Поддержка", "/support"]))
+@router.message(F.text.func(button_text("bot.btn.support", "/support")))
 async def cmd_support(message: Message, state: FSMContext, user: dict):
     """Start support conversation"""
     language = user.get("language", "uk")
 
-    texts = {
-        "uk": "💬 Підтримка\n\nОпишіть вашу проблему або питання.\nМенеджер відповість вам найближчим часом.",
-        "en": "💬 Support\n\nDescribe your issue or question.\nManager will respond to you soon.",
-        "ru": "💬 Поддержка\n\nОпишите вашу проблему или вопрос.\nМенеджер ответит вам в ближайшее время."
-    }
-
     await state.set_state(SupportStates.waiting_for_message)
-    await message.answer(texts.get(language, texts["uk"]))
+    await message.answer(t("bot.support.intro", language))
 
 
 @router.message(SupportStates.waiting_for_message, F.text)
@@ -53,23 +47,12 @@ async def process_support_message(message: Message, state: FSMContext, user: dic
         manager_text += f"📞 Телефон: {user['phone']}\n\n"
         manager_text += f"Повідомлення:\n{message.text}"
 
-        try:
-            await message.bot.send_message(settings.MANAGER_CHANNEL_ID, manager_text)
-        except Exception as e:
-            logger.error(f"Failed to send to manager: {e}")
+        send_in_background(
+            message.bot, settings.MANAGER_CHANNEL_ID, manager_text, priority=Priority.MANAGER
+        )
 
-        texts = {
-            "uk": f"✅ Ваше повідомлення надіслано!\n\nНомер звернення: {ticket_id}\n\nМенеджер відповість найближчим часом.",
-            "en": f"✅ Your message has been sent!\n\nTicket number: {ticket_id}\n\nManager will respond soon.",
-            "ru": f"✅ Ваше сообщение отправлено!\n\nНомер обращения: {ticket_id}\n\nМенеджер ответит в ближайшее время."
-        }
-        await message.answer(texts.get(language, texts["uk"]))
+        await message.answer(t("bot.support.sent", language, ticket_id=ticket_id))
     else:
-        texts = {
-            "uk": "❌ Помилка відправки. Спробуйте ще раз.",
-            "en": "❌ Send error. Please try again.",
-            "ru": "❌ Ошибка отправки. Попробуйте ещё раз."
-        }
-        await message.answer(texts.get(language, texts["uk"]))
+        await message.answer(t("bot.support.send_error", language))
 
     await state.clear()
@@ -5,11 +5,15 @@ from .main_menu import (
     get_phone_keyboard,
     get_webapp_keyboard,
     get_cities_keyboard,
-    get_locations_keyboard,
     get_order_actions_keyboard,
     get_manager_order_keyboard,
     get_language_keyboard,
-    get_cancel_keyboard
+    get_cancel_keyboard,
+    build_static_keyboards,
+    keyboard_registry,
+    webapp_texts,
+    order_actions_texts,
+    manager_order_texts
 )
 
 __all__ = [
@@ -17,9 +21,13 @@ __all__ = [
     "get_phone_keyboard",
     "get_webapp_keyboard",
     "get_cities_keyboard",
-    "get_locations_keyboard",
     "get_order_actions_keyboard",
     "get_manager_order_keyboard",
     "get_language_keyboard",
-    "get_cancel_keyboard"
+    "get_cancel_keyboard",
+    "build_static_keyboards",
+    "keyboard_registry",
+    "webapp_texts",
+    "order_actions_texts",
+    "manager_order_texts"
 ]
@@ -1,7 +1,20 @@
 """
 Main menu keyboards for bot navigation
+
+Button texts come from the shared message catalog (services.i18n).
+Static keyboards depend only on the language, so they are built once per
+supported language (build_static_keyboards() at startup) and served from
+KeyboardRegistry as frozen instances. Parametrized keyboards (per order or
+user) are built per call from per-language button texts, which are the only
+part cached. Data-dependent keyboards (cities) are cached by content version
+and paginated. Everything derived from catalog texts is dropped when the
+catalog is (re)loaded.
 """
 
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+
 from aiogram.types import (
     ReplyKeyboardMarkup,
     KeyboardButton,
@@ -9,248 +22,337 @@ from aiogram.types import (
     InlineKeyboardButton,
     WebAppInfo
 )
-from typing import List, Optional
+from pydantic import ConfigDict
 
+from config import settings
+from services.i18n import catalog, t
 
-def get_main_menu_keyboard(language: str = "uk") -> ReplyKeyboardMarkup:
-    """
-    Get main menu keyboard with common actions
-    """
-    texts = {
-        "uk": {
-            "menu": "🍕 Меню",
-            "orders": "📦 Мої замовлення",
-            "support": "💬 Підтримка",
-            "settings": "⚙️ Налаштування"
-        },
-        "en": {
-            "menu": "🍕 Menu",
-            "orders": "📦 My Orders",
-            "support": "💬 Support",
-            "settings": "⚙️ Settings"
-        },
-        "ru": {
-            "menu": "🍕 Меню",
-            "orders": "📦 Мои заказы",
-            "support": "💬 Поддержка",
-            "settings": "⚙️ Настройки"
-        }
-    }
-
-    t = texts.get(language, texts["uk"])
-
-    keyboard = ReplyKeyboardMarkup(
+
+Markup = Union[ReplyKeyboardMarkup, InlineKeyboardMarkup]
+
+# Max buttons per page for data-dependent keyboards
+PAGE_SIZE = 8
+
+
+# ==================== Frozen markup types ====================
+# Registry instances are shared between all updates, so they must not be
+# mutated by handlers
+
+class FrozenKeyboardButton(KeyboardButton):
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenReplyKeyboardMarkup(ReplyKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+
+# ==================== Registry ====================
+
+class KeyboardRegistry:
+    """Builds language-dependent static keyboards once and serves them"""
+
+    def __init__(self, languages: List[str], default_language: str):
+        self.languages = list(languages)
+        self.default_language = default_language
+        self._builders: Dict[str, Callable[[str], Markup]] = {}
+        self._keyboards: Dict[Tuple[str, str], Markup] = {}
+
+    def register(self, name: str):
+        """Decorator registering a builder(language) -> markup"""
+        def decorator(builder: Callable[[str], Markup]) -> Callable[[str], Markup]:
+            self._builders[name] = builder
+            return builder
+        return decorator
+
+    def build_all(self):
+        """Build every registered keyboard for every supported language"""
+        for name, builder in self._builders.items():
+            for language in self.languages:
+                self._keyboards[(name, language)] = builder(language)
+
+    def clear(self):
+        """Drop built keyboards, they are rebuilt on next get()"""
+        self._keyboards.clear()
+
+    def get(self, name: str, language: str) -> Markup:
+        """Get prebuilt keyboard, falling back to default language"""
+        if language not in self.languages:
+            language = self.default_language
+        keyboard = self._keyboards.get((name, language))
+        if keyboard is None:
+            keyboard = self._builders[name](language)
+            self._keyboards[(name, language)] = keyboard
+        return keyboard
+
+
+keyboard_registry = KeyboardRegistry(settings.SUPPORTED_LANGUAGES, settings.DEFAULT_LANGUAGE)
+
+
+def build_static_keyboards():
+    """Prebuild all static keyboards (call once at startup)"""
+    keyboard_registry.build_all()
+
+
+@keyboard_registry.register("main_menu")
+def _build_main_menu(language: str) -> ReplyKeyboardMarkup:
+    return FrozenReplyKeyboardMarkup(
         keyboard=[
-            [KeyboardButton(text=t["menu"])],
-            [KeyboardButton(text=t["orders"]), KeyboardButton(text=t["support"])],
-            [KeyboardButton(text=t["settings"])]
+            [FrozenKeyboardButton(text=t("bot.btn.menu", language))],
+            [
+                FrozenKeyboardButton(text=t("bot.btn.orders", language)),
+                FrozenKeyboardButton(text=t("bot.btn.support", language))
+            ],
+            [FrozenKeyboardButton(text=t("bot.btn.settings", language))]
         ],
         resize_keyboard=True,
         one_time_keyboard=False
     )
 
-    return keyboard
 
+@keyboard_registry.register("phone")
+def _build_phone(language: str) -> ReplyKeyboardMarkup:
+    return FrozenReplyKeyboardMarkup(
+        keyboard=[
+            [FrozenKeyboardButton(text=t("bot.btn.share_phone", language), request_contact=True)]
+        ],
+        resize_keyboard=True,
+        one_time_keyboard=True
+    )
 
-def get_phone_keyboard(language: str = "uk") -> ReplyKeyboardMarkup:
-    """
-    Get keyboard for phone number sharing
-    """
-    texts = {
-        "uk": "📱 Поділитися номером",
-        "en": "📱 Share phone number",
-        "ru": "📱 Поделиться номером"
-    }
 
-    text = texts.get(language, texts["uk"])
+@keyboard_registry.register("language")
+def _build_language(language: str) -> InlineKeyboardMarkup:
+    return FrozenInlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                FrozenInlineKeyboardButton(text="🇺🇦 Українська", callback_data="lang_uk"),
+                FrozenInlineKeyboardButton(text="🇬🇧 English", callback_data="lang_en")
+            ],
+            [
+                FrozenInlineKeyboardButton(text="🇷🇺 Русский", callback_data="lang_ru")
+            ]
+        ]
+    )
+
 
-    keyboard = ReplyKeyboardMarkup(
+@keyboard_registry.register("cancel")
+def _build_cancel(language: str) -> ReplyKeyboardMarkup:
+    return FrozenReplyKeyboardMarkup(
         keyboard=[
-            [KeyboardButton(text=text, request_contact=True)]
+            [FrozenKeyboardButton(text=t("bot.btn.cancel", language))]
         ],
         resize_keyboard=True,
         one_time_keyboard=True
     )
 
-    return keyboard
 
+# ==================== Static keyboards ====================
 
-def get_webapp_keyboard(webapp_url: str, language: str = "uk") -> InlineKeyboardMarkup:
+def get_main_menu_keyboard(language: str = "uk") -> ReplyKeyboardMarkup:
     """
-    Get keyboard with WebApp button to open menu
+    Get main menu keyboard with common actions
     """
-    texts = {
-        "uk": "🍕 Відкрити меню",
-        "en": "🍕 Open menu",
-        "ru": "🍕 Открыть меню"
-    }
+    return keyboard_registry.get("main_menu", language)
 
-    text = texts.get(language, texts["uk"])
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(
-                text=text,
-                web_app=WebAppInfo(url=webapp_url)
-            )]
-        ]
-    )
+def get_phone_keyboard(language: str = "uk") -> ReplyKeyboardMarkup:
+    """
+    Get keyboard for phone number sharing
+    """
+    return keyboard_registry.get("phone", language)
+
 
-    return keyboard
+def get_language_keyboard() -> InlineKeyboardMarkup:
+    """
+    Get keyboard for language selection
+    """
+    return keyboard_registry.get("language", keyboard_registry.default_language)
 
 
-def get_cities_keyboard(cities: List[dict], language: str = "uk") -> InlineKeyboardMarkup:
+def get_cancel_keyboard(language: str = "uk") -> ReplyKeyboardMarkup:
     """
-    Get keyboard for city selection
+    Get keyboard with cancel button
     """
-    buttons = []
+    return keyboard_registry.get("cancel", language)
 
-    for city in cities:
-        buttons.append([InlineKeyboardButton(
-            text=f"📍 {city['name']}",
-            callback_data=f"city_{city['id']}"
-        )])
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
-    return keyboard
+# ==================== Parametrized keyboards ====================
+# Keyed by language only, so the caches stay as small as the language list
+# while the markups (one per order or user) are not kept at all
 
+@lru_cache(maxsize=32)
+def webapp_texts(language: str) -> Tuple[str]:
+    return (t("bot.btn.open_menu", language),)
 
-def get_locations_keyboard(locations: List[dict], language: str = "uk") -> InlineKeyboardMarkup:
-    """
-    Get keyboard for pickup location selection
-    """
-    buttons = []
 
-    for location in locations:
-        buttons.append([InlineKeyboardButton(
-            text=f"📍 {location['name']}",
-            callback_data=f"location_{location['id']}"
-        )])
+@lru_cache(maxsize=32)
+def order_actions_texts(language: str) -> Tuple[str, str, str]:
+    return (
+        t("bot.btn.upload_receipt", language),
+        t("bot.btn.order_details", language),
+        t("bot.btn.cancel_order", language)
+    )
+
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
-    return keyboard
+@lru_cache(maxsize=32)
+def manager_order_texts(language: str) -> Tuple[str, str]:
+    return (
+        t("bot.btn.confirm", language),
+        t("bot.btn.reject", language)
+    )
+
+
+def get_webapp_keyboard(webapp_url: str, language: str = "uk") -> InlineKeyboardMarkup:
+    """
+    Get keyboard with WebApp button to open menu
+    """
+    (open_menu,) = webapp_texts(language)
+    return FrozenInlineKeyboardMarkup(
+        inline_keyboard=[
+            [FrozenInlineKeyboardButton(
+                text=open_menu,
+                web_app=WebAppInfo(url=webapp_url)
+            )]
+        ]
+    )
 
 
 def get_order_actions_keyboard(order_id: int, language: str = "uk") -> InlineKeyboardMarkup:
     """
     Get keyboard for order actions (upload receipt, cancel, etc.)
     """
-    texts = {
-        "uk": {
-            "upload_receipt": "📸 Завантажити чек",
-            "cancel": "❌ Скасувати замовлення",
-            "view_details": "📋 Деталі замовлення"
-        },
-        "en": {
-            "upload_receipt": "📸 Upload receipt",
-            "cancel": "❌ Cancel order",
-            "view_details": "📋 Order details"
-        },
-        "ru": {
-            "upload_receipt": "📸 Загрузить чек",
-            "cancel": "❌ Отменить заказ",
-            "view_details": "📋 Детали заказа"
-        }
-    }
-
-    t = texts.get(language, texts["uk"])
-
-    keyboard = InlineKeyboardMarkup(
+    upload_receipt, order_details, cancel_order = order_actions_texts(language)
+    return FrozenInlineKeyboardMarkup(
         inline_keyboard=[
-            [InlineKeyboardButton(
-                text=t["upload_receipt"],
+            [FrozenInlineKeyboardButton(
+                text=upload_receipt,
                 callback_data=f"upload_receipt_{order_id}"
             )],
-            [InlineKeyboardButton(
-                text=t["view_details"],
+            [FrozenInlineKeyboardButton(
+                text=order_details,
                 callback_data=f"order_details_{order_id}"
             )],
-            [InlineKeyboardButton(
-                text=t["cancel"],
+            [FrozenInlineKeyboardButton(
+                text=cancel_order,
                 callback_data=f"cancel_order_{order_id}"
             )]
         ]
     )
 
-    return keyboard
-
 
 def get_manager_order_keyboard(order_id: int, language: str = "uk") -> InlineKeyboardMarkup:
     """
     Get keyboard for manager to confirm/reject order
     """
-    texts = {
-        "uk": {
-            "confirm": "✅ Підтвердити",
-            "reject": "❌ Відхилити"
-        },
-        "en": {
-            "confirm": "✅ Confirm",
-            "reject": "❌ Reject"
-        },
-        "ru": {
-            "confirm": "✅ Подтвердить",
-            "reject": "❌ Отклонить"
-        }
-    }
-
-    t = texts.get(language, texts["uk"])
-
-    keyboard = InlineKeyboardMarkup(
+    confirm, reject = manager_order_texts(language)
+    return FrozenInlineKeyboardMarkup(
         inline_keyboard=[
             [
-                InlineKeyboardButton(
-                    text=t["confirm"],
+                FrozenInlineKeyboardButton(
+                    text=confirm,
                     callback_data=f"manager_confirm_{order_id}"
                 ),
-                InlineKeyboardButton(
-                    text=t["reject"],
+                FrozenInlineKeyboardButton(
+                    text=reject,
                     callback_data=f"manager_reject_{order_id}"
                 )
             ]
         ]
     )
 
-    return keyboard
 
+# ==================== Data-dependent keyboards ====================
 
-def get_language_keyboard() -> InlineKeyboardMarkup:
-    """
-    Get keyboard for language selection
-    """
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(text="🇺🇦 Українська", callback_data="lang_uk"),
-                InlineKeyboardButton(text="🇬🇧 English", callback_data="lang_en")
-            ],
-            [
-                InlineKeyboardButton(text="🇷🇺 Русский", callback_data="lang_ru")
-            ]
-        ]
-    )
+class VersionedKeyboardCache:
+    """LRU cache of list keyboards keyed by content version and page"""
 
-    return keyboard
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, InlineKeyboardMarkup]" = OrderedDict()
 
+    def get_or_build(self, key: Hashable, builder: Callable[[], InlineKeyboardMarkup]) -> InlineKeyboardMarkup:
+        keyboard = self._items.get(key)
+        if keyboard is not None:
+            self._items.move_to_end(key)
+            return keyboard
+        keyboard = builder()
+        self._items[key] = keyboard
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return keyboard
 
-def get_cancel_keyboard(language: str = "uk") -> ReplyKeyboardMarkup:
+    def clear(self):
+        self._items.clear()
+
+
+list_keyboard_cache = VersionedKeyboardCache()
+
+
+def content_version(items: List[dict]) -> Hashable:
+    """Version key of a list of {'id', 'name'} items"""
+    return tuple((item["id"], item["name"]) for item in items)
+
+
+def _build_paginated_keyboard(
+    items: List[dict],
+    item_prefix: str,
+    page_prefix: str,
+    page: int
+) -> InlineKeyboardMarkup:
+    pages = max(1, (len(items) + PAGE_SIZE - 1) // PAGE_SIZE)
+    page = min(max(page, 0), pages - 1)
+    start = page * PAGE_SIZE
+
+    buttons = [
+        [FrozenInlineKeyboardButton(
+            text=f"📍 {item['name']}",
+            callback_data=f"{item_prefix}{item['id']}"
+        )]
+        for item in items[start:start + PAGE_SIZE]
+    ]
+
+    if pages > 1:
+        navigation = []
+        if page > 0:
+            navigation.append(FrozenInlineKeyboardButton(text="◀️", callback_data=f"{page_prefix}{page - 1}"))
+        navigation.append(FrozenInlineKeyboardButton(text=f"{page + 1}/{pages}", callback_data="noop"))
+        if page < pages - 1:
+            navigation.append(FrozenInlineKeyboardButton(text="▶️", callback_data=f"{page_prefix}{page + 1}"))
+        buttons.append(navigation)
+
+    return FrozenInlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_cities_keyboard(
+    cities: List[dict],
+    language: str = "uk",
+    page: int = 0,
+    version: Optional[Hashable] = None
+) -> InlineKeyboardMarkup:
     """
-    Get keyboard with cancel button
+    Get keyboard for city selection
+    Paginated by PAGE_SIZE, navigation callbacks are "cities_page_<n>"
     """
-    texts = {
-        "uk": "❌ Скасувати",
-        "en": "❌ Cancel",
-        "ru": "❌ Отменить"
-    }
+    version = version if version is not None else content_version(cities)
+    return list_keyboard_cache.get_or_build(
+        ("cities", version, page),
+        lambda: _build_paginated_keyboard(cities, "city_", "cities_page_", page)
+    )
 
-    text = texts.get(language, texts["uk"])
 
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text=text)]
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True
-    )
+# ==================== Invalidation ====================
 
-    return keyboard
+@catalog.on_load
+def _clear_text_caches():
+    """Drop keyboards and button texts built from the previous catalog"""
+    keyboard_registry.clear()
+    for texts in (webapp_texts, order_actions_texts, manager_order_texts):
+        texts.cache_clear()
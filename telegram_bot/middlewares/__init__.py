@@ -2,5 +2,19 @@
 
 from .auth_middleware import AuthMiddleware
 from .logging_middleware import InteractionLoggingMiddleware, SessionTrackingMiddleware
+from .metrics_middleware import HandlerMetricsMiddleware
+from .tracing_middleware import (
+    UpdateTracingMiddleware,
+    HandlerTracingMiddleware,
+    TelegramRequestTracingMiddleware
+)
 
-__all__ = ["AuthMiddleware", "InteractionLoggingMiddleware", "SessionTrackingMiddleware"]
+__all__ = [
+    "AuthMiddleware",
+    "InteractionLoggingMiddleware",
+    "SessionTrackingMiddleware",
+    "HandlerMetricsMiddleware",
+    "UpdateTracingMiddleware",
+    "HandlerTracingMiddleware",
+    "TelegramRequestTracingMiddleware",
+]
@@ -0,0 +1,41 @@
+"""
+Handler metrics middleware
+Records duration and result of every handler call
+"""
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from typing import Callable, Dict, Any, Awaitable
+import time
+
+from services.metrics import HANDLER_CALLS, HANDLER_DURATION
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Inner middleware timing the matched handler
+    Register on observers (dp.message, dp.callback_query) so the handler is known
+    """
+
+    def __init__(self, event_type: str):
+        self.event_type = event_type
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get("handler")
+        name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+
+        started = time.perf_counter()
+        result = "ok"
+        try:
+            return await handler(event, data)
+        except Exception:
+            result = "error"
+            raise
+        finally:
+            HANDLER_DURATION.labels(self.event_type, name).observe(time.perf_counter() - started)
+            HANDLER_CALLS.labels(self.event_type, name, result).inc()
@@ -0,0 +1,71 @@
+"""
+Tracing middlewares
+One span per update (root), per handler and per Telegram API call, so an
+update's time splits into middlewares, backend/n8n calls, handler work and
+Telegram requests
+"""
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+from aiogram.types import TelegramObject, Update
+from typing import Callable, Dict, Any, Awaitable
+from datetime import datetime, timezone
+
+from services.tracing import tracer
+
+
+class UpdateTracingMiddleware(BaseMiddleware):
+    """
+    Outer update middleware starting the trace of an update
+    Register with dp.update.outer_middleware() so it wraps all other middlewares
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        event_type = event.event_type
+        with tracer.span(f"update {event_type}", kind="server") as span:
+            span.set_attribute("telegram.update_id", event.update_id)
+            inner = event.event
+            user = getattr(inner, "from_user", None)
+            if user is not None:
+                span.set_attribute("telegram.user_id", user.id)
+            # Time the update spent in Telegram before we received it
+            sent_at = getattr(inner, "date", None)
+            if isinstance(sent_at, datetime):
+                delay = datetime.now(timezone.utc) - sent_at
+                span.set_attribute("telegram.delivery_delay_s", round(delay.total_seconds(), 3))
+            return await handler(event, data)
+
+
+class HandlerTracingMiddleware(BaseMiddleware):
+    """Inner middleware adding a span for the matched handler"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get("handler")
+        name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+        with tracer.span(f"handler {name}"):
+            return await handler(event, data)
+
+
+class TelegramRequestTracingMiddleware(BaseRequestMiddleware):
+    """Bot session middleware adding a span per Telegram API call"""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        with tracer.span(f"telegram {type(method).__name__}", kind="client"):
+            return await make_request(bot, method)
@@ -2,5 +2,18 @@
 
 from .api_client import api_client
 from .n8n_client import n8n_client
+from .outbound import outbound_scheduler, send_priority, send_in_background, Priority
+from .i18n import catalog, load_catalog, t, button_text
 
-__all__ = ["api_client", "n8n_client"]
+__all__ = [
+    "api_client",
+    "n8n_client",
+    "outbound_scheduler",
+    "send_priority",
+    "send_in_background",
+    "Priority",
+    "catalog",
+    "load_catalog",
+    "t",
+    "button_text",
+]
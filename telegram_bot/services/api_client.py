@@ -8,6 +8,8 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from config import settings
+from .metrics import MetricsTransport
+from .tracing import tracer, inject_headers
 
 logger = logging.getLogger(__name__)
 
@@ -30,24 +32,30 @@ class BackendAPIClient:
         """Make HTTP request to backend"""
         url = f"{self.base_url}{endpoint}"
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    data=data,
-                    json=json_data,
-                    files=files
-                )
-                response.raise_for_status()
-                return response.json()
-
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
-            return None
-        except Exception as e:
-            logger.error(f"Request error: {e}")
-            return None
+        with tracer.span(f"backend {method} {endpoint}", kind="client") as span:
+            try:
+                async with httpx.AsyncClient(timeout=self.timeout, transport=MetricsTransport("backend")) as client:
+                    response = await client.request(
+                        method=method,
+                        url=url,
+                        data=data,
+                        json=json_data,
+                        files=files,
+                        headers=inject_headers()
+                    )
+                    span.set_attribute("http.status_code", response.status_code)
+                    response.raise_for_status()
+                    return response.json()
+
+            except httpx.HTTPStatusError as e:
+                span.status = "error"
+                logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
+                return None
+            except Exception as e:
+                span.status = "error"
+                span.set_attribute("error", str(e))
+                logger.error(f"Request error: {e}")
+                return None
 
     # ==================== User Endpoints ====================
 
@@ -98,6 +106,10 @@ class BackendAPIClient:
         result = await self._request("GET", endpoint)
         return result if result else []
 
+    async def get_menu_changes(self, since: int = 0) -> Optional[Dict[str, Any]]:
+        """Catalog rows changed since a catalog version (version, reset, changes)"""
+        return await self._request("GET", f"/api/menu/changes?since={since}")
+
     async def get_locations(self, city_id: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
         """Get all active pickup locations"""
         endpoint = "/api/pickup-locations"
@@ -111,6 +123,10 @@ class BackendAPIClient:
         result = await self._request("GET", "/api/cities")
         return result if result else []
 
+    async def get_message_catalog(self) -> Optional[Dict[str, Any]]:
+        """Get shared i18n message catalog"""
+        return await self._request("GET", "/api/i18n/catalog")
+
     # ==================== Order Endpoints ====================
 
     async def create_order(
@@ -0,0 +1,114 @@
+"""
+Bot message catalog
+
+The bot uses the backend's catalog (backend/app/locales/messages.json). It
+is fetched once from GET /api/i18n/catalog at startup already resolved: one
+table per language (key -> text) with the backend's fallback language
+merged in, so both sides render a key in the same language. The bot only
+looks texts up and fills their placeholders.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+from config import settings
+from .api_client import api_client
+
+logger = logging.getLogger(__name__)
+
+
+class MessageCatalog:
+    """Resolved per-language message tables"""
+
+    def __init__(self, languages: List[str], default_language: str):
+        self.languages = list(languages)
+        self.default_language = default_language
+        self.tables: Dict[str, Dict[str, str]] = {language: {} for language in self.languages}
+        self._variants: Dict[str, FrozenSet[str]] = {}
+        self._load_listeners: List[Callable[[], None]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return any(self.tables.values())
+
+    def load(self, tables: Dict[str, Dict[str, str]]):
+        """Replace catalog contents with resolved tables (language -> key -> text)"""
+        self.tables = {language: dict(tables.get(language, {})) for language in self.languages}
+        self._variants = {}
+        for listener in self._load_listeners:
+            listener()
+
+    def on_load(self, listener: Callable[[], None]):
+        """Call listener after every load() (to drop texts cached elsewhere)"""
+        self._load_listeners.append(listener)
+
+    def t(self, key: str, language: Optional[str] = None, **kwargs) -> str:
+        """Translate key to language (the key itself if unknown)"""
+        table = self.tables.get(language) or self.tables[self.default_language]
+        text = table.get(key, key)
+        if "{" not in text:
+            return text
+        try:
+            return text.format(**kwargs)
+        except (KeyError, IndexError):
+            # Missing argument: raw text, like the backend
+            return text
+
+    def variants(self, key: str) -> FrozenSet[str]:
+        """All language texts of a key (to match reply keyboard buttons)"""
+        variants = self._variants.get(key)
+        if variants is None:
+            variants = frozenset(self.t(key, language) for language, table in self.tables.items() if key in table)
+            if self.loaded:
+                self._variants[key] = variants
+        return variants
+
+
+catalog = MessageCatalog(settings.SUPPORTED_LANGUAGES, settings.DEFAULT_LANGUAGE)
+
+
+async def load_catalog():
+    """
+    Load the catalog from the backend (call once at startup)
+
+    The backend may still be starting (cold deploy, migrations), so the
+    request is retried with exponential backoff up to
+    CATALOG_LOAD_ATTEMPTS times before giving up.
+
+    Raises:
+        RuntimeError: If catalog is not available from backend
+    """
+    delay = settings.CATALOG_LOAD_BACKOFF
+    for attempt in range(1, settings.CATALOG_LOAD_ATTEMPTS + 1):
+        response = await api_client.get_message_catalog()
+        if response and response.get("data"):
+            catalog.load(response["data"])
+            logger.info("Message catalog loaded from backend")
+            return
+        if attempt == settings.CATALOG_LOAD_ATTEMPTS:
+            break
+        logger.warning(
+            f"Message catalog is not available (attempt {attempt}/{settings.CATALOG_LOAD_ATTEMPTS}), "
+            f"retrying in {delay:.0f}s"
+        )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.CATALOG_LOAD_BACKOFF_MAX)
+    raise RuntimeError("Message catalog is not available")
+
+
+def t(key: str, language: Optional[str] = None, **kwargs) -> str:
+    """Shorthand for catalog.t()"""
+    return catalog.t(key, language, **kwargs)
+
+
+def button_text(key: str, *commands: str) -> Callable[[Optional[str]], bool]:
+    """
+    Predicate matching a reply button in any language or one of commands
+
+    Usage:
+        @router.message(F.text.func(button_text("bot.btn.menu", "/menu")))
+    """
+    def matches(text: Optional[str]) -> bool:
+        return text in commands or text in catalog.variants(key)
+    return matches
@@ -0,0 +1,145 @@
+"""
+Prometheus metrics for the bot
+Handler durations, outgoing HTTP calls (backend, n8n), outbound scheduler
+state and keyboard cache hit rates, served by a small aiohttp server on
+METRICS_PORT (GET /metrics).
+"""
+
+import logging
+import time
+from typing import Optional
+
+import httpx
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+HANDLER_DURATION = Histogram(
+    "bot_handler_duration_seconds",
+    "aiogram handler execution time",
+    ["event_type", "handler"],
+    buckets=LATENCY_BUCKETS,
+)
+HANDLER_CALLS = Counter(
+    "bot_handler_calls_total",
+    "aiogram handler calls by result (ok/error)",
+    ["event_type", "handler", "result"],
+)
+
+HTTP_CLIENT_REQUESTS = Counter(
+    "http_client_requests_total",
+    "Outgoing HTTP requests",
+    ["client", "method", "status"],
+)
+HTTP_CLIENT_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Outgoing HTTP request latency",
+    ["client", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """httpx transport recording outgoing request count and latency"""
+
+    def __init__(self, client: str, **transport_kwargs):
+        self.client = client
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            HTTP_CLIENT_REQUESTS.labels(self.client, request.method, status).inc()
+            HTTP_CLIENT_DURATION.labels(self.client, request.method).observe(time.perf_counter() - started)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class OutboundSchedulerCollector:
+    """Exposes OutboundScheduler.metrics() at scrape time"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+    def collect(self):
+        snapshot = self.scheduler.metrics()
+
+        granted = CounterMetricFamily(
+            "bot_outbound_granted", "Send slots granted per priority lane", labels=["lane"]
+        )
+        for lane, value in snapshot["granted_total"].items():
+            granted.add_metric([lane], value)
+        yield granted
+
+        depth = GaugeMetricFamily("bot_outbound_queue_depth", "Sends waiting per priority lane", labels=["lane"])
+        for lane, value in snapshot["queue_depth"].items():
+            depth.add_metric([lane], value)
+        yield depth
+
+        yield CounterMetricFamily("bot_outbound_retry_after", "Telegram RetryAfter responses", value=snapshot["retry_after_total"])
+        yield CounterMetricFamily("bot_outbound_failed", "Sends failed after retries", value=snapshot["failed_total"])
+        yield CounterMetricFamily("bot_outbound_dropped", "Sends cancelled while queued", value=snapshot["dropped_total"])
+        yield CounterMetricFamily("bot_outbound_wait_seconds", "Total time sends waited for a slot", value=snapshot["wait_seconds_total"])
+        yield GaugeMetricFamily("bot_outbound_wait_seconds_max", "Longest wait for a send slot", value=snapshot["wait_seconds_max"])
+        yield GaugeMetricFamily("bot_outbound_chat_buckets", "Per-chat rate buckets in memory", value=snapshot["chat_buckets"])
+
+
+class KeyboardCacheCollector:
+    """Exposes hit/miss counts of the keyboard text lru_caches"""
+
+    def __init__(self, **cached_functions):
+        self.cached_functions = cached_functions
+
+    def collect(self):
+        requests = CounterMetricFamily(
+            "bot_keyboard_cache_requests", "Keyboard cache lookups", labels=["keyboard", "result"]
+        )
+        for name, function in self.cached_functions.items():
+            info = function.cache_info()
+            requests.add_metric([name, "hit"], info.hits)
+            requests.add_metric([name, "miss"], info.misses)
+        yield requests
+
+
+async def _metrics_handler(request: web.Request) -> web.Response:
+    return web.Response(body=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
+async def start_metrics_server(port: int, host: str = "0.0.0.0") -> Optional[web.AppRunner]:
+    """
+    Serve GET /metrics on given port (0 disables)
+
+    Returns:
+        Runner to pass to stop_metrics_server()
+    """
+    if not port:
+        return None
+    app = web.Application()
+    app.router.add_get("/metrics", _metrics_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Metrics server listening on {host}:{port}")
+    return runner
+
+
+async def stop_metrics_server(runner: Optional[web.AppRunner]):
+    if runner:
+        await runner.cleanup()
+
+
+def register_collectors(scheduler, **keyboard_caches):
+    """Register scrape-time collectors (call once at startup)"""
+    REGISTRY.register(OutboundSchedulerCollector(scheduler))
+    REGISTRY.register(KeyboardCacheCollector(**keyboard_caches))
@@ -2,11 +2,14 @@
 n8n webhook client for triggering workflows
 """
 
+import asyncio
 import httpx
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 
 from config import settings
+from .metrics import MetricsTransport
+from .tracing import tracer, inject_headers
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,8 @@ class N8NClient:
     def __init__(self):
         self.base_url = settings.N8N_URL
         self.webhook_secret = settings.N8N_WEBHOOK_SECRET
+        self.callback_base_url = settings.BACKEND_CALLBACK_URL or settings.BACKEND_URL
+        self._background_tasks: Set[asyncio.Task] = set()
 
     async def _trigger_webhook(
         self,
@@ -35,22 +40,27 @@ class N8NClient:
         if self.webhook_secret:
             headers["X-Webhook-Secret"] = self.webhook_secret
 
-        try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    url=url,
-                    json=data,
-                    headers=headers
-                )
-                response.raise_for_status()
-                return response.json()
-
-        except httpx.HTTPStatusError as e:
-            logger.error(f"n8n webhook error {e.response.status_code}: {e.response.text}")
-            return None
-        except Exception as e:
-            logger.error(f"n8n webhook request error: {e}")
-            return None
+        with tracer.span(f"n8n POST {webhook_path}", kind="client") as span:
+            try:
+                async with httpx.AsyncClient(timeout=30, transport=MetricsTransport("n8n")) as client:
+                    response = await client.post(
+                        url=url,
+                        json=data,
+                        headers=inject_headers(headers)
+                    )
+                    span.set_attribute("http.status_code", response.status_code)
+                    response.raise_for_status()
+                    return response.json()
+
+            except httpx.HTTPStatusError as e:
+                span.status = "error"
+                logger.error(f"n8n webhook error {e.response.status_code}: {e.response.text}")
+                return None
+            except Exception as e:
+                span.status = "error"
+                span.set_attribute("error", str(e))
+                logger.error(f"n8n webhook request error: {e}")
+                return None
 
     async def validate_receipt(
         self,
@@ -61,18 +71,42 @@ class N8NClient:
     ) -> Optional[Dict[str, Any]]:
         """
         Trigger receipt validation workflow
-        n8n will use GPT-4o Vision to validate the receipt
+        n8n will use GPT-4o Vision to validate the receipt and POST the
+        signed verdict to callback_url (backend /validate-result endpoint)
         """
         data = {
             "order_id": order_id,
             "receipt_image_url": receipt_image_url,
             "expected_amount": expected_amount,
             "order_code": order_code,
+            "callback_url": f"{self.callback_base_url}/api/orders/{order_id}/validate-result",
             "trigger_source": "telegram_bot"
         }
 
         return await self._trigger_webhook("/webhook/validate-receipt", data)
 
+    def validate_receipt_in_background(
+        self,
+        order_id: int,
+        receipt_image_url: str,
+        expected_amount: float,
+        order_code: str
+    ) -> None:
+        """
+        Fire-and-forget receipt validation trigger
+        The verdict arrives asynchronously via the backend callback, so the
+        handler never waits for n8n or the LLM
+        """
+        task = asyncio.create_task(self.validate_receipt(
+            order_id=order_id,
+            receipt_image_url=receipt_image_url,
+            expected_amount=expected_amount,
+            order_code=order_code
+        ))
+        # Keep a reference until done so the task isn't garbage collected
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def notify_manager(
         self,
         order_id: int,
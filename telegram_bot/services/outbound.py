@@ -0,0 +1,373 @@
+"""
+Outbound message scheduler
+Keeps every Telegram API send within the Bot API limits:
+~30 messages/second globally, 1 message/second per private chat and
+20 messages/minute per group or channel.
+
+The global limit applies to the bot token, which the backend also sends
+with (broadcasts and receipt notifications). The bot's bucket is
+TELEGRAM_GLOBAL_RATE, its share of the budget; the backend's
+BROADCAST_RATE and TELEGRAM_NOTIFY_RATE take the rest.
+
+All requests made through the Bot instance pass through
+OutboundRateLimitMiddleware (registered on bot.session), so handlers keep
+using message.answer / bot.send_message as usual. Urgency is selected with
+the send_priority() context manager: manager actions go ahead of customer
+replies.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Dict, Optional, Set, Union
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    SendDocument,
+    SendMediaGroup,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.methods.base import Response, TelegramType
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Priority lanes, lower value is sent first"""
+    MANAGER = 0  # Manager actions and manager channel notifications
+    CUSTOMER = 1  # Replies and status updates for customers
+
+
+# Methods that count against Telegram's per-chat and global send limits
+RATE_LIMITED_METHODS = (
+    SendMessage,
+    SendPhoto,
+    SendDocument,
+    SendMediaGroup,
+    CopyMessage,
+    ForwardMessage,
+    EditMessageText,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+)
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "outbound_priority", default=Priority.CUSTOMER
+)
+
+
+@contextmanager
+def send_priority(priority: Priority):
+    """
+    Send all Telegram requests inside the block with given priority
+
+    Usage:
+        with send_priority(Priority.MANAGER):
+            await callback.message.edit_text(...)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at", "blocked_until")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, now: float):
+        """Take one token (caller checked delay() == 0)"""
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float, now: float):
+        """Stop issuing tokens for `seconds` (Telegram RetryAfter)"""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0
+        self.updated_at = max(self.updated_at, self.blocked_until)
+
+    def is_idle(self, now: float) -> bool:
+        """True if bucket is full again and may be dropped"""
+        self._refill(now)
+        return now >= self.blocked_until and self.tokens >= self.capacity
+
+
+class OutboundScheduler:
+    """
+    Grants send slots in priority order while respecting a global token
+    bucket and per-chat buckets
+
+    A request whose chat is still cooling down is parked until its chat
+    bucket refills, so one busy chat never blocks sends to other chats.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        private_chat_rate: float = 1.0,
+        group_chat_rate: float = 20 / 60,
+        max_chat_buckets: int = 10000
+    ):
+        self.global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self.private_chat_rate = private_chat_rate
+        self.group_chat_rate = group_chat_rate
+        self.max_chat_buckets = max_chat_buckets
+        self._chat_buckets: Dict[Union[int, str], TokenBucket] = {}
+
+        # (priority, seq, chat_id, future, enqueued_at)
+        self._ready: list = []
+        # (ready_at, priority, seq, chat_id, future, enqueued_at)
+        self._parked: list = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self._metrics: Dict[str, Any] = {
+            "granted_total": {p.name.lower(): 0 for p in Priority},
+            "retry_after_total": 0,
+            "retry_after_seconds_total": 0.0,
+            "failed_total": 0,
+            "dropped_total": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start dispatch loop (must be called inside running event loop)"""
+        if not self.running:
+            self._task = asyncio.create_task(self._dispatch_loop(), name="outbound-scheduler")
+
+    async def stop(self):
+        """Stop dispatch loop and release pending waiters"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for entry in self._ready + self._parked:
+            future = entry[-2]
+            if not future.done():
+                future.cancel()
+        self._ready.clear()
+        self._parked.clear()
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.max_chat_buckets:
+                self._prune_chat_buckets()
+            # Negative IDs and @usernames are groups/channels
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            rate = self.group_chat_rate if is_group else self.private_chat_rate
+            bucket = TokenBucket(rate, capacity=1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune_chat_buckets(self):
+        now = time.monotonic()
+        idle = [chat_id for chat_id, bucket in self._chat_buckets.items() if bucket.is_idle(now)]
+        for chat_id in idle:
+            del self._chat_buckets[chat_id]
+
+    async def acquire(self, chat_id: Union[int, str], priority: Priority = Priority.CUSTOMER):
+        """Wait until a message may be sent to chat_id"""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._ready, (priority, next(self._seq), chat_id, future, time.monotonic()))
+        self._wakeup.set()
+        await future
+
+    def retry_after(self, chat_id: Union[int, str], seconds: float):
+        """Honor Telegram RetryAfter: pause the chat for given seconds"""
+        self._chat_bucket(chat_id).block(seconds, time.monotonic())
+        self._metrics["retry_after_total"] += 1
+        self._metrics["retry_after_seconds_total"] += seconds
+
+    def record_failure(self):
+        self._metrics["failed_total"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of scheduler counters and current queue depth per lane"""
+        depth = {p.name.lower(): 0 for p in Priority}
+        for entry in self._ready:
+            depth[Priority(entry[0]).name.lower()] += 1
+        for entry in self._parked:
+            depth[Priority(entry[1]).name.lower()] += 1
+        return {
+            **self._metrics,
+            "granted_total": dict(self._metrics["granted_total"]),
+            "queue_depth": depth,
+            "chat_buckets": len(self._chat_buckets),
+        }
+
+    def _unpark(self, now: float):
+        while self._parked and self._parked[0][0] <= now:
+            _, priority, seq, chat_id, future, enqueued_at = heapq.heappop(self._parked)
+            heapq.heappush(self._ready, (priority, seq, chat_id, future, enqueued_at))
+
+    async def _sleep_or_wakeup(self, timeout: Optional[float]):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _dispatch_loop(self):
+        while True:
+            now = time.monotonic()
+            self._unpark(now)
+
+            if not self._ready:
+                timeout = self._parked[0][0] - now if self._parked else None
+                await self._sleep_or_wakeup(timeout)
+                continue
+
+            global_delay = self.global_bucket.delay(now)
+            if global_delay > 0:
+                await asyncio.sleep(global_delay)
+                continue
+
+            priority, seq, chat_id, future, enqueued_at = heapq.heappop(self._ready)
+            if future.done():
+                # Waiter was cancelled (handler timed out, shutdown)
+                self._metrics["dropped_total"] += 1
+                continue
+
+            chat_bucket = self._chat_bucket(chat_id)
+            chat_delay = chat_bucket.delay(now)
+            if chat_delay > 0:
+                heapq.heappush(self._parked, (now + chat_delay, priority, seq, chat_id, future, enqueued_at))
+                continue
+
+            self.global_bucket.consume(now)
+            chat_bucket.consume(now)
+
+            waited = now - enqueued_at
+            self._metrics["granted_total"][Priority(priority).name.lower()] += 1
+            self._metrics["wait_seconds_total"] += waited
+            self._metrics["wait_seconds_max"] = max(self._metrics["wait_seconds_max"], waited)
+            future.set_result(None)
+
+
+class OutboundRateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware routing every send through the OutboundScheduler
+    and retrying requests rejected with RetryAfter
+    """
+
+    def __init__(self, scheduler: OutboundScheduler, max_retries: int = 3):
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if (
+            chat_id is None
+            or not isinstance(method, RATE_LIMITED_METHODS)
+            or not self.scheduler.running
+        ):
+            return await make_request(bot, method)
+
+        priority = _current_priority.get()
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(chat_id, priority)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                self.scheduler.retry_after(chat_id, e.retry_after)
+                attempt += 1
+                if attempt > self.max_retries:
+                    self.scheduler.record_failure()
+                    raise
+                logger.warning(
+                    f"RetryAfter {e.retry_after}s for chat {chat_id}, "
+                    f"retry {attempt}/{self.max_retries}"
+                )
+            except Exception:
+                self.scheduler.record_failure()
+                raise
+
+
+_background_sends: Set[asyncio.Task] = set()
+
+
+def send_in_background(
+    bot: Bot,
+    chat_id: Union[int, str],
+    text: str,
+    priority: Priority = Priority.CUSTOMER,
+    **kwargs
+) -> asyncio.Task:
+    """
+    Queue a notification without waiting for delivery
+    Delivery errors are logged, so fan-out never fails the calling handler
+    """
+    async def _send():
+        with send_priority(priority):
+            try:
+                await bot.send_message(chat_id, text, **kwargs)
+            except Exception as e:
+                logger.error(f"Failed to send message to {chat_id}: {e}")
+
+    task = asyncio.create_task(_send())
+    _background_sends.add(task)
+    task.add_done_callback(_background_sends.discard)
+    return task
+
+
+# Global scheduler instance
+outbound_scheduler = OutboundScheduler(
+    global_rate=settings.TELEGRAM_GLOBAL_RATE,
+    private_chat_rate=settings.TELEGRAM_CHAT_RATE,
+    group_chat_rate=settings.TELEGRAM_GROUP_RATE_PER_MINUTE / 60,
+)